@@ -1,6 +1,20 @@
-from numba import njit as jit
 import numpy as np
 
+try:
+    from numba import njit as jit
+    from numba import prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Without numba the kernels below still run as plain Python; callers in
+    # orbit.twobody check NUMBA_AVAILABLE and use their NumPy paths instead.
+    NUMBA_AVAILABLE = False
+    prange          = range
+
+    def jit(*args,**kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 
 @jit
 def norm(arr):
@@ -12,4 +26,300 @@ def VecDiff(vec_i,vec_j):
 
 @jit 
 def VecMul1D(vec1,vec2):
-    return np.transpose(vec1) @ vec2
\ No newline at end of file
+    return np.transpose(vec1) @ vec2
+
+@jit(cache=True)
+def dot3(vec1,vec2):
+    return vec1[0]*vec2[0] + vec1[1]*vec2[1] + vec1[2]*vec2[2]
+
+@jit(cache=True)
+def norm3(vec):
+    return np.sqrt(dot3(vec,vec))
+
+@jit(cache=True)
+def cross3(vec1,vec2):
+    out     = np.empty(3)
+    out[0]  = vec1[1]*vec2[2] - vec1[2]*vec2[1]
+    out[1]  = vec1[2]*vec2[0] - vec1[0]*vec2[2]
+    out[2]  = vec1[0]*vec2[1] - vec1[1]*vec2[0]
+    return out
+
+#%% Two Body Kernels
+@jit(parallel=True,cache=True)
+def ecc_vec(R,V,mu):
+    N       = R.shape[0]
+    e_vec   = np.empty((N,3))
+
+    for k in prange(N):
+        r   = norm3(R[k])
+        v2  = dot3(V[k],V[k])
+        rv  = dot3(R[k],V[k])
+        for j in range(3):
+            e_vec[k,j] = ((v2 - mu/r)*R[k,j] - rv*V[k,j])/mu
+
+    return e_vec
+
+@jit(parallel=True,cache=True)
+def specific_energy(R,V,mu):
+    N       = R.shape[0]
+    E       = np.empty(N)
+
+    for k in prange(N):
+        E[k] = dot3(V[k],V[k])/2 - mu/norm3(R[k])
+
+    return E
+
+@jit(cache=True)
+def _acos(x):
+    return np.arccos(min(1.0,max(-1.0,x)))
+
+@jit(parallel=True,cache=True)
+def cart_to_kepler(R,V,mu,tol):
+    '''
+    Columns: a, e, i, RAAN, omega, nu, P, specific_energy, p, h, r_p, r_a,
+    arg_lat_epoch, true_long_epoch (angles in radians), plus e_vec (N,3).
+    Same conventions as orbit.twobody.twb00114_CartToKeplerArray.
+    '''
+    N       = R.shape[0]
+    out     = np.empty((N,14))
+    e_vec   = np.empty((N,3))
+    two_pi  = 2*np.pi
+
+    for k in prange(N):
+        r       = norm3(R[k])
+        v2      = dot3(V[k],V[k])
+        rv      = dot3(R[k],V[k])
+        H       = cross3(R[k],V[k])
+        h       = norm3(H)
+        for j in range(3):
+            e_vec[k,j] = ((v2 - mu/r)*R[k,j] - rv*V[k,j])/mu
+        e       = norm3(e_vec[k])
+        E       = v2/2 - mu/r
+        a       = -mu/(2*E) if E != 0 else np.inf
+        p       = h**2/mu
+        P       = two_pi*np.sqrt(a**3/mu) if a > 0 else np.nan
+        r_p     = p/(1 + e)
+        r_a     = a*(1 + e) if e < 1 else np.inf
+        i       = _acos(H[2]/h)
+        Nx      = -H[1]
+        Ny      = H[0]
+        n       = np.sqrt(Nx**2 + Ny**2)
+
+        circular    = e < tol
+        equatorial  = n < tol*h
+        retrograde  = H[2] < 0
+
+        #### Right Ascension of the Ascending Node
+        if equatorial:
+            RAAN = 0.0
+        else:
+            RAAN = _acos(Nx/n)
+            if Ny < 0:
+                RAAN = two_pi - RAAN
+
+        #### Argument of Periapsis
+        if circular:
+            omega = 0.0
+        elif equatorial:
+            omega = _acos(e_vec[k,0]/e)
+            if e_vec[k,1] < 0:
+                omega = two_pi - omega
+            if retrograde:
+                omega = two_pi - omega
+        else:
+            omega = _acos((Nx*e_vec[k,0] + Ny*e_vec[k,1])/(n*e))
+            if e_vec[k,2] < 0:
+                omega = two_pi - omega
+
+        #### Argument of Latitude at Epoch
+        if equatorial:
+            u = _acos(R[k,0]/r)
+            if R[k,1] < 0:
+                u = two_pi - u
+            if retrograde:
+                u = two_pi - u
+        else:
+            u = _acos((Nx*R[k,0] + Ny*R[k,1])/(n*r))
+            if R[k,2] < 0:
+                u = two_pi - u
+
+        #### True Anomaly
+        if circular:
+            nu = u
+        else:
+            nu = _acos(dot3(e_vec[k],R[k])/(e*r))
+            if rv < 0:
+                nu = two_pi - nu
+
+        out[k,0]    = a
+        out[k,1]    = e
+        out[k,2]    = i
+        out[k,3]    = RAAN
+        out[k,4]    = omega
+        out[k,5]    = nu
+        out[k,6]    = P
+        out[k,7]    = E
+        out[k,8]    = p
+        out[k,9]    = h
+        out[k,10]   = r_p
+        out[k,11]   = r_a
+        out[k,12]   = u
+        out[k,13]   = (RAAN + omega + nu) % two_pi
+
+    return out, e_vec
+
+@jit(parallel=True,cache=True)
+def lagrange_fg_propagate(R0,V0,delta_nu,mu):
+    '''
+    Step each state by its true-anomaly change delta_nu [rad] with the
+    Lagrange f and g coefficients; returns an (N,6) array.
+    '''
+    N       = R0.shape[0]
+    states  = np.empty((N,6))
+
+    for k in prange(N):
+        dnu     = delta_nu[k]
+        c       = np.cos(dnu)
+        s       = np.sin(dnu)
+        r0      = norm3(R0[k])
+        h       = norm3(cross3(R0[k],V0[k]))
+        v0r     = dot3(R0[k],V0[k])/r0
+        r       = (h**2/mu)/(1 + (h**2/(mu*r0) - 1)*c - (h*v0r*s)/mu)
+        f       = 1 - (mu*r*(1 - c))/(h**2)
+        g       = r*r0*s/h
+        f_dot   = (mu/h)*((1 - c)/s)*((mu/h**2)*(1 - c) - 1/r0 - 1/r)
+        g_dot   = 1 - ((mu*r0)/h**2)*(1 - c)
+        for j in range(3):
+            states[k,j]   = f*R0[k,j] + g*V0[k,j]
+            states[k,3+j] = f_dot*R0[k,j] + g_dot*V0[k,j]
+
+    return states
+
+@jit(cache=True)
+def kepler_E(M,e,tol,max_iter):
+    '''
+    Eccentric (e <= 1) or hyperbolic (e > 1) anomaly [rad] for one M [rad],
+    with the same seeds and Halley steps as twb00115_eccentric_anomaly_array.
+    '''
+    if e <= 1:
+        M_red   = (M + np.pi) % (2*np.pi) - np.pi
+        revs    = M - M_red
+        E       = M_red + 0.85*e*np.sign(np.sin(M_red))
+        if e > 0.5:
+            p_c = 6*(1 - e)/e
+            q_c = -6*M_red/e
+            d_c = np.sqrt(q_c**2/4 + p_c**3/27)
+            E_c = np.cbrt(-q_c/2 + d_c) + np.cbrt(-q_c/2 - d_c)
+            if abs(E_c) < 1.0:
+                E = E_c
+        for _ in range(max_iter):
+            s       = np.sin(E)
+            f       = E - e*s - M_red
+            df      = 1 - e*np.cos(E)
+            step    = f/(df - 0.5*f*e*s/df)
+            E       -= step
+            if abs(step) <= tol:
+                break
+        return E + revs
+
+    F = np.sign(M)*np.log(2*abs(M)/e + 1.8)
+    for _ in range(max_iter):
+        s       = np.sinh(F)
+        f       = e*s - F - M
+        df      = e*np.cosh(F) - 1
+        step    = f/(df - 0.5*f*e*s/df)
+        F       -= step
+        if abs(step) <= tol:
+            break
+    return F
+
+@jit(parallel=True,cache=True)
+def kepler_solve(M,e,tol,max_iter):
+    N   = M.shape[0]
+    E   = np.empty(N)
+
+    for k in prange(N):
+        E[k] = kepler_E(M[k],e[k],tol,max_iter)
+
+    return E
+
+#%% Universal Variable Kernels
+@jit(cache=True)
+def stumpff_C(z):
+    if abs(z) < 0.1:
+        return 1/2 - z/24 + z**2/720 - z**3/40320 + z**4/3628800
+    if z > 0:
+        return (1 - np.cos(np.sqrt(z)))/z
+    return (np.cosh(np.sqrt(-z)) - 1)/(-z)
+
+@jit(cache=True)
+def stumpff_S(z):
+    if abs(z) < 0.1:
+        return 1/6 - z/120 + z**2/5040 - z**3/362880 + z**4/39916800
+    if z > 0:
+        sz = np.sqrt(z)
+        return (sz - np.sin(sz))/sz**3
+    sz = np.sqrt(-z)
+    return (np.sinh(sz) - sz)/sz**3
+
+@jit(cache=True)
+def universal_chi(r0,sigma0,alpha,dt,mu,tol,max_iter):
+    sqrt_mu = np.sqrt(mu)
+    if dt == 0:
+        return 0.0
+
+    #### Initial Guess
+    if alpha > 1e-12:
+        chi = sqrt_mu*alpha*dt
+    elif alpha < -1e-12:
+        a_h = 1/alpha
+        sgn = np.sign(dt)
+        arg = (-2*mu*alpha*dt)/(sigma0*sqrt_mu + sgn*np.sqrt(-mu*a_h)*(1 - r0*alpha))
+        chi = sgn*np.sqrt(-a_h)*np.log(arg) if arg > 0 else -sqrt_mu*alpha*dt
+    else:
+        chi = sqrt_mu*dt/r0
+
+    #### Laguerre-Conway Iterations
+    n_lag = 5
+    for _ in range(max_iter):
+        z    = alpha*chi**2
+        C    = stumpff_C(z)
+        S    = stumpff_S(z)
+        F    = sigma0*chi**2*C + (1 - alpha*r0)*chi**3*S + r0*chi - sqrt_mu*dt
+        dF   = sigma0*chi*(1 - z*S) + (1 - alpha*r0)*chi**2*C + r0
+        d2F  = sigma0*(1 - z*C) + (1 - alpha*r0)*chi*(1 - z*S)
+        root = np.sqrt(abs((n_lag - 1)**2*dF**2 - n_lag*(n_lag - 1)*F*d2F))
+        step = n_lag*F/(dF + np.sign(dF)*root)
+        chi  -= step
+        if abs(step) <= tol*np.sqrt(r0):
+            break
+    return chi
+
+@jit(parallel=True,cache=True)
+def universal_propagate(R0,V0,t,mu,tol,max_iter):
+    M       = R0.shape[0]
+    T       = t.shape[0]
+    states  = np.empty((M,T,6))
+    sqrt_mu = np.sqrt(mu)
+
+    for m in prange(M):
+        r0      = norm3(R0[m])
+        v0      = norm3(V0[m])
+        sigma0  = dot3(R0[m],V0[m])/sqrt_mu
+        alpha   = 2/r0 - v0**2/mu
+
+        for k in range(T):
+            chi     = universal_chi(r0,sigma0,alpha,t[k],mu,tol,max_iter)
+            z       = alpha*chi**2
+            C       = stumpff_C(z)
+            S       = stumpff_S(z)
+            f       = 1 - chi**2/r0*C
+            g       = t[k] - chi**3*S/sqrt_mu
+            R       = f*R0[m] + g*V0[m]
+            r       = norm3(R)
+            f_dot   = sqrt_mu/(r*r0)*(alpha*chi**3*S - chi)
+            g_dot   = 1 - chi**2/r*C
+            states[m,k,:3] = R
+            states[m,k,3:] = f_dot*R0[m] + g_dot*V0[m]
+
+    return states
@@ -3,7 +3,7 @@ planets = {
                 'name':     'Sun',
                 'parent':   'SolarSystemBarycenter',
                 'radius':   695700,                       # km
-                'mu':       398600.432896939,           # km^3/s
+                'mu':       132712440041.279419,        # km^3/s
                 },
     
     'earth':    {
@@ -11,5 +11,61 @@ planets = {
                 'parent':   'Sun',
                 'radius':   6378.165,                       # km
                 'mu':       398600.432896939,           # km^3/s
-                }
+                },
+    
+    'moon':     {
+                'name':     'Moon',
+                'parent':   'Earth',
+                'radius':   1737.4,                       # km
+                'mu':       4902.800066,                # km^3/s
+                },
+    
+    'mercury':  {
+                'name':     'Mercury',
+                'parent':   'Sun',
+                'radius':   2439.7,                       # km
+                'mu':       22031.86855,                # km^3/s
+                },
+    
+    'venus':    {
+                'name':     'Venus',
+                'parent':   'Sun',
+                'radius':   6051.8,                       # km
+                'mu':       324858.592,                 # km^3/s
+                },
+    
+    'mars':     {
+                'name':     'Mars',
+                'parent':   'Sun',
+                'radius':   3396.19,                      # km
+                'mu':       42828.375214,               # km^3/s
+                },
+    
+    'jupiter':  {
+                'name':     'Jupiter',
+                'parent':   'Sun',
+                'radius':   71492,                        # km
+                'mu':       126712764.8,                # km^3/s
+                },
+    
+    'saturn':   {
+                'name':     'Saturn',
+                'parent':   'Sun',
+                'radius':   60268,                        # km
+                'mu':       37940585.2,                 # km^3/s
+                },
+    
+    'uranus':   {
+                'name':     'Uranus',
+                'parent':   'Sun',
+                'radius':   25559,                        # km
+                'mu':       5794548.6,                  # km^3/s
+                },
+    
+    'neptune':  {
+                'name':     'Neptune',
+                'parent':   'Sun',
+                'radius':   24764,                        # km
+                'mu':       6836527.1,                  # km^3/s
+                },
             }
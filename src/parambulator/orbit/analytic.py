@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:02:37 2026
+
+@author: isaacfoster
+"""
+#%% Initialize
+import numpy as np
+
+#### Parambulator Libraries
+import library.bodies as body
+
+#%% Constants
+J2000       = 2451545.0
+AU          = 149597870.7                   # km
+OBLIQUITY   = 23.4392911                    # deg, mean obliquity at J2000
+PRECESSION  = 1.396971                      # deg/century, general precession in longitude
+arcsec      = 1/3600
+deg2rad     = np.pi/180
+
+#### Earth/Moon mass split, for the Earth-Moon barycenter
+_moon_ratio = body.planets['moon']['mu']/(body.planets['moon']['mu'] + body.planets['earth']['mu'])
+
+#%% Series
+def _ecliptic_to_ICRF(longitude_deg,latitude_deg,distance):
+    '''
+    J2000 ecliptic spherical coordinates to (3,...) ICRF cartesian.
+    '''
+    lon, lat    = longitude_deg*deg2rad, latitude_deg*deg2rad
+    eps         = OBLIQUITY*deg2rad
+    x           = distance*np.cos(lat)*np.cos(lon)
+    y           = distance*np.cos(lat)*np.sin(lon)
+    z           = distance*np.sin(lat)
+
+    return np.stack((x,y*np.cos(eps) - z*np.sin(eps),y*np.sin(eps) + z*np.cos(eps)))
+
+def anl00001_SunPosition(julian_date):
+    '''
+    Geocentric Sun position from the Astronomical Almanac low-precision
+    formulae, referred to J2000 by removing general precession.
+
+    Published accuracy is 0.01 deg in direction between 1950 and 2050; the
+    distance series is good to about 1e-4 AU.
+
+    Parameters
+    ----------
+    julian_date : float or array_like
+        TDB Julian date(s).
+
+    Returns
+    -------
+    position : numpy.ndarray, shape (3,) or (3,N)
+        ICRF position of the Sun relative to the Earth [km].
+
+    '''
+    n       = np.asarray(julian_date,dtype=np.float64) - J2000
+    T       = n/36525
+
+    #### Mean longitude and mean anomaly [deg]
+    L       = 280.460 + 0.9856474*n
+    g       = (357.528 + 0.9856003*n)*deg2rad
+
+    #### Ecliptic longitude of date, then J2000
+    lon     = L + 1.915*np.sin(g) + 0.020*np.sin(2*g) - PRECESSION*T
+    R       = (1.00014 - 0.01671*np.cos(g) - 0.00014*np.cos(2*g))*AU
+
+    return _ecliptic_to_ICRF(lon,np.zeros_like(lon),R)
+
+def anl00002_MoonPosition(julian_date):
+    '''
+    Geocentric Moon position from the truncated lunar series of
+    Montenbruck & Gill (Satellite Orbits, 2000, sec. 3.3.2), whose mean
+    longitude already includes the precession to J2000.
+
+    Published accuracy is several arcminutes in direction and a few
+    hundred km in distance.
+
+    Parameters
+    ----------
+    julian_date : float or array_like
+        TDB Julian date(s).
+
+    Returns
+    -------
+    position : numpy.ndarray, shape (3,) or (3,N)
+        ICRF position of the Moon relative to the Earth [km].
+
+    '''
+    T       = (np.asarray(julian_date,dtype=np.float64) - J2000)/36525
+
+    #### Fundamental arguments [deg, then rad]
+    L0      = 218.31617 + 481267.88088*T - 1.3972*T
+    l       = (134.96292 + 477198.86753*T)*deg2rad
+    lp      = (357.52543 + 35999.04944*T)*deg2rad
+    F       = (93.27283 + 483202.01873*T)*deg2rad
+    D       = (297.85027 + 445267.11135*T)*deg2rad
+
+    #### Longitude [deg]
+    dlon    = (22640*np.sin(l) + 769*np.sin(2*l) - 4586*np.sin(l - 2*D) + 2370*np.sin(2*D)
+               - 668*np.sin(lp) - 412*np.sin(2*F) - 212*np.sin(2*l - 2*D) - 206*np.sin(l + lp - 2*D)
+               + 192*np.sin(l + 2*D) - 165*np.sin(lp - 2*D) + 148*np.sin(l - lp) - 125*np.sin(D)
+               - 110*np.sin(l + lp) - 55*np.sin(2*F - 2*D))*arcsec
+    lon     = L0 + dlon
+
+    #### Latitude [deg]
+    lat     = (18520*np.sin(F + (dlon + (412*np.sin(2*F) + 541*np.sin(lp))*arcsec)*deg2rad)
+               - 526*np.sin(F - 2*D) + 44*np.sin(l + F - 2*D) - 31*np.sin(-l + F - 2*D)
+               - 25*np.sin(-2*l + F) - 23*np.sin(lp + F - 2*D) + 21*np.sin(-l + F)
+               + 11*np.sin(-lp + F - 2*D))*arcsec
+
+    #### Distance [km]
+    r       = (385000 - 20905*np.cos(l) - 3699*np.cos(2*D - l) - 2956*np.cos(2*D) - 570*np.cos(2*l)
+               + 246*np.cos(2*l - 2*D) - 205*np.cos(lp - 2*D) - 171*np.cos(l + 2*D)
+               - 152*np.cos(l + lp - 2*D))
+
+    return _ecliptic_to_ICRF(lon,lat,r)
+
+#%% Analytic Ephemeris
+class AnalyticEphemeris():
+    '''
+    SPK-free "fast" ephemeris backend for the Sun, Earth, Moon and
+    Earth-Moon barycenter, built on anl00001_SunPosition and
+    anl00002_MoonPosition.
+
+    Select it with orbit.ephem.eph00001_load_kernel('fast'). Every
+    chain-based call in orbit.ephem (get_position_ICRF, get_state,
+    eph00013_compute_chains) and the modules built on them (orbit.beta,
+    orbit.eclipse) then run without an SPK file or astropy. The series are
+    geocentric, so queries centered on the solar system barycenter are
+    answered heliocentrically: relative vectors between the supported
+    bodies are unaffected, but absolute barycentric positions are off by
+    the Sun's barycentric offset (up to about 0.01 AU). Velocities are
+    central differences of the series.
+
+    Measured worst-case errors (tests/test_analytic.py), against published
+    epochs rather than a JPL kernel: 0.006 deg in Sun longitude at the
+    equinoxes and solstices of 2000, 2020 and 2024; 2,900 km (2e-5 AU) in
+    Sun distance at the 2024 perihelion and aphelion; 2.5 arcmin in
+    Moon-Sun elongation over all 25 new and full moons of 2024; and 0.3
+    arcmin, 0.13 arcmin and 51 km in Moon longitude, latitude and distance
+    against Meeus' Example 47.a (1992 April 12). anl00003_CompareToKernel
+    repeats the measurement against any SPK kernel, such as de440.bsp.
+    '''
+    #### Supported NAIF ids; 0 is served from the Sun
+    ids     = (0,3,10,301,399)
+    step    = 1e-3                          # days, velocity difference step
+
+    def __repr__(self):
+        return "AnalyticEphemeris(bodies=('sun','earth','moon','emb'))"
+
+    def _geocentric(self,naif_id,julian_date):
+        if naif_id in (0,10):
+            return anl00001_SunPosition(julian_date)
+        if naif_id == 301:
+            return anl00002_MoonPosition(julian_date)
+        if naif_id == 3:
+            return _moon_ratio*anl00002_MoonPosition(julian_date)
+        return np.zeros((3,) + np.shape(julian_date))
+
+    def position(self,target,julian_date,center=0):
+        '''
+        Position of target relative to center [km], shaped like
+        kernel[a,b].compute(julian_date).
+        '''
+        import orbit.ephem as eph
+
+        target, center  = eph.eph00010_body_id(target), eph.eph00010_body_id(center)
+        for naif_id in (target,center):
+            if naif_id not in self.ids:
+                raise ValueError(f"ERROR-eph040: The analytic ephemeris has no body {naif_id}; "
+                                 f"it covers NAIF ids {self.ids}")
+        jd              = np.asarray(julian_date,dtype=np.float64)
+        return self._geocentric(target,jd) - self._geocentric(center,jd)
+
+    def compute_chains(self,targets,julian_date,center=0,velocity=False):
+        '''
+        Drop-in for orbit.ephem.eph00013_compute_chains, with velocities in
+        km/day.
+        '''
+        results = {}
+        for name in targets:
+            position = self.position(name,julian_date,center)
+            if velocity:
+                jd          = np.asarray(julian_date,dtype=np.float64)
+                rate        = (self.position(name,jd + self.step,center)
+                               - self.position(name,jd - self.step,center))/(2*self.step)
+                results[name] = (position,rate)
+            else:
+                results[name] = position
+
+        return results
+
+#%% Validation
+def anl00003_CompareToKernel(kernel,julian_date,bodies=('sun','moon')):
+    '''
+    Worst-case error of the analytic series against an SPK kernel (for
+    example de440.bsp) over julian_date, evaluated through orbit.ephem.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Reference kernel.
+    julian_date : array_like
+        TDB Julian dates.
+    bodies : sequence of str, optional
+        Bodies to compare, geocentric. The default is ('sun','moon').
+
+    Returns
+    -------
+    errors : dict
+        Body -> {'angle_deg': max direction error [deg],
+        'distance_km': max distance error [km]}.
+
+    '''
+    import orbit.ephem as eph
+
+    fast    = AnalyticEphemeris()
+    jd      = np.atleast_1d(np.asarray(julian_date,dtype=np.float64))
+    truth   = eph.eph00013_compute_chains(kernel,list(bodies),jd,center='earth')
+    model   = fast.compute_chains(list(bodies),jd,center='earth')
+
+    errors  = {}
+    for name in bodies:
+        r_true, r_model = np.linalg.norm(truth[name],axis=0), np.linalg.norm(model[name],axis=0)
+        cross           = np.linalg.norm(np.cross(truth[name],model[name],axis=0),axis=0)
+        angle           = np.arctan2(cross,np.einsum('ij,ij->j',truth[name],model[name]))
+        errors[name]    = {'angle_deg':     float(np.degrees(angle).max()),
+                           'distance_km':   float(np.abs(r_true - r_model).max())}
+
+    return errors
@@ -8,16 +8,16 @@ Created on Tue Jul  9 12:52:53 2024
 
 #%% Initialize
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-
-#### Set Printing
-np.set_printoptions(suppress=True, precision=6)
 
 #### Import Orbit Dependancies
 from jplephem.spk import SPK
-import astropy
-from astropy.coordinates import get_sun
+
+#### Parambulator Libraries
+import core.defaults as default
+import orbit.ephem as eph
+import orbit.eclipse as ecl
+import orbit.perturbations as ptb
+import orbit.twobody as twb
 
 #%% Get SPK File Location
 spk_filepath = 'de421.bsp'
@@ -29,6 +29,9 @@ spk_filepath = 'de421.bsp'
 deg2rad = np.pi/180
 rad2deg = 1/deg2rad
 
+mu_default      = default.mu
+radius_default  = default.radius
+
 #%% Get Ephemeris using jplephem
 # https://pypi.org/project/jplephem/
 
@@ -41,7 +44,7 @@ def get_sun_position_ICRF(kernel,julian_date):
 
 def get_earth_position_ICRF(kernel,julian_date):
     Earth_position      = kernel[0,3].compute(julian_date)
-    Earth_position      -= kernel[3,399].compute(julian_date)
+    Earth_position      += kernel[3,399].compute(julian_date)
     return Earth_position
 
 def get_solar_vector(body_position,julian_date,kernel):
@@ -51,32 +54,40 @@ def get_solar_vector(body_position,julian_date,kernel):
 
 
 #%% Beta Angle Functions
+# All three broadcast elementwise over their arguments (dates x RAAN x
+# inclination grids, constellations of planes, ...); see beta00003_BetaAngleGrid.
 def beta_angle_psi(RAAN_deg,inc_deg,obliquity_deg,Gamma_deg):
-    RAAN        = RAAN_deg*deg2rad
-    inc         = inc_deg*deg2rad
-    obliquity   = obliquity_deg*deg2rad
-    Gamma       = Gamma_deg*deg2rad
+    RAAN        = np.asarray(RAAN_deg)*deg2rad
+    inc         = np.asarray(inc_deg)*deg2rad
+    obliquity   = np.asarray(obliquity_deg)*deg2rad
+    Gamma       = np.asarray(Gamma_deg)*deg2rad
    
-    psi = np.arccos(np.cos(Gamma)*np.sin(RAAN)*np.sin(inc) - np.sin(Gamma)*np.cos(obliquity)*np.cos(RAAN)*np.sin(inc) + np.sin(Gamma)*np.sin(obliquity)*np.cos(inc))
+    cos_psi     = np.cos(Gamma)*np.sin(RAAN)*np.sin(inc) - np.sin(Gamma)*np.cos(obliquity)*np.cos(RAAN)*np.sin(inc) + np.sin(Gamma)*np.sin(obliquity)*np.cos(inc)
+    psi         = np.arccos(np.clip(cos_psi,-1.0,1.0))
    
     beta = psi - np.pi/2
     return beta*rad2deg
    
 def beta_angle_dec(RAAN_deg,inc_deg,RAAN_sun_deg,solar_declension_deg):
-    RAAN                = RAAN_deg*deg2rad
-    inc                 = inc_deg*deg2rad
-    RAAN_sun            = RAAN_sun_deg*deg2rad
-    solar_declension    = solar_declension_deg*deg2rad
+    RAAN                = np.asarray(RAAN_deg)*deg2rad
+    inc                 = np.asarray(inc_deg)*deg2rad
+    RAAN_sun            = np.asarray(RAAN_sun_deg)*deg2rad
+    solar_declension    = np.asarray(solar_declension_deg)*deg2rad
 
-    beta = np.arcsin(np.cos(solar_declension)*np.sin(inc)*np.sin(RAAN-RAAN_sun) + np.sin(solar_declension)*np.cos(inc))
+    sin_beta    = np.cos(solar_declension)*np.sin(inc)*np.sin(RAAN-RAAN_sun) + np.sin(solar_declension)*np.cos(inc)
+    beta        = np.arcsin(np.clip(sin_beta,-1.0,1.0))
     return beta*rad2deg
 
 def beta_angle_solar_vector(RAAN_deg,inc_deg,solar_vector):
-    RAAN    = RAAN_deg*deg2rad
-    inc     = inc_deg*deg2rad
+    '''
+    solar_vector holds x, y, z on its first axis, shape (3,) or (3,...);
+    the trailing axes broadcast against RAAN_deg and inc_deg.
+    '''
+    RAAN    = np.asarray(RAAN_deg)*deg2rad
+    inc     = np.asarray(inc_deg)*deg2rad
+    solar_vector = np.asarray(solar_vector,dtype=np.float64)
    
-    sum_squares = sum([solar_vector[0]**2, solar_vector[1]**2, solar_vector[2]**2])
-    S_mag       = sum_squares ** 0.5 #position vector
+    S_mag   = np.sqrt(np.sum(solar_vector**2,axis=0)) #position vector
    
     Sx_hat  = solar_vector[0]/S_mag
     Sy_hat  = solar_vector[1]/S_mag
@@ -86,98 +97,368 @@ def beta_angle_solar_vector(RAAN_deg,inc_deg,solar_vector):
     ycom = np.cos(RAAN)*np.sin(inc)*Sy_hat
     zcom = np.cos(inc)*Sz_hat
    
-    beta = np.arccos(xcom-ycom+zcom) - np.pi/2
+    beta = np.arccos(np.clip(xcom-ycom+zcom,-1.0,1.0)) - np.pi/2
    
     return beta*rad2deg
 
+#%% Array Beta Angle Functions
+def beta00001_SolarVector(julian_date,kernel,body='earth'):
+    '''
+    Position of body relative to the Sun for a whole date array, from one
+    ephemeris call; the solar_vector of beta_angle_solar_vector.
+
+    Parameters
+    ----------
+    julian_date : float or array_like, shape (N,)
+        TDB Julian date(s).
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    body : str or int, optional
+        Orbited body. The default is 'earth'.
+
+    Returns
+    -------
+    solar_vector : numpy.ndarray, shape (3,) or (3,N)
+        ICRF body - Sun [km].
+
+    '''
+    return eph.eph00013_compute_chains(kernel,[body],julian_date,center='sun')[body]
+
+def beta00002_SolarAngles(solar_vector,obliquity_deg=23.44):
+    '''
+    Sun right ascension, declination and ecliptic longitude seen from the
+    body, the inputs of beta_angle_dec and beta_angle_psi.
+
+    Parameters
+    ----------
+    solar_vector : array_like, shape (3,...)
+        Body - Sun, as from beta00001_SolarVector [km].
+    obliquity_deg : float, optional
+        Obliquity of the ecliptic [deg]. The default is 23.44.
+
+    Returns
+    -------
+    RAAN_sun_deg : numpy.ndarray
+        Sun right ascension [deg], 0 to 360.
+    solar_declension_deg : numpy.ndarray
+        Sun declination [deg].
+    Gamma_deg : numpy.ndarray
+        Sun ecliptic longitude [deg], 0 to 360.
+
+    '''
+    x, y, z     = -np.asarray(solar_vector,dtype=np.float64)
+    obliquity   = obliquity_deg*deg2rad
+    RAAN_sun    = np.arctan2(y,x)
+    declination = np.arctan2(z,np.hypot(x,y))
+    Gamma       = np.arctan2(y*np.cos(obliquity) + z*np.sin(obliquity),x)
+
+    return (RAAN_sun*rad2deg) % 360, declination*rad2deg, (Gamma*rad2deg) % 360
+
+def beta00003_BetaAngleGrid(julian_date,RAAN_deg,inc_deg,kernel,
+                            RAAN_rate_deg   = 0.0,
+                            body            = 'earth',
+                            ):
+    '''
+    Beta angle for every date and every orbit plane in one array operation.
+
+    Parameters
+    ----------
+    julian_date : array_like, shape (N,)
+        TDB Julian dates.
+    RAAN_deg : float or array_like
+        RAAN of each plane at julian_date[0] [deg].
+    inc_deg : float or array_like
+        Inclination of each plane [deg]; broadcasts with RAAN_deg (equal
+        shapes pair planes up, (P,1) with (Q,) gives a P x Q grid).
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    RAAN_rate_deg : float or array_like, optional
+        Nodal drift [deg/day], broadcast like RAAN_deg, e.g.
+        delta_RAAN(...)*86400. The default is 0.0.
+    body : str or int, optional
+        Orbited body. The default is 'earth'.
+
+    Returns
+    -------
+    beta : numpy.ndarray, shape (N,) + broadcast(RAAN_deg, inc_deg).shape
+        Beta angle [deg].
+
+    '''
+    jd          = np.atleast_1d(np.asarray(julian_date,dtype=np.float64))
+    planes      = np.broadcast_shapes(np.shape(RAAN_deg),np.shape(inc_deg),np.shape(RAAN_rate_deg))
+    expand      = (slice(None),) + (None,)*len(planes)
+
+    solar_vector    = beta00001_SolarVector(jd,kernel,body)[(slice(None),) + expand]
+    RAAN            = np.asarray(RAAN_deg) + np.asarray(RAAN_rate_deg)*(jd - jd[0])[expand]
+
+    return beta_angle_solar_vector(RAAN,inc_deg,solar_vector)
+
+def beta00004_BetaAngleStates(states,kernel,V=None,epoch=None,body='earth'):
+    '''
+    Beta angle of each state's own orbit plane at its epoch.
+
+    Parameters
+    ----------
+    states : orbit.state.OrbitStateArray or array_like, shape (N,3)
+        States, or position vectors R [km] when V is given.
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    V : array_like, shape (N,3), optional
+        Velocity vectors [km/s] for raw R input. The default is None.
+    epoch : float or array_like, optional
+        TDB Julian date(s) for raw R input; an OrbitStateArray carries its
+        own. The default is None.
+    body : str or int, optional
+        Orbited body. The default is 'earth'.
+
+    Returns
+    -------
+    beta : numpy.ndarray, shape (N,)
+        Beta angle [deg].
+
+    '''
+    epoch       = getattr(states,'epoch',epoch)
+    if epoch is None:
+        raise TypeError('epoch is required unless states is an OrbitStateArray')
+    R, V, _     = twb.twb0001_UnpackStates(states,V)
+    h           = np.cross(np.asarray(R,dtype=np.float64).reshape(-1,3),np.asarray(V,dtype=np.float64).reshape(-1,3))
+    h_hat       = h/np.linalg.norm(h,axis=1)[:,None]
+
+    jd          = np.broadcast_to(np.asarray(epoch,dtype=np.float64),(h.shape[0],))
+    unique, inverse = np.unique(jd,return_inverse=True)
+    sun_hat     = -beta00001_SolarVector(unique,kernel,body)[:,inverse].T
+    sun_hat     /= np.linalg.norm(sun_hat,axis=1)[:,None]
+
+    return np.arcsin(np.clip(np.einsum('ij,ij->i',h_hat,sun_hat),-1.0,1.0))*rad2deg
+
+def delta_RAAN(radius,a,e,i,mu=mu_default):
+    '''
+    J2 nodal regression rate [deg/s]; broadcasts over its arguments. See
+    orbit.perturbations.ptb00001_SecularRates for the J4 terms and the
+    apsidal and mean anomaly rates.
+    '''
+    return ptb.ptb00001_SecularRates(a,e,i,radius=radius,mu=mu)['RAAN']
+
+#%% Beta Angle Events
+def _beta_planes(RAAN_deg,inc_deg,start_jd,end_jd,kernel,a,e,RAAN_rate_deg,step,radius,mu,body):
+    '''
+    Flattened planes, their drift, the coarse grid with beta on it, and an
+    evaluator of beta for (time, plane index) pairs.
+    '''
+    RAAN, inc   = [np.ravel(v).astype(np.float64) for v in np.broadcast_arrays(RAAN_deg,inc_deg)]
+    if a is not None:
+        rate    = np.broadcast_to(delta_RAAN(radius,a,e,inc,mu=mu)*86400,RAAN.shape)
+    else:
+        rate    = np.broadcast_to(np.asarray(RAAN_rate_deg,dtype=np.float64),RAAN.shape)
+
+    count       = max(int(np.ceil((end_jd - start_jd)/step)),1)
+    grid        = np.linspace(start_jd,end_jd,count + 1)
+    values      = beta00003_BetaAngleGrid(grid,RAAN,inc,kernel,RAAN_rate_deg=rate,body=body)
+
+    def evaluate(t,k):
+        t       = np.asarray(t,dtype=np.float64)
+        solar   = beta00001_SolarVector(t,kernel,body)
+        return beta_angle_solar_vector(RAAN[k] + rate[k]*(t - start_jd),inc[k],solar)
+
+    return grid, values, evaluate
+
+def _crossings(grid,values,function,tol):
+    '''
+    Refined roots of function(t, plane) for every sign change of the (N,P)
+    grid values, as (plane, time, direction) arrays sorted by plane.
+    '''
+    k, i        = np.nonzero(np.signbit(values[1:].T) != np.signbit(values[:-1].T))
+    if k.size == 0:
+        return k, np.empty(0), np.empty(0,dtype=int)
+    fa, fb      = values[i,k], values[i + 1,k]
+    roots       = ecl.ecl00005_RefineRoots(lambda t,j: function(t,k[j]),grid[i],grid[i + 1],fa,fb,
+                                           tol=tol,indexed=True)
+    return k, roots, np.where(fb > fa,1,-1)
+
+def beta00005_BetaEvents(RAAN_deg,inc_deg,start_jd,end_jd,kernel,
+                         levels             = (),
+                         a                  = None,
+                         e                  = 0.0,
+                         RAAN_rate_deg      = 0.0,
+                         step:float         = 1.0,
+                         tol:float          = 1e-5,
+                         radius:float       = radius_default,
+                         mu:float           = mu_default,
+                         body               = 'earth',
+                         ):
+    '''
+    Beta angle level crossings and extrema for every orbit plane.
+
+    Beta is sampled on a coarse grid of `step` days with
+    beta00003_BetaAngleGrid; sign changes of beta - level and of the
+    central-difference slope are refined to `tol` days with
+    orbit.eclipse.ecl00005_RefineRoots. Features narrower than step can be
+    missed.
+
+    Parameters
+    ----------
+    RAAN_deg, inc_deg : float or array_like
+        RAAN at start_jd and inclination of each plane [deg]; broadcast
+        together and flattened to P planes.
+    start_jd, end_jd : float
+        Search window [JD].
+    kernel : jplephem.spk.SPK or orbit.analytic.AnalyticEphemeris
+        Ephemeris, e.g. eph00001_load_kernel('fast') for screening.
+    levels : sequence of float, optional
+        Beta levels to report crossings of [deg]. The default is ().
+    a : float or array_like, optional
+        Semi-major axis [km]; if given, the RAAN drifts at
+        delta_RAAN(radius, a, e, inc, mu). The default is None.
+    e : float or array_like, optional
+        Eccentricity for delta_RAAN. The default is 0.0.
+    RAAN_rate_deg : float or array_like, optional
+        Nodal drift [deg/day] when a is not given. The default is 0.0.
+    step : float, optional
+        Coarse grid spacing [days]. The default is 1.0.
+    tol : float, optional
+        Event time accuracy [days]. The default is 1e-5.
+    radius, mu : float, optional
+        Central body radius [km] and gravitational parameter [km^3/s^2]
+        for delta_RAAN. The defaults are core.defaults.radius and mu.
+    body : str or int, optional
+        Orbited body. The default is 'earth'.
+
+    Returns
+    -------
+    events : pandas.DataFrame
+        'Plane' (index into the flattened planes), 'Time' [JD], 'Beta'
+        [deg], 'Event' ('Rising', 'Falling', 'Maximum' or 'Minimum') and
+        'Level' [deg] (NaN for extrema), sorted by plane and time.
+
+    '''
+    import pandas as pd
+
+    grid, values, evaluate = _beta_planes(RAAN_deg,inc_deg,start_jd,end_jd,kernel,a,e,RAAN_rate_deg,
+                                          step,radius,mu,body)
+    columns     = {'Plane': [],'Time': [],'Beta': [],'Event': [],'Level': []}
+
+    def add(k,times,kinds,level):
+        columns['Plane'].append(k)
+        columns['Time'].append(times)
+        columns['Beta'].append(evaluate(times,k) if len(k) else np.empty(0))
+        columns['Event'].append(kinds)
+        columns['Level'].append(np.full(len(k),level))
+
+    #### Level crossings
+    for level in levels:
+        k, times, direction = _crossings(grid,values - level,lambda t,k: evaluate(t,k) - level,tol)
+        add(k,times,np.where(direction > 0,'Rising','Falling'),level)
+
+    #### Extrema: zero crossings of the slope
+    h           = min(step/4,1e-2)
+    slope       = lambda t,k: evaluate(t + h,k) - evaluate(t - h,k)
+    planes      = values.shape[1]
+    rates       = slope(np.tile(grid,planes),np.repeat(np.arange(planes),grid.size)).reshape(planes,-1).T
+    k, times, direction = _crossings(grid,rates,slope,tol)
+    add(k,times,np.where(direction < 0,'Maximum','Minimum'),np.nan)
+
+    events      = pd.DataFrame({key: np.concatenate(value) for key,value in columns.items()})
+    return events.sort_values(['Plane','Time'],kind='stable').reset_index(drop=True)
+
+def beta00006_BetaIntervals(RAAN_deg,inc_deg,start_jd,end_jd,kernel,threshold,
+                            a                   = None,
+                            e                   = 0.0,
+                            RAAN_rate_deg       = 0.0,
+                            step:float          = 1.0,
+                            tol:float           = 1e-5,
+                            radius:float        = radius_default,
+                            mu:float            = mu_default,
+                            body                = 'earth',
+                            ):
+    '''
+    Intervals where |beta| >= threshold for every orbit plane, e.g. the
+    eclipse-free seasons of a circular orbit with threshold
+    arcsin(radius/a). Arguments as for beta00005_BetaEvents.
+
+    Returns
+    -------
+    intervals : pandas.DataFrame
+        'Plane', 'Start Time' and 'Stop Time' [JD] and 'Duration' [days].
+        Intervals open at the window edges start or stop there.
+
+    '''
+    import pandas as pd
+
+    grid, values, evaluate = _beta_planes(RAAN_deg,inc_deg,start_jd,end_jd,kernel,a,e,RAAN_rate_deg,
+                                          step,radius,mu,body)
+    f           = np.abs(values) - threshold
+    k, times, direction = _crossings(grid,f,lambda t,k: np.abs(evaluate(t,k)) - threshold,tol)
+
+    rows        = []
+    for plane in range(values.shape[1]):
+        mine    = k == plane
+        edges   = list(times[mine])
+        if f[0,plane] >= 0:
+            edges.insert(0,grid[0])
+        if f[-1,plane] >= 0:
+            edges.append(grid[-1])
+        for t0,t1 in zip(edges[::2],edges[1::2]):
+            rows.append((plane,t0,t1,t1 - t0))
+
+    return pd.DataFrame(rows,columns=['Plane','Start Time','Stop Time','Duration'])
+
+if __name__ == '__main__':
+    import astropy.time
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    #### Set Printing
+    np.set_printoptions(suppress=True, precision=6)
+
+    #%% Variable Definition
+    # Setting variables for the beta angle analysis. All variables defined in radians
+
+    kernel      = load_kernel(spk_filepath)  # Load spk kernel
+
+    eps         = 23.44*deg2rad     # obliquity of the ecliptic
+    R_earth     = 6378              # radius of earth in km
+    mu          = 398600.44189
+
+    start_date  = astropy.time.Time('2024-9-22')
+    num_days    = 365
+
+    # setting parameters for the example orbit of the ISS - this could be done differently
+    # depending which ones you know
+    i_start     = 51.6405
+    RAAN_start  = 0
+    e_start     = 0.0
+    a_start     = 6778
+
+    #%% Beta Angle Over The Year
+    # RAAN advances one day's drift before each day, as the daily loop did
+    days        = np.arange(0,num_days)
+    julian_date = start_date.jd + days
+    dRAAN       = delta_RAAN(R_earth,a_start,e_start,i_start,mu=mu)*86400
+    raan_array  = RAAN_start + dRAAN*(days + 1)
+
+    #### Rickman Method Using SPK Files, one ephemeris call for the year
+    solar_vector                = beta00001_SolarVector(julian_date,kernel)
+    beta_rickmans_method_array  = beta_angle_solar_vector(raan_array,i_start,solar_vector)
 
-def delta_RAAN(radius,a,e,i):
-    J2      = 1.08262668e-3     # J2 constant
-    dRAAN   = (-3*np.sqrt(mu)*radius**2*J2*np.cos(i*deg2rad))/(2*a**(7/2))
-    
-    ## Vellado??
-    ## https://strathprints.strath.ac.uk/71130/1/McGrath_Macdonald_JGCD_2020_General_perturbation_method_for_satellite_constellation_deployment.pdf 
-    
-    return dRAAN*rad2deg
-
-#%% Variable Definition
-# Setting variables for the beta angle analysis. All variables defined in radians
-
-kernel      = load_kernel(spk_filepath)  # Load spk kernel
-
-eps         = 23.44*deg2rad     # obliquity of the ecliptic
-R_earth     = 6378              # radius of earth in km
-mu          = 398600.44189
-
-start_date  = astropy.time.Time('2024-9-22')
-num_days    = 365
-
-# setting parameters for the example orbit of the ISS - this could be done differently
-# depending which ones you know
-i_start     = 51.6405
-RAAN_start  = 0
-e_start     = 0.0
-a_start     = 6778
-
-#%% For Loop
-#creating variables that go within the loop
-#setting the time to fall equinox
-raan_list                   = []
-beta_declension_list        = []
-beta_rickmans_method_list   = []
-RAAN                        = RAAN_start
-i_rad                       = i_start*deg2rad
-
-# Iterate through each day to find Beta
-for i,day in enumerate(range(0,num_days)):
-    current_date = start_date + day
-   
-    #### Update RAAN
-    dRAAN           = delta_RAAN(R_earth,a_start,e_start,i_start)*86400
-    RAAN            = RAAN + dRAAN
-    RAAN_rad        = RAAN*deg2rad
-    raan_list.append(RAAN)
-    
-    #### Rickman Method Using original orbit equations
-    
-    
-    
-    #### Rickman Method Using SPK Files
-    julian_date     = current_date.jd
-    body_position   = get_earth_position_ICRF(kernel,julian_date)
-    solar_vector    = get_solar_vector(body_position,julian_date,kernel)
-    beta_rickmans_method = beta_angle_solar_vector(RAAN,i_start, solar_vector)
-    beta_rickmans_method_list.append(beta_rickmans_method)
-   
     #### Declension Method
-    sun                 = get_sun(current_date)
-    sun_declension      = sun.dec.degree
-    sun_RA              = sun.ra.degree
-    beta_dec_method_degrees = beta_angle_dec(RAAN,i_start,sun_RA,sun_declension)
-    beta_declension_list.append(beta_dec_method_degrees)
-   
+    sun_RA, sun_declension, _   = beta00002_SolarAngles(solar_vector)
+    beta_declension_array       = beta_angle_dec(raan_array,i_start,sun_RA,sun_declension)
 
-#### Convert Lists
-beta_declension_array       = np.asarray(beta_declension_list)
-beta_rickmans_method_array  = np.asarray(beta_rickmans_method_list)
-raan_array                  = np.asarray(raan_list)
-
-#load excel data
-DH_file_path    = "beta_angle.xlsx"
-DH_excel_data   = pd.read_excel(DH_file_path, sheet_name='Beta Angle Calculator')
-DH_beta_column  = DH_excel_data.iloc[:, 29]
-beta_angle_DH   = DH_beta_column.iloc[6:372]
-
-#%% Plot
-# Plot the data
-time = np.arange(0, 365)
-plt.plot(time, beta_angle_DH, label = 'DH file')
-plt.plot(time, beta_declension_array, label = 'Declension Method (STCH)')
-plt.plot(time, beta_rickmans_method_array, label = 'Rickman method',linestyle = '--')
-plt.title('Plot of Beta Angle Calculations Over One Year')
-plt.xlabel('Days of the Year')
-plt.ylabel('Beta Angle')
-plt.legend()
-plt.grid()
-plt.show()
+    #load excel data
+    DH_file_path    = "beta_angle.xlsx"
+    DH_excel_data   = pd.read_excel(DH_file_path, sheet_name='Beta Angle Calculator')
+    DH_beta_column  = DH_excel_data.iloc[:, 29]
+    beta_angle_DH   = DH_beta_column.iloc[6:372]
 
+    #%% Plot
+    # Plot the data
+    time = np.arange(0, 365)
+    plt.plot(time, beta_angle_DH, label = 'DH file')
+    plt.plot(time, beta_declension_array, label = 'Declension Method (STCH)')
+    plt.plot(time, beta_rickmans_method_array, label = 'Rickman method',linestyle = '--')
+    plt.title('Plot of Beta Angle Calculations Over One Year')
+    plt.xlabel('Days of the Year')
+    plt.ylabel('Beta Angle')
+    plt.legend()
+    plt.grid()
+    plt.show()
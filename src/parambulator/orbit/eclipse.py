@@ -7,6 +7,7 @@ Created on Sat Jun 15 16:13:10 2024
 """
 
 #%% Initialize
+import csv
 import numpy as np
 
 #%% Functions
@@ -167,46 +168,807 @@ def ecl00000_EclipseEC1(P1,P2,P3,r1,r2):
     
     return eclipseType, occlusion
 
-def ecl00000_EclipseEC2(body1,body2,SCpos):
+def ecl00000_EclipseEC2(body1,body2,SCpos,julian_date,kernel):
     
-    import parambulator.data.planet_data as planet_data
-    import parambulator.ephem.ephem as eph
+    import library.bodies as body
+    import orbit.ephem as eph
     
-    r1  = planet_data[body1]['radius']
-    r2  = planet_data[body2]['radius']
-    P1  = eph.get_position_ICRF[body1]
-    P2  = eph.get_position_ICRF[body2]
+    r1  = body.planets[body1.lower()]['radius']
+    r2  = body.planets[body2.lower()]['radius']
+    P1  = eph.get_position_ICRF(body1,julian_date,kernel)
+    P2  = eph.get_position_ICRF(body2,julian_date,kernel)
     eclipseType, theta, theta1, theta2 = EclipseType(P1,P2,SCpos,r1,r2)
     occlusion = OcclusionPercentage(theta,theta1,theta2)
     
     return eclipseType, occlusion
     
-def EclipseGeometry(P1,P2,P3,r1,r2):
-    #### Calculate Vectors
-    R31     = P1 - P3
-    R21     = P1 - P2
-    R32     = P2 - P3
+def EclipseGeometry(P1,P2,r1,r2):
+    '''
+    Umbra and penumbra cones cast by body 2 in the light of body 1, per
+    epoch. They depend only on the two bodies, so one call serves every
+    observer at those epochs (see ecl00009_ConeEclipseType).
+
+    Both cones share the axis from body 1 through body 2. At a distance x
+    past body 2's center along the axis, the umbra has radius
+    r2/cos(alpha_u) - x*tan(alpha_u) and the penumbra r2/cos(alpha_p) +
+    x*tan(alpha_p), with sin(alpha_u) = (r1 - r2)/D21 and
+    sin(alpha_p) = (r1 + r2)/D21. Past the umbra apex the umbra radius goes
+    negative and its magnitude bounds the antumbra.
+
+    Parameters
+    ----------
+    P1 : array_like, shape (N,3) or (3,)
+        Light source positions [km].
+    P2 : array_like, shape (N,3) or (3,)
+        Occulting body positions [km], same frame as P1.
+    r1 : float
+        Radius of body 1 [km].
+    r2 : float
+        Radius of body 2 [km].
+
+    Returns
+    -------
+    geometry : dict
+        origin : (N,3) body 2 center [km].
+        axis : (N,3) unit vector from body 1 to body 2.
+        distance : (N,) body 1 to body 2 distance D21 [km].
+        umbra_half_angle, penumbra_half_angle : (N,) [rad].
+        umbra_apex, penumbra_apex : (N,3) cone apexes [km]; the umbra apex
+        is inf when r1 == r2.
+        umbra_radius, umbra_slope, penumbra_radius, penumbra_slope : (N,)
+        the r2/cos(alpha) [km] and tan(alpha) terms above.
+
+    '''
+    P1      = np.atleast_2d(np.asarray(P1,dtype=np.float64))
+    P2      = np.atleast_2d(np.asarray(P2,dtype=np.float64))
     
-    #### Calculate Distances
-    D31     = np.sqrt(sum(R31**2))
-    D21     = np.sqrt(sum(R21**2))
-    D32     = np.sqrt(sum(R32**2))
+    #### Shared Axis
+    R21     = P2 - P1
+    D21     = np.sqrt(np.einsum('ij,ij->i',R21,R21))
+    axis    = R21/D21[:,None]
     
-    #### Calculate Angular Radii
-    theta   = np.arccos((np.dot(R32,R31))/(D32*D31))
-    theta1  = np.arcsin(r1/D31)
-    theta2  = np.arcsin(r2/D32)
+    #### Cone Half-Angles
+    alpha_u = np.arcsin(np.clip((r1 - r2)/D21,-1.0,1.0))
+    alpha_p = np.arcsin(np.clip((r1 + r2)/D21,-1.0,1.0))
     
     #### Calculate Eclipse Geometry
-    d1      = np.sqrt( (np.tan(theta1)**2 - r1**2) / ( (1/(D31**2)) -1 ) )
-    d2      = np.sqrt( (np.tan(theta2)**2 - r2**2) / ( (1/(D32**2)) -1 ) )
-    d31     = D31 - np.sqrt(r1**2 - d1**2)
-    d32     = D32 - np.sqrt(r2**2 - d2**2)
-    d       = np.sin(theta)*D32
-    s       = np.cos(theta)*D32
+    k_u     = r2/np.cos(alpha_u)
+    t_u     = np.tan(alpha_u)
+    k_p     = r2/np.cos(alpha_p)
+    t_p     = np.tan(alpha_p)
+    with np.errstate(divide='ignore'):
+        L_u = np.where(t_u != 0,k_u/np.where(t_u != 0,t_u,1.0),np.inf)
+    L_p     = k_p/t_p
+    
+    geometry = {'origin':               P2,
+                'axis':                 axis,
+                'distance':             D21,
+                'umbra_half_angle':     alpha_u,
+                'penumbra_half_angle':  alpha_p,
+                'umbra_apex':           P2 + L_u[:,None]*axis,
+                'penumbra_apex':        P2 - L_p[:,None]*axis,
+                'umbra_radius':         k_u,
+                'umbra_slope':          t_u,
+                'penumbra_radius':      k_p,
+                'penumbra_slope':       t_p,
+                }
     
+    return geometry
+
+#%% Array Functions
+#### Eclipse type codes, as returned by EclipseType
+ECLIPSE_BETWEEN     = -1
+ECLIPSE_SUNLIT      = 0
+ECLIPSE_ANNULAR     = 1
+ECLIPSE_PENUMBRAL   = 2
+ECLIPSE_UMBRAL      = 3
+
+#### Shadow phase names used in GMAT's eclipse report
+ECLIPSE_PHASES      = {ECLIPSE_ANNULAR:     'Antumbra',
+                       ECLIPSE_PENUMBRAL:   'Penumbra',
+                       ECLIPSE_UMBRAL:      'Umbra'}
+
+def ecl00001_EclipseTypeArray(P1,P2,P3,r1,r2):
+    '''
+    Vectorized EclipseType over N epochs.
+
+    Source: https://celestrak.org/columns/v03n01/
+
+    Parameters
+    ----------
+    P1 : array_like, shape (N,3) or (3,)
+        Light source (body 1) positions [km].
+    P2 : array_like, shape (N,3) or (3,)
+        Occulting body (body 2) positions [km], same frame as P1.
+    P3 : array_like, shape (N,3), or orbit.state.OrbitStateArray
+        Observer positions [km], same frame as P1. An OrbitStateArray is
+        taken as states about body 2, so its R is offset by P2.
+    r1 : float or array_like, shape (N,)
+        Radius of body 1 [km].
+    r2 : float or array_like, shape (N,)
+        Radius of body 2 [km].
+
+    Returns
+    -------
+    eclipseType : numpy.ndarray of int8, shape (N,)
+        ECLIPSE_BETWEEN, ECLIPSE_SUNLIT, ECLIPSE_ANNULAR, ECLIPSE_PENUMBRAL
+        or ECLIPSE_UMBRAL per epoch.
+    theta : numpy.ndarray, shape (N,)
+        Angular separation of the body centers seen from P3 [rad].
+    theta1 : numpy.ndarray, shape (N,)
+        Angular radius of body 1 [rad].
+    theta2 : numpy.ndarray, shape (N,)
+        Angular radius of body 2 [rad].
+
+    '''
+    from orbit.state import OrbitStateArray
+
+    P1      = np.atleast_2d(np.asarray(P1,dtype=np.float64))
+    P2      = np.atleast_2d(np.asarray(P2,dtype=np.float64))
+    if isinstance(P3,OrbitStateArray):
+        P3  = P2 + P3.R
+    P3      = np.atleast_2d(np.asarray(P3,dtype=np.float64))
+
+    #### Calculate Vectors
+    R31     = P1 - P3
+    R21     = P1 - P2
+    R32     = P2 - P3
+
+    #### Calculate Distances
+    D31     = np.sqrt(np.einsum('ij,ij->i',R31,R31))
+    D21     = np.sqrt(np.einsum('ij,ij->i',R21,R21))
+    D32     = np.sqrt(np.einsum('ij,ij->i',R32,R32))
+
+    #### Calculate Angular Radii, clipped against round-off past +/-1
+    theta   = np.arccos(np.clip(np.einsum('ij,ij->i',R32,R31)/(D32*D31),-1.0,1.0))
+    theta1  = np.arcsin(np.clip(r1/D31,0.0,1.0))
+    theta2  = np.arcsin(np.clip(r2/D32,0.0,1.0))
+
+    #### Calculate Eclipse Type, in the same order as EclipseType
+    eclipseType = np.select([D31 < D21,
+                             theta < (theta2 - theta1),
+                             (np.abs(theta2 - theta1) < theta) & (theta < (theta1 + theta2)),
+                             theta < (theta1 - theta2)],
+                            [ECLIPSE_BETWEEN,ECLIPSE_UMBRAL,ECLIPSE_PENUMBRAL,ECLIPSE_ANNULAR],
+                            default=ECLIPSE_SUNLIT).astype(np.int8)
+
+    return eclipseType, theta, theta1, theta2
+
+def ecl00002_OcclusionFractionArray(theta,theta1,theta2):
+    '''
+    Vectorized OcclusionPercentage: fraction of body 1's disk covered by
+    body 2, with no printing.
+
+    Source: https://dassencio.org/102
+
+    Parameters
+    ----------
+    theta : array_like
+        Angular separation of the disk centers [rad].
+    theta1 : array_like
+        Angular radius of body 1 [rad].
+    theta2 : array_like
+        Angular radius of body 2 [rad].
+
+    Returns
+    -------
+    occlusion : numpy.ndarray
+        Occluded fraction of body 1's disk, 0 to 1.
+
+    '''
+    Delta   = np.asarray(theta,dtype=np.float64)
+    theta1  = np.asarray(theta1,dtype=np.float64)
+    theta2  = np.asarray(theta2,dtype=np.float64)
+    A1      = np.pi*theta1**2
+
+    #### Larger and smaller effective circles
+    alpha1  = np.maximum(theta1,theta2)
+    alpha2  = np.minimum(theta1,theta2)
+
+    separate    = Delta >= (alpha1 + alpha2)
+    contained   = Delta <= (alpha1 - alpha2)
+    partial     = ~(separate | contained)
+
+    #### Intersection area, only evaluated where the circles cross
+    A_int       = np.where(contained,np.pi*alpha2**2,0.0)
+    if partial.any():
+        a1      = np.broadcast_to(alpha1,partial.shape)[partial]
+        a2      = np.broadcast_to(alpha2,partial.shape)[partial]
+        D       = np.broadcast_to(Delta,partial.shape)[partial]
+        Delta1  = (a1**2 - a2**2 + D**2)/(2*D)
+        Delta2  = D - Delta1
+        A_int   = np.array(A_int,dtype=np.float64)
+        A_int[partial] = (a1**2*np.arccos(np.clip(Delta1/a1,-1.0,1.0))
+                          + a2**2*np.arccos(np.clip(Delta2/a2,-1.0,1.0))
+                          - Delta1*np.sqrt(np.maximum(a1**2 - Delta1**2,0.0))
+                          - Delta2*np.sqrt(np.maximum(a2**2 - Delta2**2,0.0)))
+
+    with np.errstate(divide='ignore',invalid='ignore'):
+        occlusion = np.where(A1 > 0,A_int/A1,0.0)
+
+    return np.clip(occlusion,0.0,1.0)
+
+def ecl00003_EclipseArray(P1,P2,P3,r1,r2):
+    '''
+    Eclipse type codes and occluded fractions of body 1 for N epochs; see
+    ecl00001_EclipseTypeArray for the inputs.
+
+    Returns
+    -------
+    eclipseType : numpy.ndarray of int8, shape (N,)
+        Eclipse type code per epoch.
+    occlusion : numpy.ndarray, shape (N,)
+        Occluded fraction of body 1's disk, 0 where the observer lies
+        between the bodies.
+
+    '''
+    eclipseType, theta, theta1, theta2 = ecl00001_EclipseTypeArray(P1,P2,P3,r1,r2)
+    occlusion = ecl00002_OcclusionFractionArray(theta,theta1,theta2)
+    occlusion[eclipseType == ECLIPSE_BETWEEN] = 0.0
+
+    return eclipseType, occlusion
+
+
+#%% Multiple Occulters
+#### Sunflower sample of the unit disk, used where several occulters overlap
+def _disk_samples(samples):
+    k       = np.arange(samples) + 0.5
+    rho     = np.sqrt(k/samples)
+    phi     = k*np.pi*(3 - np.sqrt(5))
+    return rho, np.cos(phi), np.sin(phi)
+
+def ecl00007_MultiOcculterEclipse(P1,occulters,P3,r1,samples:int=4096):
+    '''
+    Eclipse of one light source by several occulting bodies over N epochs.
+
+    Each body is first screened with the exact overlap test
+    cos(theta) > cos(theta1 + theta2), written with square roots only, plus
+    the EclipseType requirement that the body sits between observer and
+    source. The arccos/arcsin geometry and lens areas are only evaluated at
+    the epochs that pass, so a body like the Moon costs little outside
+    eclipse seasons. Where one body's lens covers the whole source the
+    epoch is fully eclipsed. Where two or more bodies cover parts of the
+    source, the covered fraction of their union is integrated over a
+    sunflower sample of the source disk (error about 1/samples), so
+    overlapping shadows are not counted twice.
+
+    Parameters
+    ----------
+    P1 : array_like, shape (N,3)
+        Light source positions [km].
+    occulters : dict
+        Body name -> (positions, radius), positions (N,3) [km] in the
+        frame of P1 and radius [km].
+    P3 : array_like, shape (N,3)
+        Observer positions [km], frame of P1.
+    r1 : float
+        Light source radius [km].
+    samples : int, optional
+        Disk samples for epochs with overlapping occulters. The default is
+        4096.
+
+    Returns
+    -------
+    eclipseType : numpy.ndarray of int8, shape (N,)
+        ECLIPSE_UMBRAL where the source is fully covered, otherwise the
+        strongest single-body code (ECLIPSE_PENUMBRAL over ECLIPSE_ANNULAR
+        over ECLIPSE_SUNLIT).
+    occlusion : numpy.ndarray, shape (N,)
+        Covered fraction of the source disk, 0 to 1.
+    by_body : dict
+        Body name -> (N,) fraction covered by that body alone.
+
+    '''
+    P1      = np.atleast_2d(np.asarray(P1,dtype=np.float64))
+    P3      = np.atleast_2d(np.asarray(P3,dtype=np.float64))
+    n       = max(len(P1),len(P3))
+    P1, P3  = np.broadcast_to(P1,(n,3)), np.broadcast_to(P3,(n,3))
+    R31     = P1 - P3
+    D31     = np.sqrt(np.einsum('ij,ij->i',R31,R31))
+    sin1    = np.clip(r1/D31,0.0,1.0)
+    cos1    = np.sqrt(1 - sin1**2)
+
+    eclipseType = np.zeros(n,dtype=np.int8)
+    occlusion   = np.zeros(n)
+    covering    = np.zeros(n,dtype=int)
+    by_body     = {}
+    bodies      = {}
+
+    for name,(P2,r2) in occulters.items():
+        P2      = np.broadcast_to(np.asarray(P2,dtype=np.float64),(n,3))
+        R32     = P2 - P3
+        R21     = P1 - P2
+        D32     = np.sqrt(np.einsum('ij,ij->i',R32,R32))
+        D21     = np.sqrt(np.einsum('ij,ij->i',R21,R21))
+        sin2    = np.clip(r2/D32,0.0,1.0)
+        cos2    = np.sqrt(1 - sin2**2)
+
+        #### Cheap screen: disks overlap and the body is not behind the observer
+        cos_theta   = np.einsum('ij,ij->i',R32,R31)/(D32*D31)
+        index       = np.flatnonzero((cos_theta > cos1*cos2 - sin1*sin2) & (D31 >= D21))
+        fraction    = np.zeros(n)
+
+        if index.size:
+            codes, theta, theta1, theta2    = ecl00001_EclipseTypeArray(P1[index],P2[index],P3[index],r1,r2)
+            fraction[index]                 = np.where(codes == ECLIPSE_BETWEEN,0.0,
+                                                       ecl00002_OcclusionFractionArray(theta,theta1,theta2))
+            rank                            = np.select([codes == ECLIPSE_UMBRAL,codes == ECLIPSE_PENUMBRAL,
+                                                         codes == ECLIPSE_ANNULAR],[3,2,1],0)
+            eclipseType[index]              = np.maximum(eclipseType[index],rank)
+
+        by_body[name]   = fraction
+        bodies[name]    = (P2,r2)
+        occlusion       = np.maximum(occlusion,fraction)
+        covering        += fraction > 0
+
+    #### Union of overlapping lenses, sampled on the source disk
+    shared      = np.flatnonzero((covering > 1) & (occlusion < 1))
+    if shared.size:
+        rho, cphi, sphi = _disk_samples(samples)
+        u1              = R31[shared]/D31[shared,None]
+        e1              = np.cross(u1,np.where(np.abs(u1[:,:1]) < 0.9,[[1.0,0.0,0.0]],[[0.0,1.0,0.0]]))
+        e1              /= np.linalg.norm(e1,axis=1)[:,None]
+        e2              = np.cross(u1,e1)
+        radius          = np.arcsin(sin1[shared])[:,None]*rho
+        points          = (np.cos(radius)[...,None]*u1[:,None,:]
+                           + np.sin(radius)[...,None]*(cphi[:,None]*e1[:,None,:] + sphi[:,None]*e2[:,None,:]))
+        covered         = np.zeros(points.shape[:2],dtype=bool)
+
+        for name,(P2,r2) in bodies.items():
+            hit         = by_body[name][shared] > 0
+            if not hit.any():
+                continue
+            R32         = P2[shared[hit]] - P3[shared[hit]]
+            D32         = np.sqrt(np.einsum('ij,ij->i',R32,R32))
+            cos2        = np.sqrt(1 - np.clip(r2/D32,0.0,1.0)**2)
+            covered[hit] |= np.einsum('mkj,mj->mk',points[hit],R32/D32[:,None]) > cos2[:,None]
+
+        occlusion[shared] = np.maximum(occlusion[shared],covered.mean(axis=1))
+
+    eclipseType[occlusion >= 1] = ECLIPSE_UMBRAL
+    return eclipseType, occlusion, by_body
+
+def ecl00008_EclipseFromKernel(kernel,julian_date,P3,
+                               occulters   = ('earth','moon'),
+                               center      = 'earth',
+                               source:str  = 'sun',
+                               samples:int = 4096,
+                               ):
+    '''
+    Multi-occulter eclipse of a spacecraft from kernel positions; radii come
+    from library.bodies.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    julian_date : array_like, shape (N,)
+        TDB Julian dates.
+    P3 : array_like, shape (N,3), or orbit.state.OrbitStateArray
+        Spacecraft positions relative to center [km].
+    occulters : sequence of str, optional
+        Occulting bodies. The default is ('earth','moon').
+    center : str, optional
+        Body P3 is relative to. The default is 'earth'.
+    source : str, optional
+        Light source. The default is 'sun'.
+    samples : int, optional
+        See ecl00007_MultiOcculterEclipse. The default is 4096.
 
+    Returns
+    -------
+    eclipseType, occlusion, by_body
+        As for ecl00007_MultiOcculterEclipse.
+
+    '''
+    import library.bodies as body
+    import orbit.ephem as eph
+    from orbit.state import OrbitStateArray
+
+    if isinstance(P3,OrbitStateArray):
+        P3  = P3.R
+    jd          = np.atleast_1d(np.asarray(julian_date,dtype=np.float64))
+    names       = list(dict.fromkeys([source,center] + list(occulters)))
+    positions   = {name: position.T for name,position in eph.eph00013_compute_chains(kernel,names,jd).items()}
+    P3          = positions[center] + np.asarray(P3,dtype=np.float64).reshape(-1,3)
+
+    return ecl00007_MultiOcculterEclipse(positions[source],
+                                         {name: (positions[name],body.planets[name.lower()]['radius'])
+                                          for name in occulters},
+                                         P3,body.planets[source.lower()]['radius'],samples=samples)
+
+#%% Shared Cone Classification
+def ecl00009_ConeEclipseType(geometry,P3):
+    '''
+    Classify observers against cones from EclipseGeometry with a few dot
+    products each; no per-observer arccos or arcsin.
+
+    Codes match ecl00001_EclipseTypeArray, including ECLIPSE_BETWEEN for
+    observers closer to body 1 than body 2 is (|w|^2 + 2*D21*x < 0, with w
+    the offset from body 2 and x its component along the axis). Observers
+    inside body 2 have no meaningful code.
+
+    Parameters
+    ----------
+    geometry : dict
+        Output of EclipseGeometry for N epochs.
+    P3 : array_like, shape (N,3), (N,M,3), or orbit.state.OrbitStateArray
+        Observer positions [km], same frame as the geometry. (N,M,3)
+        classifies M observers (e.g. a constellation) at each epoch; N may
+        be 1 to reuse one epoch's cones. An OrbitStateArray holds states
+        about body 2: one per epoch, or M observers for a single epoch.
+
+    Returns
+    -------
+    eclipseType : numpy.ndarray of int8, shape (N,) or (N,M)
+
+    '''
+    from orbit.state import OrbitStateArray
+
+    origin  = geometry['origin']
+    if isinstance(P3,OrbitStateArray):
+        w   = P3.R if len(origin) > 1 else P3.R[None]
+    else:
+        P3  = np.asarray(P3,dtype=np.float64)
+        w   = P3 - (origin[:,None,:] if P3.ndim == 3 else origin)
+
+    #### Per-epoch terms broadcast over observers
+    if w.ndim == 3:
+        x       = np.matmul(w,geometry['axis'][:,:,None])[...,0]
+        w2      = np.einsum('nmj,nmj->nm',w,w)
+        column  = lambda key: geometry[key][:,None]
+    else:
+        x       = np.einsum('nj,nj->n',w,geometry['axis'])
+        w2      = np.einsum('nj,nj->n',w,w)
+        column  = lambda key: geometry[key]
+
+    rho2    = w2 - x**2
+    rho_u   = column('umbra_radius') - x*column('umbra_slope')
+    rho_p   = column('penumbra_radius') + x*column('penumbra_slope')
+    inner   = rho2 < rho_u**2
+
+    #### Later assignments take precedence, as in EclipseType's branch order
+    eclipseType = np.zeros(x.shape,dtype=np.int8)
+    eclipseType[(rho2 < rho_p**2) & (rho_p > 0)]  = ECLIPSE_PENUMBRAL
+    eclipseType[inner & (rho_u < 0)]            = ECLIPSE_ANNULAR
+    eclipseType[inner & (rho_u > 0)]            = ECLIPSE_UMBRAL
+    eclipseType[w2 + 2*column('distance')*x < 0] = ECLIPSE_BETWEEN
+
+    return eclipseType
+
+#%% Event Detection
+def ecl00004_ShadowFunctions(P1,P2,P3,r1,r2):
+    '''
+    Continuous shadow functions built from the EclipseType geometry.
+
+    Parameters
+    ----------
+    P1, P2, P3, r1, r2
+        As for ecl00001_EclipseTypeArray.
+
+    Returns
+    -------
+    f_penumbra : numpy.ndarray, shape (N,)
+        theta - (theta1 + theta2) [rad]; negative while the disks overlap.
+    f_umbra : numpy.ndarray, shape (N,)
+        theta - |theta2 - theta1| [rad]; negative while one disk lies fully
+        inside the other (umbra if body 2 looks larger, antumbra if not).
+
+    '''
+    _, theta, theta1, theta2 = ecl00001_EclipseTypeArray(P1,P2,P3,r1,r2)
+    return theta - (theta1 + theta2), theta - np.abs(theta2 - theta1)
+
+def ecl00005_RefineRoots(function,a,b,fa,fb,tol=1e-3,max_iter=100,indexed=False):
+    '''
+    Illinois (modified regula falsi) refinement of many brackets at once,
+    one batched function evaluation per iteration.
+
+    Parameters
+    ----------
+    function : callable
+        Maps an (M,) array of abscissae to an (M,) array of values.
+    a, b : numpy.ndarray, shape (M,)
+        Bracket ends.
+    fa, fb : numpy.ndarray, shape (M,)
+        Function values at a and b, of opposite sign.
+    tol : float, optional
+        Bracket width at which a root counts as converged. The default is
+        1e-3.
+    max_iter : int, optional
+        Iteration cap. The default is 100.
+    indexed : bool, optional
+        If True, function is called as function(x, index) with the bracket
+        indices of x, for brackets that each belong to a different curve.
+        The default is False.
+
+    Returns
+    -------
+    roots : numpy.ndarray, shape (M,)
+
+    '''
+    a, b    = np.array(a,dtype=np.float64), np.array(b,dtype=np.float64)
+    fa, fb  = np.array(fa,dtype=np.float64), np.array(fb,dtype=np.float64)
+    active  = np.abs(b - a) > tol
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        i       = np.flatnonzero(active)
+        c       = b[i] - fb[i]*(b[i] - a[i])/(fb[i] - fa[i])
+        c       = np.where(np.isfinite(c),c,0.5*(a[i] + b[i]))
+        fc      = function(c,i) if indexed else function(c)
+
+        #### Keep the bracket; halve the stale end's value (Illinois step)
+        flip            = fc*fb[i] < 0
+        a[i[flip]]      = b[i[flip]]
+        fa[i[flip]]     = fb[i[flip]]
+        fa[i[~flip]]    *= 0.5
+        b[i], fb[i]     = c, fc
+        active[i]       = (np.abs(b[i] - a[i]) > tol) & (fc != 0)
+
+    return b
+
+def ecl00006_EclipseEvents(positions,start_jd,end_jd,r1,r2,
+                           step:float   = 60.0,
+                           tol:float    = 1e-3,
+                           occ_body:str = 'Earth',
+                           ):
+    '''
+    Eclipse interval table from root-finding on the shadow functions.
+
+    Both shadow functions are sampled on a coarse grid of `step` seconds;
+    each sign change is then refined to `tol` seconds with
+    ecl00005_RefineRoots. Eclipses (or umbral phases) shorter than step
+    can fall between grid points and be missed, so step should stay well
+    below the shortest event of interest.
+
+    Parameters
+    ----------
+    positions : callable
+        positions(julian_date) -> (P1, P2, P3), each (N,3) [km], for an
+        (N,) array of TDB Julian dates, as accepted by
+        ecl00001_EclipseTypeArray.
+    start_jd, end_jd : float
+        Search window [JD].
+    r1, r2 : float
+        Radii of the light source and the occulting body [km].
+    step : float, optional
+        Coarse grid spacing [s]. The default is 60.0.
+    tol : float, optional
+        Event time accuracy [s]. The default is 1e-3.
+    occ_body : str, optional
+        Occulting body name written to the table. The default is 'Earth'.
+
+    Returns
+    -------
+    events : pandas.DataFrame
+        One row per phase, with the columns of GMAT's eclipse report read by
+        utilities.gmat.gmt0103_ImportEclipseFile: 'Start Time' and
+        'Stop Time' [JD], 'Duration' [s], 'Occ Body', 'Type' ('Penumbra',
+        'Umbra' or 'Antumbra'), 'Event Number' and 'Total Duration' [s].
+        events.attrs['evaluations'] counts geometry evaluations.
+
+    '''
+    import pandas as pd
+
+    span        = (end_jd - start_jd)*86400
+    grid        = np.linspace(0.0,span,max(int(np.ceil(span/step)),1) + 1)
+    evaluations = [0]
+
+    def shadow(seconds):
+        evaluations[0] += np.size(seconds)
+        return ecl00004_ShadowFunctions(*positions(start_jd + np.asarray(seconds)/86400),r1,r2)
+
+    def intervals(f,which):
+        '''
+        (start, stop) seconds of the runs where f < 0, refined at each
+        interior sign change.
+        '''
+        inside          = f < 0
+        change          = np.flatnonzero(inside[1:] != inside[:-1])
+        if change.size:
+            roots       = ecl00005_RefineRoots(lambda t: shadow(t)[which],grid[change],grid[change + 1],
+                                               f[change],f[change + 1],tol=tol)
+        else:
+            roots       = np.empty(0)
+        edges           = np.concatenate(([grid[0]] if inside[0] else [],roots,
+                                          [grid[-1]] if inside[-1] else []))
+        return edges.reshape(-1,2)
+
+    f_penumbra, f_umbra = shadow(grid)
+    penumbra    = intervals(f_penumbra,0)
+    umbra       = intervals(f_umbra,1)
+
+    #### Umbra or antumbra, decided at the middle of each full-shadow phase
+    full_type   = []
+    if len(umbra):
+        codes       = ecl00001_EclipseTypeArray(*positions(start_jd + umbra.mean(axis=1)/86400),r1,r2)[0]
+        full_type   = [ECLIPSE_PHASES[ECLIPSE_UMBRAL if code == ECLIPSE_UMBRAL else ECLIPSE_ANNULAR]
+                       for code in codes]
+        evaluations[0] += len(umbra)
+
+    rows        = []
+    for number,(p0,p1) in enumerate(penumbra,start=1):
+        inner   = [(u0,u1,kind) for (u0,u1),kind in zip(umbra,full_type) if p0 <= u1 and u0 <= p1]
+        phases  = []
+        t       = p0
+        for u0,u1,kind in inner:
+            if u0 > t:
+                phases.append((t,u0,'Penumbra'))
+            phases.append((max(u0,p0),min(u1,p1),kind))
+            t       = min(u1,p1)
+        if t < p1:
+            phases.append((t,p1,'Penumbra'))
+        for t0,t1,kind in phases:
+            rows.append((start_jd + t0/86400,start_jd + t1/86400,t1 - t0,occ_body,kind,number,p1 - p0))
+
+    events  = pd.DataFrame(rows,columns=['Start Time','Stop Time','Duration','Occ Body','Type',
+                                         'Event Number','Total Duration'])
+    events.attrs['evaluations'] = evaluations[0]
+
+    return events
+
+#%% Streaming
+#### Interval record emitted by ecl00010_StreamEclipse
+INTERVAL_DTYPE = np.dtype([('satellite',np.int64),('type',np.int8),('start',np.float64),('stop',np.float64)])
+
+def ecl00010_StreamEclipse(chunks,r1,r2):
+    '''
+    Shadow intervals from a stream of time chunks, holding only one chunk
+    and one open run per satellite at a time.
+
+    Each chunk is classified with EclipseGeometry and
+    ecl00009_ConeEclipseType. Runs of constant shadow type are tracked per
+    satellite; a run that is still open at the end of a chunk carries over
+    to the next, so intervals come out the same whatever the chunking. A run
+    starts at its first shadowed sample and stops at the first sample after
+    it, so intervals are as fine as the sampling; refine them with
+    ecl00006_EclipseEvents if needed. Runs still open when the stream ends
+    stop at its last sample. Satellites between the two bodies count as
+    sunlit.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Yields (julian_date, P1, P2, P3) with julian_date (n,) [JD], P1 and
+        P2 (n,3) source and occulter positions [km] and P3 (n,M,3) positions
+        of the M satellites [km], all in one frame. Chunks must be
+        consecutive in time.
+    r1, r2 : float
+        Source and occulter radii [km].
+
+    Yields
+    ------
+    intervals : numpy.ndarray of INTERVAL_DTYPE
+        Intervals closed by each chunk (possibly none): satellite index,
+        shadow type code (ECLIPSE_PHASES), start and stop [JD].
+
+    '''
+    open_type   = None
+    open_start  = None
+    last_jd     = None
+
+    for julian_date,P1,P2,P3 in chunks:
+        jd          = np.asarray(julian_date,dtype=np.float64)
+        if jd.size == 0:
+            continue
+        codes       = ecl00009_ConeEclipseType(EclipseGeometry(P1,P2,r1,r2),P3).T
+        codes[codes == ECLIPSE_BETWEEN] = ECLIPSE_SUNLIT
+        if open_type is None:
+            open_type   = codes[:,0].copy()
+            open_start  = np.full(codes.shape[0],jd[0])
+
+        #### Type changes per satellite, satellite-major then time order
+        previous    = np.concatenate((open_type[:,None],codes[:,:-1]),axis=1)
+        sat, step   = np.nonzero(codes != previous)
+        times       = jd[step]
+
+        #### Each change closes the run that began at the satellite's previous change
+        first       = np.ones(sat.size,dtype=bool)
+        first[1:]   = sat[1:] != sat[:-1]
+        starts      = np.where(first,open_start[sat],np.roll(times,1))
+        closed      = previous[sat,step]
+        keep        = closed != ECLIPSE_SUNLIT
+
+        intervals           = np.empty(keep.sum(),dtype=INTERVAL_DTYPE)
+        intervals['satellite'] = sat[keep]
+        intervals['type']   = closed[keep]
+        intervals['start']  = starts[keep]
+        intervals['stop']   = times[keep]
+
+        #### Carry the open runs into the next chunk
+        last                = np.ones(sat.size,dtype=bool)
+        last[:-1]           = sat[1:] != sat[:-1]
+        open_start[sat[last]] = times[last]
+        open_type           = codes[:,-1].copy()
+        last_jd             = jd[-1]
+
+        yield intervals
+
+    if open_type is not None:
+        sat                 = np.flatnonzero(open_type != ECLIPSE_SUNLIT)
+        intervals           = np.empty(sat.size,dtype=INTERVAL_DTYPE)
+        intervals['satellite'] = sat
+        intervals['type']   = open_type[sat]
+        intervals['start']  = open_start[sat]
+        intervals['stop']   = last_jd
+        yield intervals
+
+def ecl00011_KernelChunks(kernel,observers,start_jd,end_jd,
+                          step:float        = 10.0,
+                          chunk_size:int    = 1024,
+                          source:str        = 'sun',
+                          occulter:str      = 'earth',
+                          ):
+    '''
+    Chunk source for ecl00010_StreamEclipse: kernel positions and satellite
+    positions on a uniform grid, built one chunk at a time.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    observers : callable
+        observers(julian_date) -> (n,M,3) satellite positions relative to
+        the occulter [km] for an (n,) array of TDB Julian dates.
+    start_jd, end_jd : float
+        Time span [JD].
+    step : float, optional
+        Sample spacing [s]. The default is 10.0.
+    chunk_size : int, optional
+        Samples per chunk. Memory per chunk is about 24*chunk_size*M bytes.
+        The default is 1024.
+    source, occulter : str, optional
+        Light source and occulting body. The defaults are 'sun' and
+        'earth'.
+
+    Yields
+    ------
+    julian_date, P1, P2, P3
+        As expected by ecl00010_StreamEclipse.
+
+    '''
+    import orbit.ephem as eph
+
+    count   = int(np.floor((end_jd - start_jd)*86400/step + 1e-9)) + 1
+    for i0 in range(0,count,chunk_size):
+        jd          = start_jd + np.arange(i0,min(i0 + chunk_size,count))*step/86400
+        positions   = eph.eph00013_compute_chains(kernel,[source,occulter],jd)
+        P1, P2      = positions[source].T, positions[occulter].T
+        yield jd, P1, P2, P2[:,None,:] + observers(jd)
+
+def ecl00012_WriteIntervals(stream,filepath,names=None):
+    '''
+    Write intervals from ecl00010_StreamEclipse to a CSV file as they are
+    produced, flushing after every chunk.
+
+    Parameters
+    ----------
+    stream : iterable of numpy.ndarray
+        Interval chunks from ecl00010_StreamEclipse.
+    filepath : str
+        Output .csv path.
+    names : sequence of str, optional
+        Satellite names by index. The default is None (indices).
+
+    Returns
+    -------
+    count : int
+        Number of intervals written.
+
+    '''
+    count   = 0
+    with open(filepath,'w',newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Satellite','Start Time','Stop Time','Duration','Type'])
+        for intervals in stream:
+            for sat,code,start,stop in intervals.tolist():
+                writer.writerow([names[sat] if names is not None else sat,repr(start),repr(stop),
+                                 repr((stop - start)*86400),ECLIPSE_PHASES[code]])
+            count += len(intervals)
+            f.flush()
 
+    return count
 
 if __name__ == '__main__':
     
@@ -6,7 +6,11 @@ Created on Tue Jul  9 12:52:53 2024
 @author: isaacfoster
 """
 #%% Initialize
-from jplephem.spk import SPK
+import weakref
+import numpy as np
+from collections import deque
+from jplephem.spk import SPK, S_PER_DAY, T0
+from jplephem.exceptions import OutOfRangeError
 
 #https://github.com/AndrewAnnex/SpiceyPy
 #https://github.com/skyfielders/python-skyfield/
@@ -16,22 +20,81 @@ from jplephem.spk import SPK
 spk_filepath    = '../library/kernels/de440.bsp'
 spk_folder      = '../library/kernels/'
 
+#### NAIF ids by body name (lookups are case-insensitive)
+body_ids        = {
+    'ssb':                      0,
+    'solarsystembarycenter':    0,
+    'solar system barycenter':  0,
+    'mercurybc':                1,
+    'mercury barycenter':       1,
+    'venusbc':                  2,
+    'venus barycenter':         2,
+    'earthbc':                  3,
+    'earth barycenter':         3,
+    'emb':                      3,
+    'marsbc':                   4,
+    'mars barycenter':          4,
+    'jupiterbc':                5,
+    'jupiter barycenter':       5,
+    'saturnbc':                 6,
+    'saturn barycenter':        6,
+    'uranusbc':                 7,
+    'uranus barycenter':        7,
+    'neptunebc':                8,
+    'neptune barycenter':       8,
+    'plutobc':                  9,
+    'pluto barycenter':         9,
+    'sun':                      10,
+    'mercury':                  199,
+    'venus':                    299,
+    'earth':                    399,
+    'moon':                     301,
+    'luna':                     301,
+    'mars':                     499,
+    'jupiter':                  599,
+    'saturn':                   699,
+    'uranus':                   799,
+    'neptune':                  899,
+    'pluto':                    999,
+    }
+
+#### Segment graphs and resolved chains, per loaded kernel
+_graph_cache    = weakref.WeakKeyDictionary()
+
+#### Contiguous coefficient tables, per segment
+_table_cache    = weakref.WeakKeyDictionary()
+
+#### Optional disk cache of chain results (see eph00030_set_result_cache)
+_result_cache   = None
+
 #%% General Ephemeris Functions
 def eph00001_load_kernel(spk_filepath):
     '''
-    
+    Open an SPK kernel.
+
+    jplephem memory-maps the file and only touches the pages of segments
+    that are evaluated, so a trimmed kernel (see eph00003_write_kernel_subset)
+    costs start-up time and memory in proportion to its own size.
+
+    Passing 'fast' selects orbit.analytic.AnalyticEphemeris instead: a
+    low-precision Sun/Moon/Earth model that needs no file, accepted by
+    every chain-based function in this module.
 
     Parameters
     ----------
-    spk_filepath : TYPE
-        DESCRIPTION.
+    spk_filepath : str
+        Path to the .bsp file, or 'fast'.
 
     Returns
     -------
-    kernel : TYPE
-        DESCRIPTION.
+    kernel : jplephem.spk.SPK or orbit.analytic.AnalyticEphemeris
+        Loaded kernel.
 
     '''
+    if spk_filepath == 'fast':
+        from orbit.analytic import AnalyticEphemeris
+        return AnalyticEphemeris()
+    
     kernel = SPK.open(spk_filepath)
     
     return kernel
@@ -56,10 +119,9 @@ def eph00002_get_available_spk_files(spk_folder,output=False):
         DESCRIPTION.
 
     '''
+    spk_files = []
     try: 
         import os
-        files = os.listdir(spk_folder)
-        spk_files = []
         for files in os.listdir(spk_folder):
             if files.endswith('.bsp'):
                 spk_files.append(files)
@@ -70,6 +132,66 @@ def eph00002_get_available_spk_files(spk_folder,output=False):
         print('ERROR-eph002: Unable to get available SPK files')
     return spk_files
     
+def eph00003_write_kernel_subset(kernel,output_filepath,start_jd,end_jd,bodies=None,center=0):
+    '''
+    Write a valid .bsp holding only the segments needed for some bodies,
+    clipped to a time window.
+
+    Segments are cut on whole Chebyshev records by jplephem's excerpter, so
+    positions from the subset match the full kernel exactly inside the
+    window.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK or str
+        Loaded kernel or path to one.
+    output_filepath : str
+        Path of the .bsp file to write.
+    start_jd : float
+        Start of the window [TDB Julian date].
+    end_jd : float
+        End of the window [TDB Julian date].
+    bodies : sequence of str or int, optional
+        Bodies whose chains to center are kept. The default is None, which
+        keeps every segment.
+    center : str or int, optional
+        Center the chains are resolved against. The default is 0 (solar
+        system barycenter).
+
+    Returns
+    -------
+    output_filepath : str
+        Path of the written file.
+
+    '''
+    from jplephem.excerpter import write_excerpt
+    
+    opened = isinstance(kernel,str)
+    if opened:
+        kernel = eph00001_load_kernel(kernel)
+    
+    try:
+        if bodies is None:
+            pairs = set(kernel.pairs)
+        else:
+            pairs = {segment for body in bodies
+                     for _,segment in eph00012_find_chain(kernel,body,center)}
+        
+        summaries = [(segment.source,(segment.start_second,segment.end_second,
+                                      segment.target,segment.center,segment.frame,
+                                      segment.data_type,segment.start_i,segment.end_i))
+                     for segment in kernel.segments
+                     if (segment.center,segment.target) in pairs
+                     and segment.start_jd < end_jd and segment.end_jd > start_jd]
+        
+        with open(output_filepath,'w+b') as output_file:
+            write_excerpt(kernel,output_file,start_jd,end_jd,summaries)
+    finally:
+        if opened:
+            kernel.close()
+    
+    return output_filepath
+
 def eph00004_PrintKernel(kernel):
     try: 
         print(kernel)
@@ -77,6 +199,420 @@ def eph00004_PrintKernel(kernel):
         print('ERROR-eph004: Unable to print kernel.')
     return True
 
+def eph00005_index_spk_files(spk_folder,index_filepath=None):
+    '''
+    Segment coverage of every .bsp file in a folder, read from the DAF
+    summaries only and persisted to a JSON sidecar.
+
+    Files whose size and modification time match the sidecar are not opened
+    again; the sidecar is rewritten only when something changed.
+
+    Parameters
+    ----------
+    spk_folder : str
+        Folder holding .bsp files.
+    index_filepath : str, optional
+        Sidecar path. The default is None, which uses spk_index.json in
+        spk_folder.
+
+    Returns
+    -------
+    index : dict
+        Keyed by file name; each entry holds 'size', 'mtime' and 'segments',
+        a list of [center, target, start_jd, end_jd, data_type] in file
+        order.
+
+    '''
+    import os
+    import json
+    from jplephem.daf import DAF
+    
+    if index_filepath is None:
+        index_filepath = os.path.join(spk_folder,'spk_index.json')
+    
+    cached = {}
+    if os.path.exists(index_filepath):
+        try:
+            with open(index_filepath) as f:
+                cached = json.load(f)
+        except (OSError,ValueError):
+            cached = {}
+    
+    index   = {}
+    changed = False
+    for name in sorted(eph00002_get_available_spk_files(spk_folder)):
+        path    = os.path.join(spk_folder,name)
+        stat    = os.stat(path)
+        entry   = cached.get(name)
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            index[name] = entry
+            continue
+        
+        with open(path,'rb') as f:
+            segments = [[int(values[3]),int(values[2]),
+                         T0 + values[0]/S_PER_DAY,T0 + values[1]/S_PER_DAY,int(values[5])]
+                        for _,values in DAF(f).summaries()]
+        index[name] = {'size': stat.st_size,'mtime': stat.st_mtime,'segments': segments}
+        changed = True
+    
+    if changed or set(index) != set(cached):
+        with open(index_filepath,'w') as f:
+            json.dump(index,f,indent=1)
+    
+    return index
+
+#%% Body Graph
+def eph00010_body_id(body):
+    '''
+    NAIF id of a body given by name or id.
+
+    Parameters
+    ----------
+    body : str or int
+        Body name from body_ids ("Earth", "MarsBC", "Earth Barycenter", ...)
+        or a NAIF id.
+
+    Returns
+    -------
+    naif_id : int
+        NAIF integer id.
+
+    '''
+    if isinstance(body,str):
+        try:
+            return body_ids[body.strip().lower()]
+        except KeyError:
+            raise ValueError(f"ERROR-eph010: Unknown body '{body}'") from None
+    return int(body)
+
+def eph00011_body_graph(kernel):
+    '''
+    Segment graph of a loaded kernel, built once and cached per kernel.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+
+    Returns
+    -------
+    graph : dict
+        'edges' maps each NAIF id to a list of (neighbor, (center, target))
+        segment keys; 'chains' caches resolved chains by (target, center).
+
+    '''
+    graph = _graph_cache.get(kernel)
+    
+    if graph is None:
+        edges = {}
+        for center,target in kernel.pairs:
+            edges.setdefault(center,[]).append((target,(center,target)))
+            edges.setdefault(target,[]).append((center,(center,target)))
+        graph = {'edges': edges, 'chains': {}}
+        _graph_cache[kernel] = graph
+        
+    return graph
+
+def eph00012_find_chain(kernel,target,center=0):
+    '''
+    Shortest chain of segments giving target relative to center.
+
+    Breadth-first search over the kernel's segment graph, so a chain between
+    two bodies under a shared barycenter (e.g. Earth to Moon) never touches
+    the segments above it. A planet without its own segment (499 in DE440)
+    falls back to its barycenter (4). Results are cached per kernel.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    target : str or int
+        Target body name or NAIF id.
+    center : str or int, optional
+        Center body name or NAIF id. The default is 0 (solar system
+        barycenter).
+
+    Returns
+    -------
+    chain : tuple
+        (sign, (center, target)) pairs; the target's position is the sum of
+        sign*kernel[center, target] over the chain.
+
+    '''
+    graph   = eph00011_body_graph(kernel)
+    target  = eph00014_available_id(graph,eph00010_body_id(target))
+    center  = eph00014_available_id(graph,eph00010_body_id(center))
+    key     = (target,center)
+    
+    if key in graph['chains']:
+        return graph['chains'][key]
+    
+    #### Breadth-first search from center to target
+    previous    = {center: None}
+    queue       = deque([center])
+    while queue and target not in previous:
+        node = queue.popleft()
+        for neighbor,segment in graph['edges'].get(node,[]):
+            if neighbor not in previous:
+                previous[neighbor] = (node,segment)
+                queue.append(neighbor)
+    
+    if target not in previous:
+        raise ValueError(f"ERROR-eph012: No segment chain from {center} to {target} in kernel")
+    
+    chain   = []
+    node    = target
+    while previous[node] is not None:
+        parent, segment = previous[node]
+        chain.append((1.0 if segment[1] == node else -1.0,segment))
+        node = parent
+    
+    chain   = tuple(reversed(chain))
+    graph['chains'][key] = chain
+    
+    return chain
+
+def eph00013_compute_chains(kernel,targets,julian_date,center=0,velocity=False):
+    '''
+    Positions (and optionally velocities) of several targets at the same
+    epochs, evaluating every segment shared between their chains only once.
+    Whole chains are read from and written to the disk cache installed with
+    eph00030_set_result_cache, if any. Analytic backends (see
+    eph00001_load_kernel) answer the whole query themselves.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    targets : sequence of str or int
+        Target body names or NAIF ids.
+    julian_date : float or array_like
+        TDB Julian date(s).
+    center : str or int, optional
+        Center body name or NAIF id. The default is 0 (solar system
+        barycenter).
+    velocity : bool, optional
+        If True, also return velocities. The default is False.
+
+    Returns
+    -------
+    results : dict
+        Keyed by the entries of targets. Each value is a position array
+        shaped like kernel[a,b].compute(julian_date) [km], or a (position,
+        velocity) tuple with velocity in km/day when velocity is True.
+
+    '''
+    if hasattr(kernel,'compute_chains'):
+        return kernel.compute_chains(targets,julian_date,center=center,velocity=velocity)
+    
+    chains      = {name: eph00012_find_chain(kernel,name,center) for name in targets}
+    results     = {}
+
+    #### Serve whole chains from the disk cache when one is installed
+    keys        = {}
+    cache       = _result_cache
+    if cache is not None:
+        kernel_hash = cache.kernel_hash(kernel)
+        if kernel_hash is not None:
+            for name,chain in chains.items():
+                keys[name]  = cache.key(kernel_hash,chain,julian_date,velocity)
+                block       = cache.get(keys[name])
+                if block is not None:
+                    results[name] = (block[0],block[1]) if velocity else block
+
+    missing     = {name: chain for name,chain in chains.items() if name not in results}
+    pairs       = list(dict.fromkeys(segment for chain in missing.values() for _,segment in chain))
+    if pairs:
+        segments = eph00020_evaluate_segments(kernel,pairs,julian_date,velocity=velocity)
+
+    for name,chain in missing.items():
+        if len(chain) == 0:
+            total   = [np.zeros((3,) + np.shape(julian_date)) for _ in range(2)]
+        else:
+            total   = None
+            for sign,segment in chain:
+                values = [sign*value for value in segments[segment]]
+                total  = values if total is None else [t + v for t,v in zip(total,values)]
+        results[name] = (total[0],total[1]) if velocity else total[0]
+        if name in keys:
+            cache.put(keys[name],np.stack(total[:2]) if velocity else total[0])
+
+    return results
+
+def eph00030_set_result_cache(cache):
+    '''
+    Install (or, with None, remove) the disk cache used by every chain-based
+    query in this module. The cache being replaced is flushed.
+
+    Parameters
+    ----------
+    cache : orbit.resultcache.ResultCache or None
+        Cache to consult. Hits are returned as read-only memory maps.
+
+    Returns
+    -------
+    previous : orbit.resultcache.ResultCache or None
+        The cache that was installed before.
+
+    '''
+    global _result_cache
+    previous        = _result_cache
+    _result_cache   = cache
+    if previous is not None and previous is not cache:
+        previous.flush()
+    return previous
+
+def eph00014_available_id(graph,naif_id):
+    '''
+    naif_id, or its system barycenter when the kernel has no segment for a
+    planet body (x99) itself.
+    '''
+    if naif_id not in graph['edges'] and 199 <= naif_id <= 999 and naif_id % 100 == 99:
+        return naif_id//100
+    return naif_id
+
+#%% Vectorized Segment Evaluation
+def eph00020_evaluate_segments(kernel,pairs,julian_date,velocity=False,chunk_size:int=32768):
+    '''
+    Evaluate several type 2/3 segments at the same epochs in one stacked
+    Clenshaw recurrence.
+
+    Each segment's position coefficients are kept as a contiguous
+    (K,records,3) array (built once per segment). For every chunk of epochs
+    they are gathered with one fancy index per segment into a shared
+    (K,S,N,3) stack, zero-padded to the largest polynomial degree, and the
+    recurrence runs once over all S segments. Type 2 velocities come from
+    differentiating the position series, as jplephem does. Type 3
+    segments store their own velocity series (components 3-5, km/s); it is
+    stacked as an extra series and returned in km/day, matching
+    segment.compute(jd)[3:6]*86400 rather than the derivative of the
+    position fit. Segments of other types fall back to their own compute
+    methods.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel (or any object exposing kernel[center,target]).
+    pairs : sequence of tuple
+        (center, target) segment keys.
+    julian_date : float or array_like
+        TDB Julian date(s).
+    velocity : bool, optional
+        If True, also return rates. The default is False.
+    chunk_size : int, optional
+        Epochs per stacked gather, bounding the work array to
+        K*S*chunk_size*3 floats. The default is 32768.
+
+    Returns
+    -------
+    segments : dict
+        Keyed by pair. Values are (position,) or (position, velocity) tuples
+        shaped like kernel[pair].compute(julian_date), in km and km/day.
+
+    '''
+    jd          = np.asarray(julian_date,dtype=np.float64)
+    flat        = jd.ravel()
+    results     = {}
+    stacked     = []
+    
+    for pair in pairs:
+        segment = kernel[pair]
+        if segment.data_type in (2,3):
+            stacked.append((pair,segment))
+        elif velocity:
+            results[pair] = segment.compute_and_differentiate(julian_date)
+        else:
+            results[pair] = (segment.compute(julian_date),)
+    
+    if not stacked:
+        return results
+    
+    #### Record index and normalized time per segment, then the stored type 3
+    #### velocity series as extra rows sharing their segment's records
+    series      = [(i,segment,False) for i,(pair,segment) in enumerate(stacked)]
+    if velocity:
+        series  += [(i,segment,True) for i,(pair,segment) in enumerate(stacked) if segment.data_type == 3]
+    S           = len(series)
+    N           = flat.size
+    tables      = []
+    index       = np.empty((S,N),dtype=np.int64)
+    s           = np.empty((S,N,1))
+    rate_scale  = np.empty((S,1,1))
+    
+    for i,(_,segment,stored_rate) in enumerate(series):
+        pair                = (segment.center,segment.target)
+        init, intlen, table = eph00021_segment_table(segment,velocity=stored_rate)
+        n                   = table.shape[1]
+        record, fraction    = divmod((flat - T0)*S_PER_DAY - init,intlen)
+        record              = record.astype(np.int64)
+        
+        outside             = (record < 0) | (record > n)
+        if outside.any():
+            raise OutOfRangeError(f"ERROR-eph020: Segment {pair} only covers JD {segment.start_jd} "
+                                  f"through {segment.end_jd}",out_of_range_times=outside)
+        
+        last                = record == n
+        record[last]        -= 1
+        fraction[last]      += intlen
+        
+        tables.append(table)
+        index[i]            = record
+        s[i,:,0]            = 2*fraction/intlen - 1
+        rate_scale[i]       = 2*S_PER_DAY/intlen
+    
+    K           = max(table.shape[0] for table in tables)
+    position    = np.empty((S,N,3))
+    rates       = np.empty((S,N,3)) if velocity else None
+    
+    for start in range(0,N,chunk_size):
+        c       = slice(start,min(start + chunk_size,N))
+        n_c     = c.stop - c.start
+        
+        #### One gather per segment into the stack
+        C       = np.zeros((K,S,n_c,3))
+        for i,table in enumerate(tables):
+            np.take(table,index[i,c],axis=1,out=C[K - table.shape[0]:,i])
+        
+        #### Stacked Clenshaw recurrence over (S,n,3)
+        x       = s[:,c]
+        x2      = 2*x
+        w0 = w1 = dw0 = dw1 = 0.0
+        for k in range(K - 1):
+            w2, w1  = w1, w0
+            w0      = C[k] + (x2*w1 - w2)
+            if velocity:
+                dw2, dw1 = dw1, dw0
+                dw0 = 2*w1 + dw1*x2 - dw2
+        
+        position[:,c] = C[K - 1] + (x*w0 - w1)
+        if velocity:
+            rates[:,c] = (w0 + x*dw0 - dw1)*rate_scale
+    
+    stored      = {i: k for k,(i,_,stored_rate) in enumerate(series) if stored_rate}
+    for i,(pair,_) in enumerate(stacked):
+        values = (position[i].T.reshape((3,) + jd.shape),)
+        if velocity:
+            rate    = position[stored[i]]*S_PER_DAY if i in stored else rates[i]
+            values  += (rate.T.reshape((3,) + jd.shape),)
+        results[pair] = values
+    
+    return results
+
+def eph00021_segment_table(segment,velocity:bool=False):
+    '''
+    (init, intlen, table) for a type 2/3 segment, with the position
+    coefficients (or, with velocity, a type 3 segment's stored velocity
+    coefficients) as a contiguous (K,records,3) array, highest order first.
+    Built once per segment and cached.
+    '''
+    cached = _table_cache.setdefault(segment,{})
+    if velocity not in cached:
+        init, intlen, coefficients = segment._data
+        columns = slice(3,6) if velocity else slice(0,3)
+        table   = np.ascontiguousarray(coefficients[:,columns,:].transpose(0,2,1))
+        cached[velocity] = (init,intlen,table)
+    return cached[velocity]
+
 #%% Position Functions
 def eph01000_get_sun_position_ICRF(kernel,julian_date):
     '''
@@ -116,7 +652,7 @@ def eph01010_get_mercury_position_ICRF(kernel,julian_date):
 
     '''
     Mercury_position    = kernel[0,1].compute(julian_date)
-    Mercury_position    = kernel[1,199].compute(julian_date)
+    Mercury_position    += kernel[1,199].compute(julian_date)
     return Mercury_position
 
 def eph01020_get_venus_position_ICRF(kernel,julian_date):
@@ -137,7 +673,7 @@ def eph01020_get_venus_position_ICRF(kernel,julian_date):
 
     '''
     Venus_position      = kernel[0,2].compute(julian_date)
-    Venus_position      -= kernel[0,299].compute(julian_date)
+    Venus_position      += kernel[2,299].compute(julian_date)
     return Venus_position
 
 def eph01030_get_earth_position_ICRF(kernel,julian_date):
@@ -158,13 +694,13 @@ def eph01030_get_earth_position_ICRF(kernel,julian_date):
 
     '''
     Earth_position      = kernel[0,3].compute(julian_date)
-    Earth_position      -= kernel[3,399].compute(julian_date)
+    Earth_position      += kernel[3,399].compute(julian_date)
     return Earth_position
 
 def eph01031_get_luna_position_ICRF(kernel,julian_date):
     
     moon_position   = kernel[0,3].compute(julian_date)
-    moon_position   -= kernel[3,301].compute(julian_date)
+    moon_position   += kernel[3,301].compute(julian_date)
     
     return moon_position
 
@@ -392,8 +928,7 @@ def eph02030_get_earth_velocity_ICRF(kernel,julian_date):
         DESCRIPTION.
 
     '''
-    Earth_velocity      = kernel[0,3].compute_and_differentiate(julian_date)
-    Earth_velocity      -= kernel[3,399].compute_and_differentiate(julian_date)
+    Earth_velocity      = eph00013_compute_chains(kernel,[399],julian_date,velocity=True)[399]
     return Earth_velocity
 
 def eph02031_get_luna_velocity_ICRF(kernel,julian_date):
@@ -413,9 +948,8 @@ def eph02031_get_luna_velocity_ICRF(kernel,julian_date):
         DESCRIPTION.
 
     '''
-    Earth_velocity      = kernel[0,3].compute_and_differentiate(julian_date)
-    Earth_velocity      -= kernel[3,301].compute_and_differentiate(julian_date)
-    return Earth_velocity
+    luna_velocity       = eph00013_compute_chains(kernel,[301],julian_date,velocity=True)[301]
+    return luna_velocity
 
 def eph02032_get_luna_velocity_ECI(kernel,julian_date):
     '''
@@ -580,47 +1114,65 @@ def eph02100_get_plutoBC_velocity_ICRF(kernel,julian_date):
 #%% Extended Functions
 def get_position_ICRF(body,julian_date,kernel):
     '''
-    
+    Position of a body relative to the solar system barycenter.
 
     Parameters
     ----------
-    body : TYPE
-        DESCRIPTION.
-    julian_date : TYPE
-        DESCRIPTION.
-    kernel : TYPE
-        DESCRIPTION.
+    body : str or int
+        Body name from body_ids or NAIF id.
+    julian_date : float or array_like
+        TDB Julian date(s).
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
 
     Returns
     -------
-    TYPE
-        DESCRIPTION.
+    position : numpy.ndarray, shape (3,) or (3,N)
+        ICRF position [km].
 
     '''
-    match body:
-        case "Sun":
-            return eph01000_get_sun_position_ICRF(kernel,julian_date)
-        case "Mercury":
-            return eph01010_get_mercury_position_ICRF(kernel,julian_date)
-        case "Venus":
-            return eph01020_get_venus_position_ICRF(kernel,julian_date)
-        case "Earth":
-            return eph01030_get_earth_position_ICRF(kernel,julian_date)
-        case "EarthBC":
-            return eph01040_get_earthBC_position_ICRF(kernel,julian_date)
-        case "MarsBC":
-            return eph01050_get_marsBC_position_ICRF(kernel,julian_date)
-        case "JupiterBC":
-            return eph01060_get_jupiterBC_position_ICRF(kernel,julian_date)
-        case "SaturnBC":
-            return eph01070_get_saturnBC_position_ICRF(kernel,julian_date)
-        case "UranusBC":
-            return eph01080_get_uranusBC_position_ICRF(kernel,julian_date)
-        case "NeptuneBC":
-            return eph01090_get_neptuneBC_position_ICRF(kernel,julian_date)
-        case "PlutoBC":
-            return eph01100_get_plutoBC_position_ICRF(kernel,julian_date)
+    return eph00013_compute_chains(kernel,[body],julian_date)[body]
         
+def get_state(bodies,julian_date,kernel,center=0):
+    '''
+    Position and velocity of one or more bodies in a single pass.
+
+    Every segment on the requested chains is evaluated once, with one
+    Chebyshev evaluation giving both position and rate.
+
+    Parameters
+    ----------
+    bodies : str, int or sequence of str or int
+        Body name(s) from body_ids or NAIF id(s).
+    julian_date : float or array_like, shape (N,)
+        TDB Julian date(s).
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    center : str or int, optional
+        Center body name or NAIF id. The default is 0 (solar system
+        barycenter).
+
+    Returns
+    -------
+    state : numpy.ndarray, shape (N,6), or dict of them
+        ICRF [x,y,z,vx,vy,vz] in km and km/s. A dict keyed by body is
+        returned when bodies is a sequence.
+
+    '''
+    single      = isinstance(bodies,(str,int,np.integer))
+    targets     = [bodies] if single else list(bodies)
+    julian_date = np.atleast_1d(np.asarray(julian_date,dtype=np.float64))
+    chains      = eph00013_compute_chains(kernel,targets,julian_date,center=center,velocity=True)
+    
+    states      = {}
+    for name,(position,velocity) in chains.items():
+        state           = np.empty((julian_date.size,6))
+        state[:,:3]     = position.T
+        state[:,3:]     = velocity.T/S_PER_DAY
+        states[name]    = state
+    
+    return states[bodies] if single else states
+
 def eph0111_get_relative_position(from_body_position,to_body_position):
     '''
     
@@ -643,125 +1195,51 @@ def eph0111_get_relative_position(from_body_position,to_body_position):
     
 def get_relative_position_ICRF1(from_body,to_body,julian_date,kernel):
     '''
-    
+    Position of to_body relative to from_body, along the shortest segment
+    chain between them.
 
     Parameters
     ----------
-    from_body : TYPE
-        DESCRIPTION.
-    to_body : TYPE
-        DESCRIPTION.
-    julian_date : TYPE
-        DESCRIPTION.
-    kernel : TYPE
-        DESCRIPTION.
+    from_body : str or int
+        Observing body name or NAIF id.
+    to_body : str or int
+        Target body name or NAIF id.
+    julian_date : float or array_like
+        TDB Julian date(s).
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
 
     Returns
     -------
-    relative_position : TYPE
-        DESCRIPTION.
+    relative_position : numpy.ndarray, shape (3,) or (3,N)
+        ICRF position [km].
 
     '''
-    match from_body:
-        case "Sun":
-            from_body_position = eph01000_get_sun_position_ICRF(kernel,julian_date)
-        case "Mercury":
-            from_body_position = eph01010_get_mercury_position_ICRF(kernel,julian_date)
-        case "Venus":
-            from_body_position = eph01020_get_venus_position_ICRF(kernel,julian_date)
-        case "Earth":
-            from_body_position = eph01030_get_earth_position_ICRF(kernel,julian_date)
-        case "Earth Barycenter":
-            from_body_position = eph01040_get_earthBC_position_ICRF(kernel,julian_date)
-        case "Mars":
-            from_body_position = eph01050_get_marsBC_position_ICRF(kernel,julian_date)
-        case "JupiterBC":
-            from_body_position = eph01060_get_jupiterBC_position_ICRF(kernel,julian_date)
-        case "SaturnBC":
-            from_body_position = eph01070_get_saturnBC_position_ICRF(kernel,julian_date)
-        case "UranusBC":
-            from_body_position = eph01080_get_uranusBC_position_ICRF(kernel,julian_date)
-        case "NeptuneBC":
-            from_body_position = eph01090_get_neptuneBC_position_ICRF(kernel,julian_date)
-        case "PlutoBC":
-            from_body_position = eph01100_get_plutoBC_position_ICRF(kernel,julian_date)
-        
-    match to_body:
-        case "Sun":
-            to_body_position = eph01000_get_sun_position_ICRF(kernel,julian_date)
-        case "Mercury":
-            to_body_position = eph01010_get_mercury_position_ICRF(kernel,julian_date)
-        case "Venus":
-            to_body_position = eph01020_get_venus_position_ICRF(kernel,julian_date)
-        case "Earth":
-            to_body_position = eph01030_get_earth_position_ICRF(kernel,julian_date)
-        case "Earth Barycenter":
-            to_body_position = eph01040_get_earthBC_position_ICRF(kernel,julian_date)
-        case "MarsBC":
-            to_body_position = eph01050_get_marsBC_position_ICRF(kernel,julian_date)
-        case "JupiterBC":
-            to_body_position = eph01060_get_jupiterBC_position_ICRF(kernel,julian_date)
-        case "SaturnBC":
-            to_body_position = eph01070_get_saturnBC_position_ICRF(kernel,julian_date)
-        case "UranusBC":
-            to_body_position = eph01080_get_uranusBC_position_ICRF(kernel,julian_date)
-        case "NeptuneBC":
-            to_body_position = eph01090_get_neptuneBC_position_ICRF(kernel,julian_date)
-        case "PlutoBC":
-            to_body_position = eph01100_get_plutoBC_position_ICRF(kernel,julian_date)
-            
-    #### Calculate relative position
-    relative_position = to_body_position - from_body_position
-    
-    return relative_position
+    return eph00013_compute_chains(kernel,[to_body],julian_date,center=from_body)[to_body]
 
 def get_relative_position_ICRF2(fromPos,to_body,julian_date,kernel):
     '''
-    
+    Position of to_body relative to a barycentric ICRF position.
 
     Parameters
     ----------
-    fromPos : TYPE
-        DESCRIPTION.
-    to_body : TYPE
-        DESCRIPTION.
-    julian_date : TYPE
-        DESCRIPTION.
-    kernel : TYPE
-        DESCRIPTION.
+    fromPos : array_like, shape (3,) or (3,N)
+        Observer position relative to the solar system barycenter [km].
+    to_body : str or int
+        Target body name or NAIF id.
+    julian_date : float or array_like
+        TDB Julian date(s).
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
 
     Returns
     -------
-    relative_position : TYPE
-        DESCRIPTION.
+    relative_position : numpy.ndarray, shape (3,) or (3,N)
+        ICRF position [km].
 
     '''
-    match to_body:
-        case "Sun":
-            to_body_position = eph01000_get_sun_position_ICRF(kernel,julian_date)
-        case "Mercury":
-            to_body_position = eph01010_get_mercury_position_ICRF(kernel,julian_date)
-        case "Venus":
-            to_body_position = eph01020_get_venus_position_ICRF(kernel,julian_date)
-        case "Earth":
-            to_body_position = eph01030_get_earth_position_ICRF(kernel,julian_date)
-        case "EarthBC":
-            to_body_position = eph01040_get_earthBC_position_ICRF(kernel,julian_date)
-        case "MarsBC":
-            to_body_position = eph01050_get_marsBC_position_ICRF(kernel,julian_date)
-        case "JupiterBC":
-            to_body_position = eph01060_get_jupiterBC_position_ICRF(kernel,julian_date)
-        case "SaturnBC":
-            to_body_position = eph01070_get_saturnBC_position_ICRF(kernel,julian_date)
-        case "UranusBC":
-            to_body_position = eph01080_get_uranusBC_position_ICRF(kernel,julian_date)
-        case "NeptuneBC":
-            to_body_position = eph01090_get_neptuneBC_position_ICRF(kernel,julian_date)
-        case "PlutoBC":
-            to_body_position = eph01100_get_plutoBC_position_ICRF(kernel,julian_date)
-            
     #### Calculate relative position
-    relative_position = to_body_position - fromPos
+    relative_position = get_position_ICRF(to_body,julian_date,kernel) - fromPos
     
     return relative_position
 
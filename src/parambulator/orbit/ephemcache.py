@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:02:11 2026
+
+@author: isaacfoster
+"""
+#%% Initialize
+import numpy as np
+from collections import OrderedDict
+from jplephem.exceptions import OutOfRangeError
+
+#### Parambulator Libraries
+import orbit.ephem as eph
+
+#%% Constants
+J2000   = 2451545.0
+
+#%% Interpolating Ephemeris Cache
+class EphemerisCache():
+    '''
+    Piecewise cubic Hermite cache of kernel positions and velocities.
+
+    Each body is sampled on a coarse grid of `step` days, one block of
+    `window` days at a time, with a single batched kernel evaluation per
+    block (see orbit.ephem.eph00013_compute_chains). Queries for arbitrary
+    time arrays are then served from the stored nodes without touching the
+    kernel. Blocks are keyed by (body, window) and evicted least recently
+    used once more than max_blocks are held.
+
+    Error bound: on a node interval of length h the cubic Hermite position
+    error is at most h^4/384*max|x^(4)|, and the velocity error is
+    O(h^3*max|x^(4)|). error_bound() estimates x^(4) from third differences
+    of the sampled velocities. With x^(4) ~ r*n^4 for a circular orbit, the
+    default step of 1/8 day keeps the Moon about the Earth and Mercury about
+    the Sun near 1e-3 km, and the Earth about the Sun near 1e-5 km.
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel.
+    center : str or int, optional
+        Center body name or NAIF id. The default is 0 (solar system
+        barycenter).
+    step : float, optional
+        Node spacing [days]. The default is 0.125.
+    window : float, optional
+        Block length [days]; must be a whole number of steps. The default
+        is 32.0.
+    max_blocks : int, optional
+        Maximum number of (body, window) blocks held. The default is 256.
+    '''
+    def __init__(self,
+                 kernel,
+                 center         = 0,
+                 step:float     = 0.125,
+                 window:float   = 32.0,
+                 max_blocks:int = 256,
+                 ):
+
+        n_steps = window/step
+        if abs(n_steps - round(n_steps)) > 1e-9 or n_steps < 1:
+            raise ValueError('window must be a whole number of steps')
+
+        self.kernel     = kernel
+        self.center     = eph.eph00010_body_id(center)
+        self.step       = float(step)
+        self.window     = float(window)
+        self.n_steps    = int(round(n_steps))
+        self.max_blocks = int(max_blocks)
+        self.blocks     = OrderedDict()
+        self.hits       = 0
+        self.misses     = 0
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __repr__(self):
+        return (f"EphemerisCache(blocks={len(self)}, step={self.step}, "
+                f"window={self.window}, hits={self.hits}, misses={self.misses})")
+
+    #%% Blocks
+    def _coverage(self,body):
+        '''
+        Julian date range covered by every segment on the body's chain.
+        '''
+        chain = eph.eph00012_find_chain(self.kernel,body,self.center)
+        if len(chain) == 0:
+            return -np.inf, np.inf
+        start = max(self.kernel[segment].start_jd for _,segment in chain)
+        end   = min(self.kernel[segment].end_jd for _,segment in chain)
+        return start, end
+
+    def _check_coverage(self,body,flat):
+        '''
+        Raise jplephem's OutOfRangeError for query times the kernel does not
+        cover, instead of extrapolating the edge block.
+        '''
+        start, end  = self._coverage(body)
+        outside     = (flat < start) | (flat > end)
+        if outside.any():
+            raise OutOfRangeError(f"ERROR-eph021: Body {body} is only covered from JD {start} "
+                                  f"through {end}",out_of_range_times=outside)
+
+    def _load(self,bodies,windows):
+        '''
+        Sample every missing (body, window) block, evaluating bodies that share
+        a node grid in one kernel call. Eviction waits for _trim() so a query
+        never loses blocks it is about to read.
+        '''
+        missing     = {}
+        for body in bodies:
+            start, end = self._coverage(body)
+            for w in windows:
+                key = (body,w)
+                if key in self.blocks:
+                    self.blocks.move_to_end(key)
+                    self.hits += 1
+                    continue
+                self.misses += 1
+                t0  = max(J2000 + w*self.window,start)
+                t1  = min(J2000 + (w + 1)*self.window,end)
+                if t1 <= t0:
+                    raise OutOfRangeError(f"ERROR-eph020: Window {w} of body {body} is outside the kernel",
+                                          out_of_range_times=np.array([True]))
+                missing.setdefault((t0,t1),[]).append(key)
+
+        for (t0,t1),keys in missing.items():
+            nodes   = np.linspace(t0,t1,self.n_steps + 1)
+            targets = [key[0] for key in keys]
+            states  = eph.eph00013_compute_chains(self.kernel,targets,nodes,
+                                                  center=self.center,velocity=True)
+            for key in keys:
+                position, velocity = states[key[0]]
+                self.blocks[key] = (t0,(t1 - t0)/self.n_steps,
+                                    np.ascontiguousarray(position.T),
+                                    np.ascontiguousarray(velocity.T))
+
+    def _trim(self):
+        '''
+        Evict least recently used blocks beyond max_blocks.
+        '''
+        while len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+
+    def evict(self,body=None,window=None):
+        '''
+        Drop cached blocks for one body and/or one window index; with no
+        arguments, drop everything.
+        '''
+        body = None if body is None else eph.eph00010_body_id(body)
+        for key in list(self.blocks):
+            if (body is None or key[0] == body) and (window is None or key[1] == window):
+                del self.blocks[key]
+
+    #%% Queries
+    def states(self,bodies,julian_date,velocity=True):
+        '''
+        Interpolated states of several bodies at the same epochs.
+
+        Parameters
+        ----------
+        bodies : sequence of str or int
+            Body names or NAIF ids.
+        julian_date : float or array_like
+            TDB Julian date(s).
+        velocity : bool, optional
+            If True, also return velocities. The default is True.
+
+        Returns
+        -------
+        results : dict
+            Keyed by the entries of bodies. Each value is a position array
+            shaped like kernel[a,b].compute(julian_date) [km], or a
+            (position, velocity) tuple with velocity in km/day.
+
+        '''
+        jd          = np.asarray(julian_date,dtype=np.float64)
+        flat        = jd.ravel()
+        ids         = {name: eph.eph00010_body_id(name) for name in bodies}
+        w_index     = np.floor((flat - J2000)/self.window).astype(np.int64)
+        windows     = np.unique(w_index)
+
+        for body in set(ids.values()):
+            self._check_coverage(body,flat)
+        self._load(set(ids.values()),windows.tolist())
+
+        results     = {}
+        for name,body in ids.items():
+            position    = np.empty((flat.size,3))
+            rate        = np.empty((flat.size,3)) if velocity else None
+
+            for w in windows:
+                mask                = w_index == w
+                t0, h, P, V         = self.blocks[(body,int(w))]
+                s                   = (flat[mask] - t0)/h
+                k                   = np.clip(np.floor(s).astype(np.int64),0,self.n_steps - 1)
+                u                   = (s - k)[:,None]
+
+                #### Cubic Hermite basis
+                u2, u3              = u**2, u**3
+                h00, h10            = 2*u3 - 3*u2 + 1, u3 - 2*u2 + u
+                h01, h11            = -2*u3 + 3*u2, u3 - u2
+                position[mask]      = h00*P[k] + h10*h*V[k] + h01*P[k + 1] + h11*h*V[k + 1]
+
+                if velocity:
+                    d00, d10        = 6*u2 - 6*u, 3*u2 - 4*u + 1
+                    d01, d11        = -6*u2 + 6*u, 3*u2 - 2*u
+                    rate[mask]      = (d00*P[k] + d01*P[k + 1])/h + d10*V[k] + d11*V[k + 1]
+
+            position    = position.T.reshape((3,) + jd.shape)
+            if velocity:
+                results[name] = (position,rate.T.reshape((3,) + jd.shape))
+            else:
+                results[name] = position
+
+        self._trim()
+        return results
+
+    def position(self,body,julian_date):
+        '''
+        Interpolated position [km], shaped like kernel[a,b].compute().
+        '''
+        return self.states([body],julian_date,velocity=False)[body]
+
+    def state(self,body,julian_date):
+        '''
+        Interpolated (position [km], velocity [km/day]), shaped like
+        kernel[a,b].compute_and_differentiate().
+        '''
+        return self.states([body],julian_date)[body]
+
+    def error_bound(self,body,julian_date):
+        '''
+        Estimated worst-case position error [km] over the blocks spanning
+        julian_date: h*max|third difference of velocity|/384, doubled to
+        cover the finite-difference estimate of x^(4).
+        '''
+        body        = eph.eph00010_body_id(body)
+        jd          = np.atleast_1d(np.asarray(julian_date,dtype=np.float64))
+        windows     = np.unique(np.floor((jd - J2000)/self.window).astype(np.int64)).tolist()
+        self._check_coverage(body,jd)
+        self._load([body],windows)
+
+        bound       = 0.0
+        for w in windows:
+            t0, h, P, V = self.blocks[(body,w)]
+            if V.shape[0] > 3:
+                d3      = np.diff(V,n=3,axis=0)
+                bound   = max(bound,h*np.sqrt((d3**2).sum(axis=1)).max()/192)
+
+        self._trim()
+        return bound
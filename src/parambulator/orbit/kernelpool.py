@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:31:06 2026
+
+@author: isaacfoster
+"""
+#%% Initialize
+import os
+import numpy as np
+from jplephem.exceptions import OutOfRangeError
+
+#### Parambulator Libraries
+import orbit.ephem as eph
+
+#%% Indexed Kernel
+class IndexedKernel():
+    '''
+    Segment coverage of one .bsp file from the folder index, without opening
+    it. pairs mirrors jplephem's SPK.pairs (the last segment of a pair wins),
+    so orbit.ephem's chain resolver runs on it unchanged.
+    '''
+    def __init__(self,name,entry):
+        self.name   = name
+        self.pairs  = {(center,target): (start_jd,end_jd)
+                       for center,target,start_jd,end_jd,data_type in entry['segments']}
+
+    def covers(self,chain,julian_date):
+        '''
+        Boolean mask of the epochs every segment on chain covers.
+        '''
+        covered = np.ones(julian_date.shape,dtype=bool)
+        for _,segment in chain:
+            start, end  = self.pairs[segment]
+            covered     &= (julian_date >= start) & (julian_date <= end)
+        return covered
+
+#%% Kernel Pool
+class KernelPool():
+    '''
+    Routes ephemeris queries across every .bsp file in a folder.
+
+    The folder is indexed once with orbit.ephem.eph00005_index_spk_files,
+    which keeps a JSON sidecar so later start-ups skip the DAF headers. Each
+    (body, epoch) request goes to the highest-priority file whose chain for
+    that body covers the epoch, and files are only opened when a query
+    first needs them.
+
+    Parameters
+    ----------
+    spk_folder : str
+        Folder holding .bsp files.
+    priority : sequence of str, optional
+        File names, highest priority first. Files not listed follow in
+        reverse name order, so de440.bsp outranks de432.bsp. The default is
+        None.
+    index_filepath : str, optional
+        Sidecar path. The default is None (spk_index.json in spk_folder).
+    '''
+    def __init__(self,
+                 spk_folder,
+                 priority       = None,
+                 index_filepath = None,
+                 ):
+
+        self.spk_folder = spk_folder
+        self.index      = eph.eph00005_index_spk_files(spk_folder,index_filepath)
+        listed          = [name for name in (priority or []) if name in self.index]
+        rest            = sorted((name for name in self.index if name not in listed),reverse=True)
+        self.order      = listed + rest
+        self.indexed    = {name: IndexedKernel(name,self.index[name]) for name in self.order}
+        self.kernels    = {}
+
+    def __repr__(self):
+        return (f"KernelPool(files={len(self.order)}, open={len(self.kernels)}, "
+                f"folder={self.spk_folder!r})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_val,exc_tb):
+        self.close()
+
+    #%% Kernels
+    def kernel(self,name):
+        '''
+        Open (once) and return the kernel for a file in the pool.
+        '''
+        if name not in self.kernels:
+            self.kernels[name] = eph.eph00001_load_kernel(os.path.join(self.spk_folder,name))
+        return self.kernels[name]
+
+    def close(self):
+        for kernel in self.kernels.values():
+            kernel.close()
+        self.kernels = {}
+
+    #%% Routing
+    def route(self,body,julian_date,center=0):
+        '''
+        File chosen for each epoch.
+
+        Parameters
+        ----------
+        body : str or int
+            Body name or NAIF id.
+        julian_date : float or array_like
+            TDB Julian date(s).
+        center : str or int, optional
+            Center body name or NAIF id. The default is 0.
+
+        Returns
+        -------
+        names : numpy.ndarray of object, same shape as julian_date
+            File name per epoch; None where no file covers it.
+
+        '''
+        julian_date = np.asarray(julian_date,dtype=np.float64)
+        names       = np.full(julian_date.shape,None,dtype=object)
+        open_mask   = np.ones(julian_date.shape,dtype=bool)
+
+        for name in self.order:
+            try:
+                chain = eph.eph00012_find_chain(self.indexed[name],body,center)
+            except ValueError:
+                continue
+            take            = open_mask & self.indexed[name].covers(chain,julian_date)
+            names[take]     = name
+            open_mask       &= ~take
+            if not open_mask.any():
+                break
+
+        return names
+
+    def _routed(self,body,julian_date,center,evaluate):
+        jd          = np.atleast_1d(np.asarray(julian_date,dtype=np.float64))
+        names       = self.route(body,jd,center)
+        missing     = names == None
+
+        if missing.any():
+            raise OutOfRangeError(f"ERROR-eph030: No kernel in {self.spk_folder} covers body {body} "
+                                  f"at every epoch",out_of_range_times=missing)
+
+        results     = None
+        for name in dict.fromkeys(names.tolist()):
+            mask    = names == name
+            values  = evaluate(self.kernel(name),jd[mask])
+            if results is None:
+                results = np.empty(values.shape[:-1] + (jd.size,))
+            results[...,mask] = values
+
+        return results
+
+    #%% Queries
+    def position(self,body,julian_date,center=0):
+        '''
+        Position [km] of body relative to center, shaped like
+        orbit.ephem.get_position_ICRF.
+        '''
+        position = self._routed(body,julian_date,center,
+                                lambda kernel,jd: eph.eph00013_compute_chains(kernel,[body],jd,center=center)[body])
+        return position[:,0] if np.ndim(julian_date) == 0 else position
+
+    def get_state(self,body,julian_date,center=0):
+        '''
+        (N,6) state in km and km/s, as orbit.ephem.get_state.
+        '''
+        return self._routed(body,julian_date,center,
+                            lambda kernel,jd: eph.get_state(body,jd,kernel,center=center).T).T
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:40:05 2026
+
+@author: isaacfoster
+"""
+#%% Initialize
+import numpy as np
+import core.defaults as default
+
+#%% Constants
+mu_default  = default.mu
+
+#%% Lambert Solvers
+def lam00001_LambertIzzo(r1,
+                         r2,
+                         tof,
+                         mu=mu_default,
+                         M:int=0,
+                         prograde:bool=True,
+                         lowpath:bool=True,
+                         numiter:int=35,
+                         rtol:float=1e-10):
+    '''
+    Vectorized Lambert solver using Izzo's method.
+
+    Source: Izzo, D. "Revisiting Lambert's problem", CMDA 121 (2015).
+
+    Solves N independent boundary-value problems at once. Every element runs
+    the same Householder iteration with a per-element convergence mask;
+    geometries with no M-revolution solution return NaN instead of raising.
+
+    Parameters
+    ----------
+    r1 : array_like, shape (N,3) or (3,)
+        Initial positions [km].
+    r2 : array_like, shape (N,3) or (3,)
+        Final positions [km].
+    tof : array_like, shape (N,) or scalar
+        Times of flight [s].
+    mu : float, optional
+        Gravitational parameter [km^3/s^2]. The default is mu_default.
+    M : int, optional
+        Number of complete revolutions. The default is 0.
+    prograde : bool, optional
+        Prograde (True) or retrograde (False) transfer. The default is True.
+    lowpath : bool, optional
+        For M > 0, pick the low (True) or high (False) energy branch. The
+        default is True.
+    numiter : int, optional
+        Maximum number of iterations. The default is 35.
+    rtol : float, optional
+        Tolerance on the Lancaster-Blanchard variable x. The default is 1e-10.
+
+    Returns
+    -------
+    v1 : numpy.ndarray, shape (N,3)
+        Departure velocities [km/s].
+    v2 : numpy.ndarray, shape (N,3)
+        Arrival velocities [km/s].
+
+    '''
+    r1          = np.atleast_2d(np.asarray(r1,dtype=np.float64))
+    r2          = np.atleast_2d(np.asarray(r2,dtype=np.float64))
+    r1, r2      = np.broadcast_arrays(r1,r2)
+    tof         = np.broadcast_to(np.asarray(tof,dtype=np.float64),r1.shape[:1])
+
+    #### Geometry
+    c           = r2 - r1
+    c_norm      = np.sqrt(np.einsum('ij,ij->i',c,c))
+    r1_norm     = np.sqrt(np.einsum('ij,ij->i',r1,r1))
+    r2_norm     = np.sqrt(np.einsum('ij,ij->i',r2,r2))
+    s           = (r1_norm + r2_norm + c_norm)/2
+    i_r1        = r1/r1_norm[:,None]
+    i_r2        = r2/r2_norm[:,None]
+    i_h         = np.cross(i_r1,i_r2)
+    with np.errstate(invalid='ignore',divide='ignore'):
+        i_h     = i_h/np.sqrt(np.einsum('ij,ij->i',i_h,i_h))[:,None]
+
+    ll          = np.sqrt(1 - np.minimum(1.0,c_norm/s))
+    neg         = i_h[:,2] < 0
+    ll          = np.where(neg,-ll,ll)
+    i_t1        = np.where(neg[:,None],np.cross(i_r1,i_h),np.cross(i_h,i_r1))
+    i_t2        = np.where(neg[:,None],np.cross(i_r2,i_h),np.cross(i_h,i_r2))
+
+    if prograde is False:
+        ll      = -ll
+        i_t1    = -i_t1
+        i_t2    = -i_t2
+
+    #### Non-dimensional Time of Flight
+    T           = np.sqrt(2*mu/s**3)*tof
+
+    x, y        = lam00101_FindXY(ll,T,M,numiter,lowpath,rtol)
+
+    #### Reconstruct Velocities
+    gamma       = np.sqrt(mu*s/2)
+    rho         = (r1_norm - r2_norm)/c_norm
+    sigma       = np.sqrt(1 - rho**2)
+
+    V_r1        = gamma*((ll*y - x) - rho*(ll*y + x))/r1_norm
+    V_r2        = -gamma*((ll*y - x) + rho*(ll*y + x))/r2_norm
+    V_t1        = gamma*sigma*(y + ll*x)/r1_norm
+    V_t2        = gamma*sigma*(y + ll*x)/r2_norm
+
+    v1          = V_r1[:,None]*i_r1 + V_t1[:,None]*i_t1
+    v2          = V_r2[:,None]*i_r2 + V_t2[:,None]*i_t2
+
+    return v1, v2
+
+def lam00002_LambertIzzoAllRevs(r1,
+                                r2,
+                                tof,
+                                mu=mu_default,
+                                M_max:int=0,
+                                prograde:bool=True,
+                                **kwargs):
+    '''
+    Every Lambert branch up to M_max revolutions, stacked on a leading axis.
+
+    Branch 0 is the direct transfer; branches 2M-1 and 2M are the low and
+    high paths for M revolutions. Infeasible branches are NaN.
+
+    Returns
+    -------
+    v1 : numpy.ndarray, shape (2*M_max+1,N,3)
+        Departure velocities [km/s].
+    v2 : numpy.ndarray, shape (2*M_max+1,N,3)
+        Arrival velocities [km/s].
+
+    '''
+    v1_list, v2_list = [], []
+
+    for M in range(M_max + 1):
+        for lowpath in ((True,) if M == 0 else (True,False)):
+            v1, v2 = lam00001_LambertIzzo(r1,r2,tof,mu,M=M,prograde=prograde,
+                                          lowpath=lowpath,**kwargs)
+            v1_list.append(v1)
+            v2_list.append(v2)
+
+    return np.stack(v1_list), np.stack(v2_list)
+
+#%% Izzo Internals
+def lam00101_FindXY(ll,T,M,numiter,lowpath,rtol):
+    '''
+    Lancaster-Blanchard x and y for arrays of lambda and non-dimensional T.
+    '''
+    M_max       = np.floor(T/np.pi)
+    T_00        = np.arccos(ll) + ll*np.sqrt(1 - ll**2)
+
+    #### Drop the top revolution count where T is below its minimum
+    check       = (T < T_00 + M_max*np.pi) & (M_max > 0)
+    if check.any():
+        T_min   = lam00104_TMin(ll[check],M_max[check],numiter,rtol)
+        M_max[np.flatnonzero(check)[T[check] < T_min]] -= 1
+
+    feasible    = M <= M_max
+
+    x0          = lam00103_InitialGuess(T,ll,M,lowpath)
+    x           = lam00105_Householder(x0,T,ll,M,rtol,numiter)
+    x           = np.where(feasible,x,np.nan)
+    y           = lam00102_ComputeY(x,ll)
+
+    return x, y
+
+def lam00102_ComputeY(x,ll):
+    return np.sqrt(1 - ll**2*(1 - x**2))
+
+def lam00103_InitialGuess(T,ll,M,lowpath):
+    with np.errstate(divide='ignore',invalid='ignore'):
+        if M == 0:
+            T_0     = np.arccos(ll) + ll*np.sqrt(1 - ll**2)
+            T_1     = 2*(1 - ll**3)/3
+            x_long  = (T_0/T)**(2/3) - 1
+            x_short = 5/2*T_1/T*(T_1 - T)/(1 - ll**5) + 1
+            # Corrected piecewise guess (poliastro issue #1362)
+            x_mid   = np.exp(np.log(2)*np.log(T/T_0)/np.log(T_1/T_0)) - 1
+            x_0     = np.where(T >= T_0, x_long, np.where(T < T_1, x_short, x_mid))
+        else:
+            q_l     = ((M*np.pi + np.pi)/(8*T))**(2/3)
+            q_r     = ((8*T)/(M*np.pi))**(2/3)
+            x_0l    = (q_l - 1)/(q_l + 1)
+            x_0r    = (q_r - 1)/(q_r + 1)
+            x_0     = np.maximum(x_0l,x_0r) if lowpath else np.minimum(x_0l,x_0r)
+    return x_0
+
+def lam00104_TMin(ll,M,numiter,rtol):
+    '''
+    Minimum non-dimensional time of flight for M revolutions (M > 0), found
+    with Halley iterations on dT/dx = 0 from x = 0.1.
+    '''
+    x           = np.full_like(ll,0.1)
+    idx         = np.arange(x.size)
+
+    for _ in range(numiter):
+        if idx.size == 0:
+            break
+        x_i     = x[idx]
+        ll_i    = ll[idx]
+        y       = lam00102_ComputeY(x_i,ll_i)
+        T_i     = lam00106_TofEquationY(x_i,y,0.0,ll_i,M[idx])
+        d1, d2, d3 = lam00107_TofDerivatives(x_i,y,T_i,ll_i)
+        x_new   = x_i - 2*d1*d2/(2*d2**2 - d1*d3)
+        x[idx]  = x_new
+        idx     = idx[~(np.abs(x_new - x_i) < rtol)]
+
+    y           = lam00102_ComputeY(x,ll)
+    T_min       = lam00106_TofEquationY(x,y,0.0,ll,M)
+
+    return T_min
+
+def lam00105_Householder(x0,T0,ll,M,rtol,numiter):
+    x           = np.array(x0,dtype=np.float64)
+    idx         = np.flatnonzero(np.isfinite(x))
+
+    for _ in range(numiter):
+        if idx.size == 0:
+            break
+        x_i     = x[idx]
+        ll_i    = ll[idx]
+        T0_i    = T0[idx]
+        y       = lam00102_ComputeY(x_i,ll_i)
+        fval    = lam00106_TofEquationY(x_i,y,T0_i,ll_i,M)
+        d1, d2, d3 = lam00107_TofDerivatives(x_i,y,fval + T0_i,ll_i)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            x_new = x_i - fval*((d1**2 - fval*d2/2)/(d1*(d1**2 - fval*d2) + d3*fval**2/6))
+        x[idx]  = x_new
+        idx     = idx[~(np.abs(x_new - x_i) < rtol)]
+
+    return x
+
+def lam00106_TofEquationY(x,y,T0,ll,M):
+    '''
+    Non-dimensional time of flight minus T0, using the hypergeometric series
+    near the parabola for direct transfers.
+    '''
+    with np.errstate(divide='ignore',invalid='ignore'):
+        #### Battin series near x = 1
+        eta     = y - ll*x
+        S_1     = (1 - ll - x*eta)/2
+        near    = (np.asarray(M) == 0) & (x > np.sqrt(0.6)) & (x < np.sqrt(1.4))
+        Q       = 4/3*lam00108_Hyp2f1b(np.where(near,S_1,0.0))
+        T_near  = (eta**3*Q + 4*ll*eta)/2
+
+        #### General expression
+        ell     = (x >= -1) & (x < 1)
+        hyp     = x > 1
+        psi     = np.where(ell, np.arccos(np.clip(x*y + ll*(1 - x**2),-1,1)),
+                           np.where(hyp, np.arcsinh((y - x*ll)*np.sqrt(np.abs(x**2 - 1))), 0.0))
+        T_gen   = ((psi + M*np.pi)/np.sqrt(np.abs(1 - x**2)) - x + ll*y)/(1 - x**2)
+
+    return np.where(near,T_near,T_gen) - T0
+
+def lam00107_TofDerivatives(x,y,T,ll):
+    '''
+    First three derivatives of the non-dimensional time of flight in x.
+    '''
+    with np.errstate(divide='ignore',invalid='ignore'):
+        dT      = (3*T*x - 2 + 2*ll**3*x/y)/(1 - x**2)
+        ddT     = (3*T + 5*x*dT + 2*(1 - ll**2)*ll**3/y**3)/(1 - x**2)
+        dddT    = (7*x*ddT + 8*dT - 6*(1 - ll**2)*ll**5*x/y**5)/(1 - x**2)
+    return dT, ddT, dddT
+
+def lam00108_Hyp2f1b(x,max_terms:int=200):
+    '''
+    Gauss hypergeometric 2F1(3,1;5/2;x) by series, for arrays with |x| < 1.
+    '''
+    x           = np.asarray(x,dtype=np.float64)
+    res         = np.ones_like(x)
+    term        = np.ones_like(x)
+
+    for ii in range(max_terms):
+        term    = term*(3 + ii)*(1 + ii)/(5/2 + ii)*x/(ii + 1)
+        res     = res + term
+        if np.all(np.abs(term) <= 1e-16*np.abs(res)):
+            break
+
+    return np.where(x >= 1,np.inf,res)
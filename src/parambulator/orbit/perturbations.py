@@ -5,4 +5,199 @@ Created on Sat Aug 10 13:17:47 2024
 
 @author: isaacfoster
 """
+#%% Initialize
+import numpy as np
 
+#### Parambulator Libraries
+import core.defaults as default
+import orbit.twobody as twb
+
+#%% Constants
+J2              = 1.08262668e-3                 # Earth zonal harmonics (EGM96, unnormalized)
+J4              = -1.61962159e-6
+TROPICAL_YEAR   = 365.2421897*86400             # s, period of the sun-synchronous node
+mu_default      = default.mu
+radius_default  = default.radius
+
+deg2rad         = np.pi/180
+rad2deg         = 1/deg2rad
+
+#%% Secular Rates
+def ptb00001_SecularRates(a,e,i,radius=radius_default,mu=mu_default,J2=J2,J4=None):
+    '''
+    First-order secular rates of the node, argument of perigee and mean
+    anomaly under the zonal harmonics J2 and, optionally, J4.
+
+    J2 terms are the classical first-order rates (Vallado, 2013, eq. 9-41).
+    J4 terms come from the doubly averaged J4 potential through Lagrange's
+    planetary equations. Second-order J2^2 terms are left out, and J3 has no
+    first-order secular effect, so errors grow at the 1e-3 level of the J2
+    rates. All arguments broadcast against each other.
+
+    Parameters
+    ----------
+    a : array_like
+        Mean semi-major axis [km].
+    e : array_like
+        Mean eccentricity, 0 <= e < 1.
+    i : array_like
+        Mean inclination [deg].
+    radius : float, optional
+        Equatorial radius of the central body [km]. The default is
+        radius_default.
+    mu : float, optional
+        Gravitational parameter [km^3/s^2]. The default is mu_default.
+    J2 : float, optional
+        Second zonal harmonic. The default is Earth's J2.
+    J4 : float, optional
+        Fourth zonal harmonic; None or 0 skips the J4 terms. The default is
+        None.
+
+    Returns
+    -------
+    rates : dict of numpy.ndarray
+        'RAAN', 'omega' and 'M' rates [deg/s]. 'M' includes the mean motion.
+
+    '''
+    a, e, i     = [np.asarray(v,dtype=np.float64) for v in (a,e,i)]
+    n           = np.sqrt(mu/a**3)
+    eta         = np.sqrt(1 - e**2)
+    p           = a*eta**2
+    c, s2       = np.cos(i*deg2rad), np.sin(i*deg2rad)**2
+
+    #### J2
+    ## https://strathprints.strath.ac.uk/71130/1/McGrath_Macdonald_JGCD_2020_General_perturbation_method_for_satellite_constellation_deployment.pdf
+    k2          = n*J2*(radius/p)**2
+    dRAAN       = -1.5*k2*c
+    domega      = 0.75*k2*(4 - 5*s2)
+    dM          = n + 0.75*k2*eta*(2 - 3*s2)
+
+    #### J4
+    if J4:
+        k4      = n*J4*(radius/p)**4
+        dRAAN4  = 15/16*k4*(1 + 1.5*e**2)*c*(4 - 7*s2)
+        dRAAN   = dRAAN + dRAAN4
+        domega  = domega - 2.5*k4*(4 + 3*e**2)*(105*s2**2 - 120*s2 + 24)/64 - c*dRAAN4
+        dM      = dM - 45/128*k4*eta*e**2*(35*s2**2 - 40*s2 + 8)
+
+    rates       = {'RAAN':  dRAAN*rad2deg,
+                   'omega': domega*rad2deg,
+                   'M':     dM*rad2deg}
+
+    return rates
+
+def ptb00002_SunSynchronousInclination(a,e=0.0,radius=radius_default,mu=mu_default,J2=J2):
+    '''
+    Inclination whose J2 node rate matches the Sun's mean motion.
+
+    Parameters
+    ----------
+    a : array_like
+        Mean semi-major axis [km].
+    e : array_like, optional
+        Mean eccentricity. The default is 0.0.
+    radius, mu, J2 : float, optional
+        Central body constants, as in ptb00001_SecularRates.
+
+    Returns
+    -------
+    i : numpy.ndarray
+        Inclination [deg]; NaN where no inclination is fast enough.
+
+    '''
+    a, e        = np.asarray(a,dtype=np.float64), np.asarray(e,dtype=np.float64)
+    n           = np.sqrt(mu/a**3)
+    p           = a*(1 - e**2)
+    cos_i       = -(2*np.pi/TROPICAL_YEAR)/(1.5*n*J2*(radius/p)**2)
+    with np.errstate(invalid='ignore'):
+        i       = np.where(np.abs(cos_i) <= 1,np.arccos(np.clip(cos_i,-1,1))*rad2deg,np.nan)
+
+    return i
+
+#%% Mean Element Propagation
+def _true_to_mean(nu,e):
+    '''
+    Mean anomaly [deg] from true anomaly [deg] for elliptic orbits.
+    '''
+    nu      = np.asarray(nu,dtype=np.float64)*deg2rad
+    E       = 2*np.arctan2(np.sqrt(1 - e)*np.sin(nu/2),np.sqrt(1 + e)*np.cos(nu/2))
+    return (E - e*np.sin(E))*rad2deg
+
+def ptb00003_PropagateMeanElements(elements,
+                                   julian_date,
+                                   epoch                = None,
+                                   radius               = radius_default,
+                                   mu                   = mu_default,
+                                   J2                   = J2,
+                                   J4                   = None,
+                                   true_anomaly:bool    = True,
+                                   ):
+    '''
+    Secular J2 (optionally J2-J4) mean-element propagation of N orbits over
+    a shared time grid in one shot.
+
+    a, e and i stay at their mean values; RAAN, omega and M drift linearly
+    at the rates of ptb00001_SecularRates. This is the fast first-pass model
+    for sun-synchronous and Walker constellation planning; short- and
+    long-period terms, drag and third bodies are ignored, and the inputs
+    are taken as mean elements.
+
+    Parameters
+    ----------
+    elements : dict or orbit.state.OrbitStateArray
+        Mean elements with keys 'a' [km], 'e', 'i', 'RAAN', 'omega' [deg]
+        and either 'M' or 'nu' [deg], each a scalar or (N,) array; or an
+        OrbitStateArray, whose osculating elements and epochs are used.
+    julian_date : float or array_like, shape (T,)
+        TDB Julian dates to report.
+    epoch : float or array_like, shape (N,), optional
+        Epoch of the elements [JD]. Required for dict input; an
+        OrbitStateArray carries its own. The default is None.
+    radius, mu, J2, J4 : float, optional
+        Central body constants, as in ptb00001_SecularRates. mu defaults
+        to the OrbitStateArray's own for state input.
+    true_anomaly : bool, optional
+        Also solve Kepler's equation for 'nu'. The default is True.
+
+    Returns
+    -------
+    history : dict of numpy.ndarray, shape (T,N)
+        'a', 'e', 'i', 'RAAN', 'omega', 'M' and, if requested, 'nu'. Angles
+        in degrees, wrapped to [0, 360).
+
+    '''
+    if isinstance(elements,dict):
+        if epoch is None:
+            raise ValueError('ERROR-ptb001: epoch is required for element dict input')
+        source  = elements
+    else:
+        source  = elements.elements
+        epoch   = elements.epoch if epoch is None else epoch
+        mu      = elements.mu
+
+    a, e, i, RAAN, omega = np.broadcast_arrays(*[np.atleast_1d(np.asarray(source[key],dtype=np.float64))
+                                                 for key in ('a','e','i','RAAN','omega')])
+    if np.any(e >= 1) or np.any(a <= 0):
+        raise ValueError('ERROR-ptb002: Mean-element propagation needs elliptic orbits (e < 1, a > 0)')
+
+    M0          = source['M'] if 'M' in source else _true_to_mean(source['nu'],e)
+    M0          = np.broadcast_to(np.asarray(M0,dtype=np.float64),a.shape)
+    epoch       = np.broadcast_to(np.asarray(epoch,dtype=np.float64),a.shape)
+
+    #### Elapsed time [s], (T,N)
+    jd          = np.atleast_1d(np.asarray(julian_date,dtype=np.float64))
+    dt          = (jd[:,None] - epoch[None,:])*86400
+
+    rates       = ptb00001_SecularRates(a,e,i,radius=radius,mu=mu,J2=J2,J4=J4)
+    shape       = dt.shape
+    history     = {'a':     np.broadcast_to(a,shape).copy(),
+                   'e':     np.broadcast_to(e,shape).copy(),
+                   'i':     np.broadcast_to(i,shape).copy(),
+                   'RAAN':  np.remainder(RAAN + rates['RAAN']*dt,360),
+                   'omega': np.remainder(omega + rates['omega']*dt,360),
+                   'M':     np.remainder(M0 + rates['M']*dt,360)}
+
+    if true_anomaly:
+        history['nu'] = np.remainder(twb.twb00117_mean_to_true_anomaly(history['M'],history['e']),360)
+
+    return history
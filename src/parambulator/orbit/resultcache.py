@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:14:52 2026
+
+@author: isaacfoster
+"""
+#%% Initialize
+import os
+import json
+import time
+import hashlib
+import numpy as np
+
+#%% Result Cache
+class ResultCache():
+    '''
+    Content-addressed disk cache of ephemeris chain results.
+
+    Keys hash the kernel file contents, the signed segment chain, whether
+    velocities were requested and the time grid (shape plus the bytes of the
+    Julian dates), so a result is only reused for exactly the same inputs.
+    Each result is one .npy block, opened memory-mapped and read-only on a
+    hit. A JSON index tracks block sizes and last use; the least recently
+    used blocks are deleted once the total passes max_bytes. Hits only
+    update last use in memory; the index is written by put, evict, flush
+    and close.
+
+    Install it with orbit.ephem.eph00030_set_result_cache so that
+    get_position_ICRF, get_state and the other chain-based calls use it.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Folder for the blocks and index.json; created if missing.
+    max_bytes : int, optional
+        Size cap for all blocks. The default is 2**30.
+    '''
+    def __init__(self,
+                 cache_dir,
+                 max_bytes:int = 2**30,
+                 ):
+
+        os.makedirs(cache_dir,exist_ok=True)
+        self.cache_dir      = cache_dir
+        self.max_bytes      = int(max_bytes)
+        self.index_filepath = os.path.join(cache_dir,'index.json')
+        self.index          = {}
+        self.kernel_hashes  = {}
+        self.hits           = 0
+        self.misses         = 0
+        self.dirty          = False
+
+        if os.path.exists(self.index_filepath):
+            try:
+                with open(self.index_filepath) as f:
+                    self.index = json.load(f)
+            except (OSError,ValueError):
+                self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        return (f"ResultCache(blocks={len(self)}, bytes={self.nbytes}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_val,exc_tb):
+        self.close()
+
+    @property
+    def nbytes(self):
+        return sum(entry['bytes'] for entry in self.index.values())
+
+    #%% Keys
+    def kernel_hash(self,kernel):
+        '''
+        SHA-256 of the kernel file, memoized by (path, size, mtime); None
+        for kernels that are not backed by a file.
+        '''
+        try:
+            path = os.path.abspath(kernel.daf.file.name)
+        except AttributeError:
+            return None
+        stat    = os.stat(path)
+        memo    = (path,stat.st_size,stat.st_mtime)
+        if memo not in self.kernel_hashes:
+            digest = hashlib.sha256()
+            with open(path,'rb') as f:
+                for block in iter(lambda: f.read(1 << 20),b''):
+                    digest.update(block)
+            self.kernel_hashes[memo] = digest.hexdigest()
+        return self.kernel_hashes[memo]
+
+    def key(self,kernel_hash,chain,julian_date,velocity):
+        '''
+        Block key for one chain evaluated on one time grid.
+        '''
+        jd      = np.ascontiguousarray(julian_date,dtype=np.float64)
+        digest  = hashlib.sha256()
+        digest.update(repr((kernel_hash,chain,bool(velocity),jd.shape)).encode())
+        digest.update(jd.tobytes())
+        return digest.hexdigest()
+
+    #%% Blocks
+    def _path(self,key):
+        return os.path.join(self.cache_dir,key + '.npy')
+
+    def get(self,key):
+        '''
+        Memory-mapped, read-only block for key, or None.
+        '''
+        if key not in self.index or not os.path.exists(self._path(key)):
+            self.index.pop(key,None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.index[key]['last_used'] = time.time()
+        self.dirty = True
+        return np.load(self._path(key),mmap_mode='r')
+
+    def put(self,key,values):
+        '''
+        Store a block and evict least recently used blocks over max_bytes.
+        '''
+        values  = np.ascontiguousarray(values)
+        path    = self._path(key)
+        temp    = path + f'.{os.getpid()}.tmp'
+        with open(temp,'wb') as f:
+            np.save(f,values)
+        os.replace(temp,path)
+
+        self.index[key] = {'bytes': os.path.getsize(path),'last_used': time.time()}
+        self.evict()
+
+    def evict(self,max_bytes=None):
+        '''
+        Delete least recently used blocks until the total is within
+        max_bytes (default self.max_bytes).
+        '''
+        max_bytes   = self.max_bytes if max_bytes is None else max_bytes
+        total       = self.nbytes
+        for key in sorted(self.index,key=lambda k: self.index[k]['last_used']):
+            if total <= max_bytes:
+                break
+            total -= self.index.pop(key)['bytes']
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+        self._write_index()
+
+    def clear(self):
+        self.evict(max_bytes=0)
+
+    def flush(self):
+        '''
+        Write last-use times recorded by hits since the last index write.
+        '''
+        if self.dirty:
+            self._write_index()
+
+    def close(self):
+        self.flush()
+
+    def _write_index(self):
+        temp = self.index_filepath + f'.{os.getpid()}.tmp'
+        with open(temp,'w') as f:
+            json.dump(self.index,f)
+        os.replace(temp,self.index_filepath)
+        self.dirty = False
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:05:48 2026
+
+@author: isaacfoster
+"""
+#%% Initialize
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+from jplephem.spk import Segment, S_PER_DAY, T0
+
+#### Parambulator Libraries
+import orbit.ephem as eph
+
+#### Kernels attached in this process, by shared memory block name
+_attached       = {}
+worker_kernel   = None
+
+#%% Shared Kernel
+class SharedKernel():
+    '''
+    SPK type 2/3 coefficients held in one multiprocessing.shared_memory
+    block.
+
+    The parent process copies the chosen segments in once with create().
+    Workers attach by name and build jplephem Segment objects whose
+    coefficient arrays are zero-copy views into the block, so each worker
+    skips opening, mapping and parsing the kernel. The object quacks like
+    jplephem.spk.SPK (segments, pairs, kernel[center,target]) and works
+    with every orbit.ephem function that takes a kernel.
+
+    Pickling a SharedKernel only sends its descriptor, so it can be passed
+    straight to process-pool tasks; each worker attaches once and reuses
+    the attachment for later tasks. Pools should use a spawn or forkserver
+    context (see shk0001_init_worker).
+
+    Parameters
+    ----------
+    descriptor : dict
+        Block name and segment layout, as built by create().
+    shm : multiprocessing.shared_memory.SharedMemory
+        The attached block.
+    owner : bool, optional
+        True in the process that created the block. The default is False.
+    '''
+    def __init__(self,
+                 descriptor,
+                 shm,
+                 owner:bool = False,
+                 ):
+
+        self.descriptor = descriptor
+        self.shm        = shm
+        self.owner      = owner
+        buffer          = np.ndarray((shm.size//8,),dtype=np.float64,buffer=shm.buf)
+        self.segments   = []
+
+        for source,summary,offset,n,rsize,init,intlen in descriptor['segments']:
+            component_count     = 3 if summary[5] == 2 else 6
+            coefficients        = buffer[offset:offset + n*rsize].reshape((n,rsize))[:,2:]
+            coefficients        = coefficients.reshape((n,component_count,(rsize - 2)//component_count))
+            coefficients        = np.rollaxis(np.rollaxis(coefficients,1),2)[::-1]
+
+            segment             = Segment(None,source,summary)
+            segment._data       = (init,intlen,coefficients)
+            self.segments.append(segment)
+
+        self.pairs      = dict(((s.center,s.target),s) for s in self.segments)
+
+    def __getitem__(self,key):
+        return self.pairs[key]
+
+    def __reduce__(self):
+        return (SharedKernel.attach,(self.descriptor,))
+
+    def __repr__(self):
+        return (f"SharedKernel(name={self.descriptor['name']!r}, "
+                f"segments={len(self.segments)}, bytes={self.shm.size})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_val,exc_tb):
+        self.close()
+
+    #%% Constructors
+    @classmethod
+    def create(cls,kernel,bodies=None,center=0,start_jd=None,end_jd=None):
+        '''
+        Copy a kernel's type 2/3 segments into a new shared memory block.
+
+        Parameters
+        ----------
+        kernel : jplephem.spk.SPK or str
+            Loaded kernel or path to one.
+        bodies : sequence of str or int, optional
+            Only keep segments on these bodies' chains to center. The
+            default is None, which keeps every segment.
+        center : str or int, optional
+            Center the chains are resolved against. The default is 0.
+        start_jd, end_jd : float, optional
+            Keep only the whole Chebyshev records overlapping this window.
+            The default is None, which keeps every record.
+
+        Returns
+        -------
+        shared : SharedKernel
+            Owning instance; call close() when the pool is done with it.
+
+        '''
+        opened = isinstance(kernel,str)
+        if opened:
+            kernel = eph.eph00001_load_kernel(kernel)
+
+        try:
+            if bodies is None:
+                pairs = set(kernel.pairs)
+            else:
+                pairs = {segment for body in bodies
+                         for _,segment in eph.eph00012_find_chain(kernel,body,center)}
+
+            #### Layout: whole records of every kept segment, back to back
+            layout  = []
+            arrays  = []
+            offset  = 0
+            for segment in kernel.segments:
+                if (segment.center,segment.target) not in pairs or segment.data_type not in (2,3):
+                    continue
+                init, intlen, rsize, n  = segment.daf.read_array(segment.end_i - 3,segment.end_i)
+                rsize, n                = int(rsize), int(n)
+                i, j                    = 0, n
+                if start_jd is not None:
+                    i = int(np.clip(((start_jd - T0)*S_PER_DAY - init)//intlen,0,n))
+                if end_jd is not None:
+                    j = int(np.clip(((end_jd - T0)*S_PER_DAY - init)//intlen + 1,0,n))
+                if i >= j:
+                    continue
+                records = segment.daf.map_array(segment.start_i + rsize*i,segment.start_i + rsize*j - 1)
+                summary = (init + i*intlen,init + j*intlen,segment.target,segment.center,
+                           segment.frame,segment.data_type,segment.start_i,segment.end_i)
+                layout.append((segment.source,summary,offset,j - i,rsize,init + i*intlen,intlen))
+                arrays.append(records)
+                offset  += records.size
+
+            shm     = shared_memory.SharedMemory(create=True,size=max(8*offset,8))
+            buffer  = np.ndarray((offset,),dtype=np.float64,buffer=shm.buf)
+            start   = 0
+            for records in arrays:
+                buffer[start:start + records.size] = records
+                start += records.size
+            del buffer
+        finally:
+            if opened:
+                kernel.close()
+
+        shared  = cls({'name': shm.name,'segments': layout},shm,owner=True)
+        _attached[shm.name] = shared
+        return shared
+
+    @classmethod
+    def attach(cls,descriptor):
+        '''
+        Attach to a block created elsewhere, reusing this process's existing
+        attachment if there is one.
+        '''
+        shared = _attached.get(descriptor['name'])
+        if shared is None:
+            try:
+                shm = shared_memory.SharedMemory(name=descriptor['name'],track=False)
+            except TypeError:
+                # Python < 3.13 registers every attachment with the resource
+                # tracker, which then unlinks the block when a worker exits.
+                # Workers share the parent's tracker, so unregistering after
+                # the fact would also drop the owner's entry; skip the
+                # registration instead so only the creating process unlinks.
+                register = resource_tracker.register
+                resource_tracker.register = lambda name,rtype: None
+                try:
+                    shm = shared_memory.SharedMemory(name=descriptor['name'])
+                finally:
+                    resource_tracker.register = register
+            shared = cls(descriptor,shm)
+            _attached[descriptor['name']] = shared
+        return shared
+
+    #%% Cleanup
+    def close(self):
+        '''
+        Drop the segment views and detach; the owner also frees the block.
+        '''
+        name = self.descriptor['name']
+        if self.segments is None:
+            return
+        self.segments   = None
+        self.pairs      = {}
+        _attached.pop(name,None)
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+#%% Worker Helpers
+def shk0001_init_worker(descriptor):
+    '''
+    Process-pool initializer: attach the shared kernel once per worker and
+    expose it as sharedkernel.worker_kernel.
+
+    Use a spawn or forkserver context: forking a process that has already
+    run numba parallel kernels can leave the pool hung at exit.
+
+    Example
+    -------
+    ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'),
+                        initializer=shk0001_init_worker,
+                        initargs=(shared.descriptor,))
+
+    '''
+    global worker_kernel
+    worker_kernel = SharedKernel.attach(descriptor)
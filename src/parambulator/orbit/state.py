@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:12:40 2026
+
+@author: isaacfoster
+"""
+#%% Initialize
+import numpy as np
+import core.defaults as default
+import orbit.twobody as twb
+
+#%% Constants
+mu_default  = default.mu
+
+#%% Orbit State Array
+class OrbitStateArray():
+    '''
+    Struct-of-arrays container for N two-body states about one central body.
+
+    R and V are views into a single C-contiguous (N,6) float64 buffer, so
+    basic slicing returns views that share memory with the parent. Keplerian
+    element columns are computed on first access with
+    twb00114_CartToKeplerArray and cached until the buffer is replaced.
+
+    Parameters
+    ----------
+    epoch : array_like, shape (N,) or scalar
+        Epoch of each state [JD].
+    R : array_like, shape (N,3)
+        Position vectors [km].
+    V : array_like, shape (N,3)
+        Velocity vectors [km/s].
+    mu : float, optional
+        Gravitational parameter [km^3/s^2]. The default is mu_default.
+    '''
+    __slots__ = ('epoch','buffer','R','V','mu','_elements')
+
+    def __init__(self,
+                 epoch,
+                 R,
+                 V,
+                 mu     = mu_default,
+                 ):
+
+        R               = np.asarray(R,dtype=np.float64).reshape(-1,3)
+        V               = np.asarray(V,dtype=np.float64).reshape(-1,3)
+        buffer          = np.empty((R.shape[0],6),dtype=np.float64)
+        buffer[:,:3]    = R
+        buffer[:,3:]    = V
+
+        self._set(epoch,buffer,mu)
+
+    def _set(self,epoch,buffer,mu,elements=None):
+        self.buffer     = buffer
+        self.R          = buffer[:,:3]
+        self.V          = buffer[:,3:]
+        self.epoch      = np.broadcast_to(np.asarray(epoch,dtype=np.float64),(buffer.shape[0],))
+        self.mu         = float(mu)
+        self._elements  = elements
+
+    #%% Constructors
+    @classmethod
+    def from_buffer(cls,epoch,buffer,mu=mu_default):
+        '''
+        Wrap an existing (N,6) float64 state buffer without copying it.
+
+        Parameters
+        ----------
+        epoch : array_like, shape (N,) or scalar
+            Epoch of each state [JD].
+        buffer : numpy.ndarray, shape (N,6)
+            C-contiguous float64 [x,y,z,vx,vy,vz] rows.
+        mu : float, optional
+            Gravitational parameter [km^3/s^2]. The default is mu_default.
+
+        Returns
+        -------
+        states : OrbitStateArray
+            Container whose R and V are views into buffer.
+
+        '''
+        if (not isinstance(buffer,np.ndarray) or buffer.dtype != np.float64
+            or buffer.ndim != 2 or buffer.shape[1] != 6 or not buffer.flags.c_contiguous):
+            raise ValueError('buffer must be a C-contiguous float64 array of shape (N,6)')
+
+        states = cls.__new__(cls)
+        states._set(epoch,buffer,mu)
+        return states
+
+    @classmethod
+    def from_elements(cls,epoch,a,e,i,RAAN,omega,nu,mu=mu_default):
+        '''
+        Build states from arrays of Keplerian elements (angles in degrees).
+
+        Returns
+        -------
+        states : OrbitStateArray
+
+        '''
+        R, V = twb.twb00118_KeplerToCartArray(a,e,i,RAAN,omega,nu,mu)
+        return cls(epoch,R,V,mu)
+
+    @classmethod
+    def concatenate(cls,state_arrays):
+        '''
+        Join several containers about the same central body into one.
+
+        Parameters
+        ----------
+        state_arrays : sequence of OrbitStateArray
+            Containers to join, in order.
+
+        Returns
+        -------
+        states : OrbitStateArray
+            New container holding a fresh buffer.
+
+        '''
+        state_arrays    = list(state_arrays)
+        mu              = state_arrays[0].mu
+
+        if any(s.mu != mu for s in state_arrays):
+            raise ValueError('cannot concatenate states with different mu')
+
+        buffer          = np.concatenate([s.buffer for s in state_arrays],axis=0)
+        epoch           = np.concatenate([s.epoch for s in state_arrays])
+
+        elements        = None
+        if all(s._elements is not None for s in state_arrays):
+            elements    = {key: np.concatenate([s._elements[key] for s in state_arrays],axis=0)
+                           for key in state_arrays[0]._elements}
+
+        states          = cls.__new__(cls)
+        states._set(epoch,buffer,mu,elements)
+        return states
+
+    #%% Container Protocol
+    def __len__(self):
+        return self.buffer.shape[0]
+
+    def __getitem__(self,key):
+        '''
+        Integers and slices return views; index arrays and masks return copies,
+        following NumPy's basic/advanced indexing rules.
+        '''
+        if isinstance(key,(int,np.integer)):
+            n   = len(self)
+            if key < -n or key >= n:
+                raise IndexError(f"index {key} is out of bounds for {n} states")
+            key = key % n
+            key = slice(key,key+1)
+
+        elements    = None
+        if self._elements is not None:
+            elements = {name: column[key] for name,column in self._elements.items()}
+
+        states      = self.__class__.__new__(self.__class__)
+        states._set(self.epoch[key],self.buffer[key],self.mu,elements)
+        return states
+
+    def __repr__(self):
+        return f"OrbitStateArray(n={len(self)}, mu={self.mu})"
+
+    #%% Elements
+    @property
+    def elements(self):
+        '''
+        Cached dict of (N,) element columns, as returned by
+        twb00114_CartToKeplerArray.
+        '''
+        if self._elements is None:
+            self._elements = twb.twb00114_CartToKeplerArray(self.R,self.V,self.mu)
+        return self._elements
+
+    def invalidate(self):
+        '''
+        Drop cached elements after R or V have been modified in place.
+        '''
+        self._elements = None
+
+    #%% Propagation
+    def propagate(self,t,**kwargs):
+        '''
+        Propagate every state over the time grid t [s] with
+        twb00303_PropagateUniversal and return the (N,T,6) array.
+        '''
+        return twb.twb00303_PropagateUniversal(self,t=t,**kwargs)
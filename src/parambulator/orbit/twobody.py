@@ -7,8 +7,8 @@ Created on Tue Jul  9 12:52:53 2024
 """
 #%% Initialize
 import numpy as np
-import pandas as pd
 import core.defaults as default
+import core.linalg as la
 
 #%% Constants
 deg2rad     = np.pi/180  # [rad/deg]
@@ -18,7 +18,7 @@ mu_default  = default.mu
 #%% General
 def LagrangeFG(R0,V0,delta_nu,mu=mu_default):
     
-    delta_nu = delta_nu*(3.1415926/180)
+    delta_nu = delta_nu*deg2rad
     
     #### Calculate F&G parameters
     r0      = np.linalg.norm(R0)
@@ -34,9 +34,7 @@ def LagrangeFG(R0,V0,delta_nu,mu=mu_default):
     f_dot   = f_dot_1*f_dot_2
     g_dot   = 1 - ((mu*r0)/h**2)*(1 - np.cos(delta_nu))
     
-    FG      = pd.Series([f,g,f_dot,g_dot])
-    index   = ['f','g','f_dot','g_dot']
-    FG.index = index
+    FG      = {'f':f,'g':g,'f_dot':f_dot,'g_dot':g_dot}
     
     return FG
 
@@ -46,6 +44,69 @@ def LagrangeFG_NextState(R0,V0,FG):
     
     return R1, V1
 
+def twb0002_LagrangeFGArray(R0,V0,delta_nu,mu=mu_default,use_numba:bool=False):
+    '''
+    Step (N,3) states by true-anomaly changes delta_nu with the Lagrange
+    coefficients of LagrangeFG; returns the (N,6) stepped states.
+
+    Parameters
+    ----------
+    R0 : array_like, shape (N,3)
+        Initial positions [km].
+    V0 : array_like, shape (N,3)
+        Initial velocities [km/s].
+    delta_nu : array_like, shape (N,) or scalar
+        True-anomaly change [deg].
+    mu : float, optional
+        Gravitational parameter [km^3/s^2]. The default is mu_default.
+    use_numba : bool, optional
+        Use the jitted core.linalg kernel when numba is installed. The
+        default is False.
+
+    Returns
+    -------
+    states : numpy.ndarray, shape (N,6)
+        [x,y,z,vx,vy,vz] after the step.
+
+    '''
+    R0          = np.atleast_2d(np.asarray(R0,dtype=np.float64))
+    V0          = np.atleast_2d(np.asarray(V0,dtype=np.float64))
+    delta_nu    = np.broadcast_to(np.asarray(delta_nu,dtype=np.float64)*deg2rad,R0.shape[:1])
+    
+    if use_numba is True and la.NUMBA_AVAILABLE:
+        return la.lagrange_fg_propagate(np.ascontiguousarray(R0),np.ascontiguousarray(V0),
+                                        np.ascontiguousarray(delta_nu),float(mu))
+    
+    c           = np.cos(delta_nu)
+    s           = np.sin(delta_nu)
+    r0          = np.sqrt(np.einsum('ij,ij->i',R0,R0))
+    H           = np.cross(R0,V0)
+    h           = np.sqrt(np.einsum('ij,ij->i',H,H))
+    v0r         = np.einsum('ij,ij->i',R0,V0)/r0
+    r           = (h**2/mu)/(1 + (h**2/(mu*r0) - 1)*c - (h*v0r*s)/mu)
+    
+    f           = 1 - (mu*r*(1 - c))/(h**2)
+    g           = r*r0*s/h
+    f_dot       = (mu/h)*((1 - c)/s)*((mu/h**2)*(1 - c) - 1/r0 - 1/r)
+    g_dot       = 1 - ((mu*r0)/h**2)*(1 - c)
+    
+    states      = np.concatenate((f[:,None]*R0 + g[:,None]*V0,
+                                  f_dot[:,None]*R0 + g_dot[:,None]*V0),axis=1)
+    
+    return states
+
+def twb0001_UnpackStates(R,V=None,mu=mu_default):
+    '''
+    Return (R,V,mu), taking them from R when it is an orbit.state.OrbitStateArray.
+    '''
+    from orbit.state import OrbitStateArray
+    
+    if isinstance(R,OrbitStateArray):
+        return R.R, R.V, R.mu
+    if V is None:
+        raise TypeError('V is required unless R is an OrbitStateArray')
+    return R, V, mu
+
 def twb0000_Vescape(r_mag,mu=mu_default):
     '''
     
@@ -361,10 +422,10 @@ def twb00111_CartToKepler(R,V,mu=mu_default):
     H               = np.cross(R,V)
     h               = np.linalg.norm(H)
     e_vec           = twb00101_eccVec1(R,V,mu)
-    scriptE         = twb00110_SpecificEnergy2(r,v)
+    scriptE         = twb00110_SpecificEnergy2(r,v,mu)
     a               = twb00108_SemiMajorAxis1(scriptE,mu)
     i               = np.arccos(H[2]/h)
-    e               = twb00103_ecc2(h,r,mu)   
+    e               = twb00104_ecc3(e_vec)
     p               = twb00106_SemiLatusRectum2(h,mu)
     P               = twb00109_Period(a,mu)
     r_p             = a*(1- e)
@@ -376,30 +437,159 @@ def twb00111_CartToKepler(R,V,mu=mu_default):
     #### Right Ascension of the Ascending Node
     RAAN            = np.arccos(N[0]/n)
     
-    if N[1] > 0:
-        RAAN        = np.pi - RAAN
+    if N[1] < 0:
+        RAAN        = 2*np.pi - RAAN
         
     #### Argument of Periapsis
     omega           = np.arccos(np.dot(N,e_vec)/(n*e))
     
-    #### True Anomaly
-    if e_vec[2] > 0:
+    if e_vec[2] < 0:
         omega       = 2*np.pi - omega
     
+    #### True Anomaly
     e_vec_dot_R     = np.dot(e_vec,R)
     nu              = np.arccos(e_vec_dot_R/(e*r))
     
-    #### Argument of Latitude at Epoch
-    if e_vec_dot_R > 0:
+    if np.dot(R,V) < 0:
         nu          = 2*np.pi - nu
     
+    #### Argument of Latitude at Epoch
     arg_lat_epoch   = np.arccos(np.dot(N,R)/(n*r))
     
-    #### True Longitude at Epoch
-    if R[2] > 0:
+    if R[2] < 0:
         arg_lat_epoch = 2*np.pi - arg_lat_epoch
         
-    true_long_epoch   = RAAN+omega+nu
+    #### True Longitude at Epoch
+    true_long_epoch   = np.mod(RAAN+omega+nu,2*np.pi)
+    
+    #### Compile Keplerian Elements
+    kep_elements  = {
+                'a':                a,
+                'e':                e,
+                'i':                i*rad2deg,
+                'RAAN':             RAAN*rad2deg,
+                'omega':            omega*rad2deg,
+                'nu':               nu*rad2deg,
+                'P':                P,
+                'e_vec':            e_vec,
+                'specific_energy':  scriptE,
+                'p':                p,
+                'h':                h,
+                'r_p':              r_p,
+                'r_a':              r_a,
+                'arg_lat_epoch':    arg_lat_epoch*rad2deg,
+                'true_long_epoch':  true_long_epoch*rad2deg,
+                
+        }
+
+    return kep_elements
+
+def twb00114_CartToKeplerArray(R,V=None,mu=mu_default,tol=1e-10,use_numba:bool=False):
+    '''
+    Batch version of twb00111_CartToKepler for (N,3) state arrays.
+    
+    Circular orbits (e < tol) take omega = 0 and report nu as the argument
+    of latitude. Equatorial orbits (|N| < tol*h) take RAAN = 0 and report
+    omega as the longitude of periapsis (or nu as the true longitude when
+    also circular).
+
+    Parameters
+    ----------
+    R : array_like, shape (N,3) or (3,), or OrbitStateArray
+        Position vectors [km], or a state container (V and mu are then
+        taken from it).
+    V : array_like, shape (N,3) or (3,)
+        Velocity vectors [km/s].
+    mu : float or array_like, optional
+        Gravitational parameter [km^3/s^2]. The default is mu_default.
+    tol : float, optional
+        Threshold below which an orbit is treated as circular/equatorial.
+        The default is 1e-10.
+    use_numba : bool, optional
+        Use the jitted core.linalg kernel when numba is installed and mu is
+        a scalar. The default is False.
+
+    Returns
+    -------
+    kep_elements : dict of numpy.ndarray
+        Same keys as twb00111_CartToKepler, each holding an (N,) column
+        ('e_vec' is (N,3)). Angles in degrees.
+
+    '''
+    R, V, mu        = twb0001_UnpackStates(R,V,mu)
+    R               = np.atleast_2d(np.asarray(R,dtype=np.float64))
+    V               = np.atleast_2d(np.asarray(V,dtype=np.float64))
+    mu              = np.asarray(mu,dtype=np.float64)
+    
+    if use_numba is True and la.NUMBA_AVAILABLE and mu.ndim == 0:
+        cols, e_vec = la.cart_to_kepler(np.ascontiguousarray(R),np.ascontiguousarray(V),float(mu),tol)
+        kep_elements = dict(zip(['a','e','i','RAAN','omega','nu','P','specific_energy',
+                                 'p','h','r_p','r_a','arg_lat_epoch','true_long_epoch'],cols.T))
+        for key in ['i','RAAN','omega','nu','arg_lat_epoch','true_long_epoch']:
+            kep_elements[key] = kep_elements[key]*rad2deg
+        kep_elements['e_vec'] = e_vec
+        return kep_elements
+    
+    r               = np.sqrt(np.einsum('ij,ij->i',R,R))
+    v2              = np.einsum('ij,ij->i',V,V)
+    rv              = np.einsum('ij,ij->i',R,V)
+    H               = np.cross(R,V)
+    h               = np.sqrt(np.einsum('ij,ij->i',H,H))
+    e_vec           = ((v2 - mu/r)[:,None]*R - rv[:,None]*V)/np.atleast_1d(mu)[:,None]
+    e               = np.sqrt(np.einsum('ij,ij->i',e_vec,e_vec))
+    scriptE         = v2/2 - mu/r
+    p               = h**2/mu
+    
+    with np.errstate(divide='ignore',invalid='ignore'):
+        a           = -mu/(2*scriptE)
+        P           = np.where(a > 0, 2*np.pi*np.sqrt(np.abs(a)**3/mu), np.nan)
+        r_a         = np.where(e < 1, a*(1+e), np.inf)
+    r_p             = p/(1+e)
+    
+    i               = np.arccos(np.clip(H[:,2]/h,-1,1))
+    N               = np.stack((-H[:,1],H[:,0],np.zeros_like(h)),axis=1)
+    n               = np.hypot(N[:,0],N[:,1])
+    
+    #### Degenerate Orbit Masks
+    circular        = e < tol
+    equatorial      = n < tol*h
+    retrograde      = H[:,2] < 0
+    n_safe          = np.where(equatorial,1.0,n)
+    e_safe          = np.where(circular,1.0,e)
+    
+    #### Right Ascension of the Ascending Node
+    RAAN            = np.arccos(np.clip(N[:,0]/n_safe,-1,1))
+    RAAN            = np.where(N[:,1] < 0, 2*np.pi - RAAN, RAAN)
+    RAAN            = np.where(equatorial, 0.0, RAAN)
+    
+    #### Argument of Periapsis
+    omega           = np.arccos(np.clip(np.einsum('ij,ij->i',N,e_vec)/(n_safe*e_safe),-1,1))
+    omega           = np.where(e_vec[:,2] < 0, 2*np.pi - omega, omega)
+    
+    lon_per         = np.arccos(np.clip(e_vec[:,0]/e_safe,-1,1))
+    lon_per         = np.where(e_vec[:,1] < 0, 2*np.pi - lon_per, lon_per)
+    lon_per         = np.where(retrograde, 2*np.pi - lon_per, lon_per)
+    
+    omega           = np.where(equatorial, lon_per, omega)
+    omega           = np.where(circular, 0.0, omega)
+    
+    #### Argument of Latitude at Epoch
+    arg_lat_epoch   = np.arccos(np.clip(np.einsum('ij,ij->i',N,R)/(n_safe*r),-1,1))
+    arg_lat_epoch   = np.where(R[:,2] < 0, 2*np.pi - arg_lat_epoch, arg_lat_epoch)
+    
+    true_lon        = np.arccos(np.clip(R[:,0]/r,-1,1))
+    true_lon        = np.where(R[:,1] < 0, 2*np.pi - true_lon, true_lon)
+    true_lon        = np.where(retrograde, 2*np.pi - true_lon, true_lon)
+    
+    arg_lat_epoch   = np.where(equatorial, true_lon, arg_lat_epoch)
+    
+    #### True Anomaly
+    nu              = np.arccos(np.clip(np.einsum('ij,ij->i',e_vec,R)/(e_safe*r),-1,1))
+    nu              = np.where(rv < 0, 2*np.pi - nu, nu)
+    nu              = np.where(circular, arg_lat_epoch, nu)
+    
+    #### True Longitude at Epoch
+    true_long_epoch = np.mod(RAAN+omega+nu,2*np.pi)
     
     #### Compile Keplerian Elements
     kep_elements  = {
@@ -469,6 +659,229 @@ def twb00113_true_anomaly(E:float=None,
    
     return nu_deg
 
+def twb00115_eccentric_anomaly_array(M,
+                                     e,
+                                     tol:float=1e-12,
+                                     max_iter:int=12,
+                                     use_numba:bool=False,
+                                     **args):
+    '''
+    Solve Kepler's equation for arrays of mean anomaly and eccentricity.
+    
+    Elliptic elements (e <= 1) solve M = E - e*sin(E), hyperbolic elements
+    (e > 1) solve M = e*sinh(F) - F. Both start from Danby's seed (a cubic
+    seed near e = 1, M = 0) and take Halley steps, updating only the
+    elements that have not yet converged. Four steps reach machine
+    precision for e < 1 - 1e-8; max_iter bounds the number of array passes.
+
+    Parameters
+    ----------
+    M : array_like
+        Mean anomaly [deg].
+    e : array_like
+        Eccentricity, broadcast against M.
+    tol : float, optional
+        Convergence tolerance on the Halley step [rad]. The default is 1e-12.
+    max_iter : int, optional
+        Maximum number of Halley iterations. The default is 12.
+    use_numba : bool, optional
+        Use the jitted core.linalg kernel when numba is installed. The
+        default is False.
+
+    Returns
+    -------
+    E_deg : numpy.ndarray
+        Eccentric (or hyperbolic) anomaly [deg], shaped like M and e
+        broadcast together.
+
+    '''
+    M_rad, e    = np.broadcast_arrays(np.asarray(M,dtype=np.float64)*deg2rad,
+                                      np.asarray(e,dtype=np.float64))
+    shape       = M_rad.shape
+    M_rad       = M_rad.ravel()
+    e           = e.ravel()
+    
+    if use_numba is True and la.NUMBA_AVAILABLE:
+        E       = la.kepler_solve(np.ascontiguousarray(M_rad),np.ascontiguousarray(e),tol,max_iter)
+        return E.reshape(shape)*rad2deg
+    
+    E           = np.empty_like(M_rad)
+    
+    #### Elliptic: reduce to [-pi,pi] and add the revolutions back at the end
+    ell         = e <= 1
+    M_wrap      = np.remainder(M_rad + np.pi, 2*np.pi) - np.pi
+    M_revs      = M_rad - M_wrap
+    M_red       = np.where(ell, M_wrap, M_rad)
+    
+    #### Starting Values
+    E[ell]      = M_red[ell] + 0.85*e[ell]*np.sign(np.sin(M_red[ell]))
+    
+    # Near-parabolic, small-M corner: root of (1-e)E + eE^3/6 = M (Cardano)
+    near        = ell & (e > 0.5)
+    p_c         = 6*(1 - e[near])/e[near]
+    q_c         = -6*M_red[near]/e[near]
+    d_c         = np.sqrt(q_c**2/4 + p_c**3/27)
+    E_c         = np.cbrt(-q_c/2 + d_c) + np.cbrt(-q_c/2 - d_c)
+    E[near]     = np.where(np.abs(E_c) < 1.0, E_c, E[near])
+    
+    hyp         = ~ell
+    E[hyp]      = np.sign(M_red[hyp])*np.log(2*np.abs(M_red[hyp])/e[hyp] + 1.8)
+    
+    #### Halley Iterations
+    idx         = np.arange(E.size)
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        E_i     = E[idx]
+        e_i     = e[idx]
+        ell_i   = ell[idx]
+        s       = np.where(ell_i, np.sin(E_i), np.sinh(E_i))
+        c       = np.where(ell_i, np.cos(E_i), np.cosh(E_i))
+        f       = np.where(ell_i, E_i - e_i*s, e_i*s - E_i) - M_red[idx]
+        df      = np.where(ell_i, 1 - e_i*c, e_i*c - 1)
+        step    = f/(df - 0.5*f*e_i*s/df)
+        E[idx]  = E_i - step
+        idx     = idx[np.abs(step) > tol]
+    
+    E           = np.where(ell, E + M_revs, E)
+    E_deg       = E.reshape(shape)*rad2deg
+    
+    return E_deg
+
+def twb00116_true_anomaly_array(E,
+                                e,
+                                **args):
+    '''
+    True anomaly from arrays of eccentric (or hyperbolic) anomaly.
+    
+    Uses the half-angle form so the result keeps the quadrant of E, unlike
+    the arccos in twb00113_true_anomaly.
+
+    Parameters
+    ----------
+    E : array_like
+        Eccentric anomaly [deg] for e <= 1, hyperbolic anomaly [deg] for
+        e > 1.
+    e : array_like
+        Eccentricity, broadcast against E.
+
+    Returns
+    -------
+    nu_deg : numpy.ndarray
+        True anomaly [deg].
+
+    '''
+    E_rad, e    = np.broadcast_arrays(np.asarray(E,dtype=np.float64)*deg2rad,
+                                      np.asarray(e,dtype=np.float64))
+    
+    E_wrap      = np.remainder(E_rad + np.pi, 2*np.pi) - np.pi
+    
+    with np.errstate(invalid='ignore',divide='ignore'):
+        nu_ell  = 2*np.arctan2(np.sqrt(1+e)*np.sin(E_wrap/2),
+                               np.sqrt(1-e)*np.cos(E_wrap/2))
+        nu_ell  = nu_ell + (E_rad - E_wrap)
+        nu_hyp  = 2*np.arctan(np.sqrt((e+1)/(e-1))*np.tanh(E_rad/2))
+    
+    nu_rad      = np.where(e <= 1, nu_ell, nu_hyp)
+    nu_deg      = nu_rad*rad2deg
+    
+    return nu_deg
+
+def twb00117_mean_to_true_anomaly(M,
+                                  e,
+                                  tol:float=1e-12,
+                                  max_iter:int=12,
+                                  **args):
+    '''
+    True anomaly from arrays of mean anomaly and eccentricity in one call.
+
+    Parameters
+    ----------
+    M : array_like
+        Mean anomaly [deg].
+    e : array_like
+        Eccentricity, broadcast against M.
+    tol : float, optional
+        Convergence tolerance passed to twb00115. The default is 1e-12.
+    max_iter : int, optional
+        Iteration cap passed to twb00115. The default is 12.
+
+    Returns
+    -------
+    nu_deg : numpy.ndarray
+        True anomaly [deg].
+
+    '''
+    E_deg   = twb00115_eccentric_anomaly_array(M,e,tol=tol,max_iter=max_iter)
+    nu_deg  = twb00116_true_anomaly_array(E_deg,e)
+    
+    return nu_deg
+
+def twb00118_KeplerToCartArray(a,
+                               e,
+                               i,
+                               RAAN,
+                               omega,
+                               nu,
+                               mu=mu_default,
+                               p=None):
+    '''
+    Batch conversion from Keplerian elements to Cartesian state vectors.
+    
+    Builds every perifocal-to-inertial rotation with twb00205 as one
+    (N,3,3) stack and applies it with a single batched matmul.
+
+    Parameters
+    ----------
+    a : array_like
+        Semi-major axis [km], negative for hyperbolic orbits.
+    e : array_like
+        Eccentricity.
+    i : array_like
+        Inclination [deg].
+    RAAN : array_like
+        Right ascension of the ascending node [deg].
+    omega : array_like
+        Argument of periapsis [deg].
+    nu : array_like
+        True anomaly [deg].
+    mu : float, optional
+        Gravitational parameter [km^3/s^2]. The default is mu_default.
+    p : array_like, optional
+        Semi-latus rectum [km]. Overrides a*(1-e**2); required for
+        parabolic orbits. The default is None.
+
+    Returns
+    -------
+    R : numpy.ndarray, shape (N,3)
+        Position vectors [km].
+    V : numpy.ndarray, shape (N,3)
+        Velocity vectors [km/s].
+
+    '''
+    a, e, i, RAAN, omega, nu = np.broadcast_arrays(*[np.atleast_1d(np.asarray(x,dtype=np.float64)) 
+                                                     for x in (a,e,i,RAAN,omega,nu)])
+    if p is None:
+        p       = twb00107_SemiLatusRectum3(a,e)
+    p           = np.broadcast_to(np.asarray(p,dtype=np.float64),a.shape)
+    
+    #### Perifocal State
+    nu_rad      = nu*deg2rad
+    cos_nu      = np.cos(nu_rad)
+    sin_nu      = np.sin(nu_rad)
+    r           = p/(1 + e*cos_nu)
+    v_scale     = np.sqrt(mu/p)
+    zero        = np.zeros_like(r)
+    R_pf        = np.stack((r*cos_nu, r*sin_nu, zero),axis=-1)
+    V_pf        = np.stack((-v_scale*sin_nu, v_scale*(e + cos_nu), zero),axis=-1)
+    
+    #### Rotate to Inertial
+    Q           = twb00205_PerifocalRotation(RAAN,i,omega)
+    R           = (Q @ R_pf[...,None])[...,0]
+    V           = (Q @ V_pf[...,None])[...,0]
+    
+    return R, V
+
 #%% Two Body Orbit Vectors
 def twb00201_NodeVector1(R,V):
     '''
@@ -515,3 +928,208 @@ def twb00204_OrbitNormalVector2(RAAN,inc):
     return O_hat
 
 
+
+
+def twb00205_PerifocalRotation(RAAN,inc,omega):
+    '''
+    Stacked perifocal-to-inertial rotation matrices, R3(-RAAN) R1(-inc) R3(-omega).
+    
+    The third column is the orbit normal returned by twb00204.
+
+    Parameters
+    ----------
+    RAAN : array_like
+        Right ascension of the ascending node [deg].
+    inc : array_like
+        Inclination [deg].
+    omega : array_like
+        Argument of periapsis [deg].
+
+    Returns
+    -------
+    Q : numpy.ndarray, shape (...,3,3)
+        Rotation matrices, broadcast over the inputs.
+
+    '''
+    RAAN, inc, omega = np.broadcast_arrays(np.deg2rad(RAAN),np.deg2rad(inc),np.deg2rad(omega))
+    
+    cO, sO      = np.cos(RAAN), np.sin(RAAN)
+    ci, si      = np.cos(inc), np.sin(inc)
+    cw, sw      = np.cos(omega), np.sin(omega)
+    
+    Q           = np.empty(RAAN.shape + (3,3))
+    Q[...,0,0]  = cO*cw - sO*sw*ci
+    Q[...,0,1]  = -cO*sw - sO*cw*ci
+    Q[...,0,2]  = sO*si
+    Q[...,1,0]  = sO*cw + cO*sw*ci
+    Q[...,1,1]  = -sO*sw + cO*cw*ci
+    Q[...,1,2]  = -cO*si
+    Q[...,2,0]  = sw*si
+    Q[...,2,1]  = cw*si
+    Q[...,2,2]  = ci
+    
+    return Q
+
+#%% Universal Variable Propagation
+def twb00301_StumpffC(z):
+    '''
+    Stumpff function C(z) for arrays of z, using a series near z = 0.
+
+    Parameters
+    ----------
+    z : array_like
+        alpha*chi**2, positive for elliptic and negative for hyperbolic arcs.
+
+    Returns
+    -------
+    C : numpy.ndarray
+        C(z).
+
+    '''
+    z       = np.asarray(z,dtype=np.float64)
+    small   = np.abs(z) < 0.1
+    sz      = np.sqrt(np.abs(z))
+    
+    with np.errstate(divide='ignore',invalid='ignore',over='ignore'):
+        C   = np.where(z > 0, (1 - np.cos(sz))/z, (np.cosh(sz) - 1)/(-z))
+    
+    C_ser   = 1/2 - z/24 + z**2/720 - z**3/40320 + z**4/3628800
+    C       = np.where(small, C_ser, C)
+    
+    return C
+
+def twb00302_StumpffS(z):
+    '''
+    Stumpff function S(z) for arrays of z, using a series near z = 0.
+
+    Parameters
+    ----------
+    z : array_like
+        alpha*chi**2, positive for elliptic and negative for hyperbolic arcs.
+
+    Returns
+    -------
+    S : numpy.ndarray
+        S(z).
+
+    '''
+    z       = np.asarray(z,dtype=np.float64)
+    small   = np.abs(z) < 0.1
+    sz      = np.sqrt(np.abs(z))
+    
+    with np.errstate(divide='ignore',invalid='ignore',over='ignore'):
+        S   = np.where(z > 0, (sz - np.sin(sz))/sz**3, (np.sinh(sz) - sz)/sz**3)
+    
+    S_ser   = 1/6 - z/120 + z**2/5040 - z**3/362880 + z**4/39916800
+    S       = np.where(small, S_ser, S)
+    
+    return S
+
+def twb00303_PropagateUniversal(R0,
+                                V0=None,
+                                t=None,
+                                mu=mu_default,
+                                tol:float=1e-10,
+                                max_iter:int=50,
+                                use_numba:bool=False):
+    '''
+    Propagate M two-body states over a T-length time grid in one pass.
+    
+    Solves the universal Kepler equation for chi with Laguerre-Conway
+    iterations (valid for elliptic, parabolic and hyperbolic arcs) and maps
+    each state with the Lagrange f, g, f_dot, g_dot coefficients.
+
+    Parameters
+    ----------
+    R0 : array_like, shape (M,3) or (3,), or OrbitStateArray
+        Initial positions [km], or a state container (pass t by keyword;
+        V0 and mu are then taken from it).
+    V0 : array_like, shape (M,3) or (3,)
+        Initial velocities [km/s].
+    t : array_like, shape (T,)
+        Times since the initial state [s]; may be negative.
+    mu : float, optional
+        Gravitational parameter [km^3/s^2]. The default is mu_default.
+    tol : float, optional
+        Convergence tolerance on chi, relative to sqrt(r0). The default is
+        1e-10.
+    max_iter : int, optional
+        Maximum number of Laguerre iterations. The default is 50.
+    use_numba : bool, optional
+        Use the jitted core.linalg kernel when numba is installed. The
+        default is False.
+
+    Returns
+    -------
+    states : numpy.ndarray, shape (M,T,6)
+        Propagated [x,y,z,vx,vy,vz] in km and km/s.
+
+    '''
+    R0, V0, mu  = twb0001_UnpackStates(R0,V0,mu)
+    if t is None:
+        raise TypeError('twb00303_PropagateUniversal requires the time grid t')
+    R0          = np.atleast_2d(np.asarray(R0,dtype=np.float64))
+    V0          = np.atleast_2d(np.asarray(V0,dtype=np.float64))
+    t           = np.atleast_1d(np.asarray(t,dtype=np.float64))
+    
+    if use_numba is True and la.NUMBA_AVAILABLE:
+        return la.universal_propagate(np.ascontiguousarray(R0),
+                                      np.ascontiguousarray(V0),
+                                      np.ascontiguousarray(t),
+                                      float(mu),tol,max_iter)
+    
+    sqrt_mu     = np.sqrt(mu)
+    r0          = np.sqrt(np.einsum('ij,ij->i',R0,R0))[:,None]
+    v0          = np.sqrt(np.einsum('ij,ij->i',V0,V0))[:,None]
+    sigma0      = np.einsum('ij,ij->i',R0,V0)[:,None]/sqrt_mu
+    alpha       = 2/r0 - v0**2/mu
+    dt          = t[None,:]
+    
+    #### Initial Guess
+    chi         = np.broadcast_to(sqrt_mu*np.abs(alpha)*dt,(R0.shape[0],t.size)).copy()
+    hyp         = (alpha < -1e-12)[:,0]
+    if hyp.any():
+        a_h     = 1/alpha[hyp]
+        sgn     = np.sign(dt)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            arg = (-2*mu*alpha[hyp]*dt)/(sigma0[hyp]*sqrt_mu + sgn*np.sqrt(-mu*a_h)*(1 - r0[hyp]*alpha[hyp]))
+            chi[hyp] = np.where(arg > 0, sgn*np.sqrt(-a_h)*np.log(np.abs(arg)), chi[hyp])
+    par         = (np.abs(alpha) <= 1e-12)[:,0]
+    chi[par]    = (sqrt_mu*dt/r0[par])
+    
+    #### Laguerre-Conway Iterations
+    n_lag       = 5
+    active      = np.ones(chi.shape,dtype=bool)
+    for _ in range(max_iter):
+        m, k    = np.nonzero(active)
+        if m.size == 0:
+            break
+        x       = chi[m,k]
+        al      = alpha[m,0]
+        z       = al*x**2
+        C       = twb00301_StumpffC(z)
+        S       = twb00302_StumpffS(z)
+        F       = sigma0[m,0]*x**2*C + (1 - al*r0[m,0])*x**3*S + r0[m,0]*x - sqrt_mu*dt[0,k]
+        dF      = sigma0[m,0]*x*(1 - z*S) + (1 - al*r0[m,0])*x**2*C + r0[m,0]
+        d2F     = sigma0[m,0]*(1 - z*C) + (1 - al*r0[m,0])*x*(1 - z*S)
+        root    = np.sqrt(np.abs((n_lag - 1)**2*dF**2 - n_lag*(n_lag - 1)*F*d2F))
+        step    = n_lag*F/(dF + np.sign(dF)*root)
+        chi[m,k] = x - step
+        done    = np.abs(step) <= tol*np.sqrt(r0[m,0])
+        active[m[done],k[done]] = False
+    
+    #### Lagrange Coefficients
+    z           = alpha*chi**2
+    C           = twb00301_StumpffC(z)
+    S           = twb00302_StumpffS(z)
+    f           = 1 - chi**2/r0*C
+    g           = dt - chi**3*S/sqrt_mu
+    R           = f[:,:,None]*R0[:,None,:] + g[:,:,None]*V0[:,None,:]
+    r           = np.sqrt(np.einsum('mtj,mtj->mt',R,R))
+    f_dot       = sqrt_mu/(r*r0)*(alpha*chi**3*S - chi)
+    g_dot       = 1 - chi**2/r*C
+    V           = f_dot[:,:,None]*R0[:,None,:] + g_dot[:,:,None]*V0[:,None,:]
+    
+    states      = np.concatenate((R,V),axis=2)
+    
+    return states
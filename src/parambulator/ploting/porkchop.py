@@ -1,2 +1,255 @@
-
 __version__ = "0.0.dev0"
+#%% Initialize
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+#### Parambulator Libraries
+import library.bodies as body
+import orbit.ephem as eph
+import orbit.lambert as lam
+
+#%% Constants
+mu_sun      = body.planets['sun']['mu']
+S_PER_DAY   = 86400.0
+
+#%% Ephemeris
+def pcp0001_GetPlanetStates(kernel,body_name,julian_dates):
+    '''
+    Heliocentric states of a body for a whole date array.
+    
+    Each SPK segment on the Sun-to-body chain is evaluated once for every
+    date (see orbit.ephem.get_state).
+
+    Parameters
+    ----------
+    kernel : jplephem.spk.SPK
+        Loaded SPK kernel (see orbit.ephem.eph00001_load_kernel).
+    body_name : str or int
+        Body name from orbit.ephem.body_ids, e.g. 'Earth' or 'MarsBC'.
+    julian_dates : array_like, shape (N,)
+        TDB Julian dates.
+
+    Returns
+    -------
+    states : numpy.ndarray, shape (N,6)
+        Heliocentric ICRF [x,y,z,vx,vy,vz] in km and km/s.
+
+    '''
+    return eph.get_state(body_name,julian_dates,kernel,center='Sun')
+
+#%% Porkchop Engine
+def pcp0101_EvaluateChunk(args):
+    '''
+    Lambert solves for one chunk of departure/arrival pairs. Top-level so it
+    can be shipped to a process pool.
+    '''
+    dep_states, arr_states, tof, mu, M_max, prograde = args
+    
+    v1, v2      = lam.lam00002_LambertIzzoAllRevs(dep_states[:,:3],arr_states[:,:3],tof,mu,
+                                                  M_max=M_max,prograde=prograde)
+    v_inf_dep   = np.linalg.norm(v1 - dep_states[None,:,3:],axis=2)
+    v_inf_arr   = np.linalg.norm(v2 - arr_states[None,:,3:],axis=2)
+    
+    #### Keep the cheapest feasible branch per pair
+    total       = np.where(np.isnan(v_inf_dep + v_inf_arr),np.inf,v_inf_dep + v_inf_arr)
+    best        = np.argmin(total,axis=0)
+    cols        = np.arange(tof.size)
+    v_inf_dep   = v_inf_dep[best,cols]
+    v_inf_arr   = v_inf_arr[best,cols]
+    
+    return v_inf_dep, v_inf_arr
+
+def pcp0002_PorkchopGrid(dep_jd,
+                         arr_jd,
+                         dep_states,
+                         arr_states,
+                         mu=mu_sun,
+                         M_max:int=0,
+                         prograde:bool=True,
+                         chunk_size:int=100000,
+                         workers:int=1,
+                         start_method:str='spawn'):
+    '''
+    Evaluate a departure x arrival porkchop grid of Lambert transfers.
+    
+    Pairs with a positive time of flight are flattened and solved in chunks
+    of chunk_size, either in-process (workers=1) or across a process pool.
+
+    Parameters
+    ----------
+    dep_jd : array_like, shape (D,)
+        Departure TDB Julian dates.
+    arr_jd : array_like, shape (A,)
+        Arrival TDB Julian dates.
+    dep_states : array_like, shape (D,6)
+        Departure body states at dep_jd [km, km/s].
+    arr_states : array_like, shape (A,6)
+        Arrival body states at arr_jd [km, km/s].
+    mu : float, optional
+        Central-body gravitational parameter [km^3/s^2]. The default is mu_sun.
+    M_max : int, optional
+        Highest revolution count tried for each pair. The default is 0.
+    prograde : bool, optional
+        Prograde transfers only. The default is True.
+    chunk_size : int, optional
+        Number of Lambert solves per chunk. The default is 100000.
+    workers : int, optional
+        Number of worker processes. The default is 1.
+    start_method : str, optional
+        multiprocessing start method for the pool. The default is 'spawn';
+        forking a process that has run numba parallel kernels can hang.
+
+    Returns
+    -------
+    grid : dict of numpy.ndarray
+        'dep_jd' (D,), 'arr_jd' (A,), and (D,A) arrays 'tof' [days],
+        'c3' [km^2/s^2], 'v_inf_dep' and 'v_inf_arr' [km/s]. Infeasible
+        pairs are NaN.
+
+    '''
+    dep_jd      = np.atleast_1d(np.asarray(dep_jd,dtype=np.float64))
+    arr_jd      = np.atleast_1d(np.asarray(arr_jd,dtype=np.float64))
+    dep_states  = np.asarray(dep_states,dtype=np.float64)
+    arr_states  = np.asarray(arr_states,dtype=np.float64)
+    
+    tof_days    = arr_jd[None,:] - dep_jd[:,None]
+    i_dep, i_arr = np.nonzero(tof_days > 0)
+    tof         = tof_days[i_dep,i_arr]*S_PER_DAY
+    
+    chunks      = [slice(k,k+chunk_size) for k in range(0,tof.size,chunk_size)]
+    jobs        = [(dep_states[i_dep[c]],arr_states[i_arr[c]],tof[c],mu,M_max,prograde) for c in chunks]
+    
+    if workers > 1 and len(jobs) > 1:
+        context = multiprocessing.get_context(start_method)
+        with ProcessPoolExecutor(max_workers=workers,mp_context=context) as pool:
+            results = list(pool.map(pcp0101_EvaluateChunk,jobs))
+    else:
+        results = [pcp0101_EvaluateChunk(job) for job in jobs]
+    
+    v_inf_dep   = np.full(tof_days.shape,np.nan)
+    v_inf_arr   = np.full(tof_days.shape,np.nan)
+    for c,(dep,arr) in zip(chunks,results):
+        v_inf_dep[i_dep[c],i_arr[c]] = dep
+        v_inf_arr[i_dep[c],i_arr[c]] = arr
+    
+    grid = {
+            'dep_jd':       dep_jd,
+            'arr_jd':       arr_jd,
+            'tof':          np.where(tof_days > 0,tof_days,np.nan),
+            'c3':           v_inf_dep**2,
+            'v_inf_dep':    v_inf_dep,
+            'v_inf_arr':    v_inf_arr,
+        }
+    
+    return grid
+
+def pcp0003_Porkchop(kernel,dep_body,arr_body,dep_jd,arr_jd,**kwargs):
+    '''
+    Porkchop grid between two bodies of an SPK kernel; keyword arguments are
+    passed to pcp0002_PorkchopGrid.
+    '''
+    dep_states  = pcp0001_GetPlanetStates(kernel,dep_body,dep_jd)
+    arr_states  = pcp0001_GetPlanetStates(kernel,arr_body,arr_jd)
+    
+    return pcp0002_PorkchopGrid(dep_jd,arr_jd,dep_states,arr_states,**kwargs)
+
+def pcp0004_RefinePorkchop(state_functions,
+                           dep_window,
+                           arr_window,
+                           n_dep:int=50,
+                           n_arr:int=50,
+                           levels:int=3,
+                           zoom:float=0.25,
+                           objective:str='c3',
+                           **kwargs):
+    '''
+    Adaptively zoom a porkchop grid onto the minimum of an objective.
+    
+    Each level evaluates an n_dep x n_arr grid, then shrinks both windows to
+    zoom times their width, centred on the best pair (clipped to the
+    original windows).
+
+    Parameters
+    ----------
+    state_functions : tuple of callable
+        (dep_fn, arr_fn), each mapping a Julian date array to (N,6) states,
+        e.g. lambda jd: pcp0001_GetPlanetStates(kernel,'Earth',jd).
+    dep_window : tuple of float
+        (start, stop) departure TDB Julian dates.
+    arr_window : tuple of float
+        (start, stop) arrival TDB Julian dates.
+    n_dep : int, optional
+        Departure samples per level. The default is 50.
+    n_arr : int, optional
+        Arrival samples per level. The default is 50.
+    levels : int, optional
+        Number of grids evaluated. The default is 3.
+    zoom : float, optional
+        Window shrink factor per level. The default is 0.25.
+    objective : str, optional
+        'c3', 'v_inf_arr' or 'v_inf_total'. The default is 'c3'.
+
+    Returns
+    -------
+    grids : list of dict
+        Grid from pcp0002_PorkchopGrid at each level.
+    best : dict or None
+        'dep_jd', 'arr_jd', 'tof', 'c3', 'v_inf_dep', 'v_inf_arr' at the
+        minimum of the finest feasible grid; None if no pair was feasible.
+
+    '''
+    dep_fn, arr_fn  = state_functions
+    dep_lo, dep_hi  = dep_window
+    arr_lo, arr_hi  = arr_window
+    grids           = []
+    best            = None
+    
+    for level in range(levels):
+        dep_jd  = np.linspace(dep_lo,dep_hi,n_dep)
+        arr_jd  = np.linspace(arr_lo,arr_hi,n_arr)
+        grid    = pcp0002_PorkchopGrid(dep_jd,arr_jd,dep_fn(dep_jd),arr_fn(arr_jd),**kwargs)
+        grids.append(grid)
+        
+        if objective == 'v_inf_total':
+            cost = grid['v_inf_dep'] + grid['v_inf_arr']
+        else:
+            cost = grid[objective]
+        
+        if np.all(np.isnan(cost)):
+            break
+        i, j    = np.unravel_index(np.nanargmin(cost),cost.shape)
+        best    = {key: grid[key][i,j] for key in ['tof','c3','v_inf_dep','v_inf_arr']}
+        best['dep_jd'] = dep_jd[i]
+        best['arr_jd'] = arr_jd[j]
+        
+        #### Shrink windows around the best pair
+        half    = zoom*(dep_hi - dep_lo)/2
+        dep_lo  = max(dep_window[0],dep_jd[i] - half)
+        dep_hi  = min(dep_window[1],dep_jd[i] + half)
+        half    = zoom*(arr_hi - arr_lo)/2
+        arr_lo  = max(arr_window[0],arr_jd[j] - half)
+        arr_hi  = min(arr_window[1],arr_jd[j] + half)
+    
+    return grids, best
+
+#%% Plotting
+def pcp0201_PlotPorkchop(grid,levels=None,ax=None):
+    '''
+    Contour C3 over departure/arrival dates, with time-of-flight isolines.
+    '''
+    import matplotlib.pyplot as plt
+    
+    if ax is None:
+        fig, ax = plt.subplots()
+    
+    X, Y    = np.meshgrid(grid['dep_jd'],grid['arr_jd'],indexing='ij')
+    cs      = ax.contour(X,Y,grid['c3'],levels=levels)
+    ax.clabel(cs,fontsize=8)
+    tof     = ax.contour(X,Y,grid['tof'],colors='grey',linestyles='--')
+    ax.clabel(tof,fontsize=8)
+    ax.set_xlabel('Departure [JD]')
+    ax.set_ylabel('Arrival [JD]')
+    ax.set_title('C3 [km^2/s^2]')
+    
+    return ax
@@ -8,8 +8,7 @@ Created on Thu Sep 12 14:04:23 2024
 import matplotlib.pyplot as plt
 import library.bodies as body
 from utilities.gmat import *
-from utilities.eclipse import *
-from utilities.timekeeper import*
+from orbit.eclipse import *
 
 dataframe       = gmt0001_ImportGMAT_Textfile('ISS_positions.txt')
 gmat_eclipse    = gmt0103_ImportEclipseFile('ISS_eclipse.txt')
@@ -34,16 +33,9 @@ ISS_positions   = gmt0102_ExtractPositionData(ISSData)
 SunRadius       = body.planets['sun']['radius']
 EarthRadius     = body.planets['earth']['radius']
 
-eclipseType_vec = []
-
-for i in range(0,len(unix)):
-    eclipseType,theta,theta1,theta2 = EclipseType(Sun_positions.iloc[i,:],
-                                                  Earth_positions.iloc[i,:],
-                                                  ISS_positions.iloc[i,:],
-                                                  SunRadius,
-                                                  EarthRadius,
-                                                  verbose=False)
-    
-    eclipseType_vec.append(eclipseType)
-    
-    
\ No newline at end of file
+#### Classify every sample in one pass
+eclipseType_vec, occlusion_vec = ecl00003_EclipseArray(Sun_positions.to_numpy(),
+                                                       Earth_positions.to_numpy(),
+                                                       ISS_positions.to_numpy(),
+                                                       SunRadius,
+                                                       EarthRadius)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:20:37 2026
+
+@author: isaacfoster
+
+Write a trimmed SPK kernel holding only the bodies and dates a job needs.
+
+    python scripts/trim_kernel.py library/kernels/de440.bsp subset.bsp \\
+        2460310.5 2461041.5 --bodies Sun Earth Moon
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+import orbit.ephem as eph
+
+parser = argparse.ArgumentParser(description='Write a trimmed SPK kernel.')
+parser.add_argument('input',help='source .bsp file')
+parser.add_argument('output',help='trimmed .bsp file to write')
+parser.add_argument('start_jd',type=float,help='window start [TDB Julian date]')
+parser.add_argument('end_jd',type=float,help='window end [TDB Julian date]')
+parser.add_argument('--bodies',nargs='+',default=None,help='bodies to keep (default: all)')
+parser.add_argument('--center',default='0',help='chain center (default: 0, the SSB)')
+args = parser.parse_args()
+
+center  = int(args.center) if args.center.isdigit() else args.center
+eph.eph00003_write_kernel_subset(args.input,args.output,args.start_jd,args.end_jd,
+                                 bodies=args.bodies,center=center)
+
+kernel  = eph.eph00001_load_kernel(args.output)
+print(kernel)
+print(f"{os.path.getsize(args.input)/1e6:.1f} MB -> {os.path.getsize(args.output)/1e6:.1f} MB")
+kernel.close()
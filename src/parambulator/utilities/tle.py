@@ -8,11 +8,13 @@ Created on Thu Sep 12 13:05:57 2024
 #### Standard Libra ries
 import numpy as np
 
-#### Downloaded Libraries
-from satellite_tle import fetch_tle_from_celestrak
-
 #### Parambulator Libraries
-import clock as clock
+import core.defaults as default
+import orbit.twobody as twb
+
+#%% Constants
+TLE_WIDTH       = 69                            # columns per element line, checksum included
+ALPHA5          = b'ABCDEFGHJKLMNPQRSTUVWXYZ'   # Alpha-5 catalog number prefixes, 10-33
 
 #%% tle
 class tle_object():
@@ -39,6 +41,7 @@ class tle_object():
             return False
        
         #### Set time information
+        import utilities.clock as clock
         self.tle_clock      = clock.clock()
         self.tle_clock.SetTimezone('America/Denver')
         self.tle_clock.SetEpoch(self.epoch)
@@ -62,19 +65,25 @@ class tle_object():
         self.Kep_set        = True
     
     #%% Set Functions
-    def set_TLE_from_file(self,filepath):
+    def set_TLE_from_file(self,filepath,norad_id=None):
+        if norad_id is None:
+            norad_id = self.norad_id
         
-        # self.epoch          = epoch
-        # self.INC            = INC
-        # self.RAAN           = RAAN
-        # self.ECC            = ECC
-        # self.AOP            = AOP
-        # self.M              = M
-        # self.mean_motion    = mean_motion
+        catalog             = tle00001_ReadCatalog(filepath)
+        index               = 0
+        if norad_id is not None:
+            matches         = np.flatnonzero(catalog['norad_id'] == int(norad_id))
+            if matches.size == 0:
+                raise ValueError(f"ERROR-tle002: NORAD id {norad_id} is not in {filepath}")
+            index           = matches[-1]
         
-        self.TLE_set        = True
+        self.norad_id       = int(catalog['norad_id'][index])
+        self.object         = catalog['name'][index]
+        self._set_from_catalog(catalog,index)
       
     def set_tle_from_celestrak(self,norad_id=None):
+        from satellite_tle import fetch_tle_from_celestrak
+        
         if norad_id is None:
             norad_id = self.norad_id
            
@@ -85,29 +94,24 @@ class tle_object():
         self.line3          = self.tle[2]
  
         self.object         = self.line1
-        self.line2_items    = list(filter(None, self.line2.split(' ')))
-        self.line3_items    = list(filter(None, self.line3.split(' ')))
-       
-        epoch               = float(self.line2_items[3])
-        INC                 = float(self.line3_items[2])
-        RAAN                = float(self.line3_items[3])
-        ECC                 = float('.'+self.line3_items[4])
-        AOP                 = float(self.line3_items[5])
-        M                   = float(self.line3_items[6])
-        mean_motion         = float(self.line3_items[7])
-       
-        self.epoch          = epoch
-        self.INC            = INC
-        self.RAAN           = RAAN
-        self.ECC            = ECC
-        self.AOP            = AOP
-        self.M              = M
-        self.mean_motion    = mean_motion
-       
-        self.TLE_set        = True
+        catalog             = tle00002_ParseCatalog('\n'.join(self.tle))
+        self._set_from_catalog(catalog,0)
         
         print(self.tle)
         
+    def _set_from_catalog(self,catalog,index):
+        '''
+        Copy one record of a parsed catalog, keeping the YYDDD.dddddddd
+        epoch that clock.SetEpoch expects.
+        '''
+        self.set_tle(epoch          = float((catalog['epoch_year'][index] % 100)*1000 + catalog['epoch_day'][index]),
+                     INC            = float(catalog['inc'][index]),
+                     RAAN           = float(catalog['RAAN'][index]),
+                     ECC            = float(catalog['e'][index]),
+                     AOP            = float(catalog['omega'][index]),
+                     M              = float(catalog['M'][index]),
+                     mean_motion    = float(catalog['n'][index]))
+        
     def set_tle(self,
                 epoch,
                 INC,
@@ -129,49 +133,22 @@ class tle_object():
     #%% Orbit Functions
     def twb00112_eccentric_anomoly(self,M:float=None,
                                    e:float=None,
-                                   tol:float=0.00001,
-                                   max_iter:int=100,
-                                   verbose:bool=False,
+                                   tol:float=1e-12,
+                                   max_iter:int=12,
                                    **args):
-           
-        M_rad       = M*(np.pi/180)
-        max_iter    = max_iter
-        tol         = tol
-        mag         = 100
-        i           = 0
-        E_vec       = [M_rad]
-       
-        while mag > tol and i <= max_iter:
-            E_i         = E_vec[i] 
-            E_new       = E_i - (E_i - M_rad - e*np.sin(E_i))/(1-e*np.cos(E_i))     
-            mag         = abs(E_new - E_i)
-            E_current   = E_new
-            E_vec.append(E_new)
-            i           += 1
-       
-        E_rad   = E_current
-        E_deg   = E_current*(180/np.pi)
-       
-        if verbose is True or i == max_iter:
-            print('-----------')
-            print(f"E_{0}: {M_rad}")
-            print(f"E_{i}: {E_current}")
-            print(f"Iterations: {i}")
-            print(f"Mag: {mag}")
-            print(f"Eccentric Anomaly: {E_rad} [rad]")
-            print(f"Eccentric Anomaly: {E_deg} [deg]")
-           
-        return E_deg
+        
+        E_deg   = twb.twb00115_eccentric_anomaly_array(M,e,tol=tol,max_iter=max_iter)
+        
+        return float(E_deg)
        
     def twb00113_true_anomaly(self,E:float=None,
                               e:float=None,
                               **args):
+        
+        nu_deg  = twb.twb00116_true_anomaly_array(E,e)
        
-        E_rad   = E*(np.pi/180)
-        nu_rad  = np.arccos((np.cos(E_rad)-e)/(1-e*np.cos(E_rad)))
-        nu_deg  = nu_rad*(180/np.pi)
-       
-        return nu_deg
+        return float(nu_deg)
+    
     #%% Get Functions
     def get_keplerian(self):
         self.convert_tle_to_kep()
@@ -232,6 +209,244 @@ class tle_object():
         print(f"mean_motion: {self.mean_motion}")
         print('--------------------------------------')
 
+#%% Catalog
+#### Digit value of each byte (non-digits read as zero)
+_digit_table            = np.zeros(256,dtype=np.uint8)
+_digit_table[48:58]     = np.arange(10)
+
+#### Fixed decimal points, (line, column): the epoch day, ndot, inc, RAAN, omega, M and n
+_points                 = ((1,23),(1,34),(2,11),(2,20),(2,37),(2,46),(2,54))
+
+def _lines(buffer):
+    '''
+    Start and stop offsets of the non-empty lines of a byte buffer, with
+    carriage returns dropped.
+    '''
+    newline     = np.flatnonzero(buffer == 10)
+    start       = np.concatenate(([0],newline + 1))
+    stop        = np.concatenate((newline,[buffer.size]))
+    stop        -= (stop > start) & (buffer[np.maximum(stop - 1,0)] == 13)
+    keep        = stop > start
+    return start[keep], stop[keep]
+
+def _gather(buffer,start,stop,width,fill=32):
+    '''
+    (N,width) uint8 block of the lines [start, stop), padded with fill.
+    Rows are taken from a sliding-window view of the buffer, so only lines
+    shorter than width need masking.
+    '''
+    padded      = np.concatenate((buffer,np.full(width,fill,dtype=np.uint8)))
+    block       = np.lib.stride_tricks.sliding_window_view(padded,width)[start]
+    short       = np.flatnonzero(stop - start < width)
+    if short.size:
+        rows        = block[short]
+        rows[np.arange(width) >= (stop - start)[short,None]] = fill
+        block[short] = rows
+    return block
+
+def _field(block,digits,start,stop,decimals=0,point=True):
+    '''
+    Fixed-width decimal column of every record as one place-value product.
+    With point the '.' sits decimals columns from the end, otherwise the
+    decimal point is implied; '-' anywhere makes the value negative and
+    blanks read as zero. decimals=0 returns integers.
+    '''
+    columns     = np.arange(start,stop)
+    if point and decimals:
+        columns = columns[columns != stop - 1 - decimals]
+    place       = 10.0**np.arange(columns.size - 1,-1,-1)
+    mantissa    = digits[:,columns].astype(np.float64) @ place
+    mantissa    = np.where((block[:,start:stop] == 45).any(axis=1),-mantissa,mantissa)
+    if decimals == 0:
+        return mantissa.astype(np.int64)
+    return mantissa/10.0**decimals
+
+def _exponential(block,digits,start):
+    '''
+    Implied-decimal exponential field (" 46099-3" = 0.46099e-3) at start.
+    '''
+    return _field(block,digits,start,start + 6)/10.0**(5 - _field(block,digits,start + 6,start + 8))
+
+def _checksum(block,digits):
+    '''
+    Modulo-10 checksum test of each line against its last column: digits
+    count their value and '-' counts one.
+    '''
+    body        = slice(0,TLE_WIDTH - 1)
+    total       = digits[:,body].sum(axis=1,dtype=np.int64) + (block[:,body] == 45).sum(axis=1)
+    last        = block[:,TLE_WIDTH - 1]
+    return (total % 10 == digits[:,TLE_WIDTH - 1]) & (last >= 48) & (last <= 57)
+
+def _catalog_number(block,digits):
+    '''
+    NORAD catalog number, including Alpha-5 ids (A0001 = 100001).
+    '''
+    number      = _field(block,digits,2,7)
+    lead        = block[:,2]
+    alpha       = (lead >= 65) & (lead <= 90)
+    number[alpha] += (np.searchsorted(np.frombuffer(ALPHA5,dtype=np.uint8),lead[alpha]) + 10)*10000
+    return number
+
+def _names(buffer,start,stop):
+    '''
+    Object names from title lines, without CelesTrak's "0 " prefix or
+    trailing blanks.
+    '''
+    prefixed    = (stop - start > 2) & (buffer[start] == 48) & (buffer[np.minimum(start + 1,buffer.size - 1)] == 32)
+    start       = start + 2*prefixed
+    width       = int((stop - start).max(initial=1))
+    block       = _gather(buffer,start,stop,width,fill=0)
+    visible     = (block != 0) & (block != 32) & (block != 9)
+    end         = width - np.argmax(visible[:,::-1],axis=1)
+    end[~visible.any(axis=1)] = 0
+    block[np.arange(width) >= end[:,None]] = 0
+    return block.view(f'S{width}').ravel().astype(str)
+
+def tle00002_ParseCatalog(text,drop_invalid:bool=False):
+    '''
+    Parse a 2LE or 3LE catalog into columnar arrays.
+
+    Element lines are matched by their "1 " / "2 " prefixes, so 2LE and 3LE
+    records (and a mix of both) are accepted; a line directly before a line
+    1 that is not itself an element line is taken as the object name, minus
+    CelesTrak's "0 " prefix. Line offsets come from the newline positions
+    of the whole buffer and every record is gathered into two (N,69) uint8
+    blocks, so each fixed-width field is sliced and converted for the whole
+    catalog at once, with no per-object Python work and no reliance on
+    whitespace between fields.
+
+    Parameters
+    ----------
+    text : str or bytes
+        Catalog contents.
+    drop_invalid : bool, optional
+        Drop records with a bad checksum, mismatched catalog numbers or a
+        misplaced decimal point, and ignore unpaired element lines, instead
+        of raising. The default is False.
+
+    Returns
+    -------
+    catalog : dict of numpy.ndarray, shape (N,)
+        'name' (str, empty for 2LE), 'norad_id', 'epoch' (UTC Julian date),
+        'epoch_year', 'epoch_day' (day of year, 1.0 = Jan 1 0h), 'bstar'
+        [1/earth radii], 'inc', 'RAAN', 'e', 'omega', 'M' [deg], 'n'
+        [rev/day], 'ndot' [rev/day^2], 'nddot' [rev/day^3] and 'rev_number'.
+        'ndot' and 'nddot' are the derivatives themselves, i.e. twice and
+        six times the printed fields.
+
+    '''
+    if isinstance(text,str):
+        text = text.encode('ascii')
+    buffer              = np.frombuffer(text or b'\n',dtype=np.uint8)
+    start, stop         = _lines(buffer)
+
+    #### Pair each line 1 with the line 2 after it
+    long                = stop - start >= 2
+    first, second       = buffer[np.minimum(start,buffer.size - 1)], buffer[np.minimum(start + 1,buffer.size - 1)]
+    is1                 = long & (first == 49) & (second == 32)
+    is2                 = long & (first == 50) & (second == 32)
+    next2               = np.append(is2[1:],False)
+    prev1               = np.insert(is1[:-1],0,False)
+    idx1                = np.flatnonzero(is1 & next2)
+    orphans             = int((is1 & ~next2).sum() + (is2 & ~prev1).sum())
+
+    L1                  = _gather(buffer,start[idx1],stop[idx1],TLE_WIDTH)
+    L2                  = _gather(buffer,start[idx1 + 1],stop[idx1 + 1],TLE_WIDTH)
+
+    before              = np.maximum(idx1 - 1,0)
+    named               = (idx1 > 0) & ~is1[before] & ~is2[before]
+    name                = np.full(idx1.size,'',dtype=object)
+    if named.any():
+        name[named]     = _names(buffer,start[before[named]],stop[before[named]])
+
+    #### Validation
+    D1, D2              = _digit_table[L1], _digit_table[L2]
+    norad_id            = _catalog_number(L1,D1)
+    bad                 = ~_checksum(L1,D1) | ~_checksum(L2,D2) | (norad_id != _catalog_number(L2,D2))
+    for line,column in _points:
+        bad             |= (L1 if line == 1 else L2)[:,column] != 46
+    if not drop_invalid and (bad.any() or orphans):
+        records         = ', '.join(str(k) for k in np.flatnonzero(bad)[:10])
+        raise ValueError(f"ERROR-tle001: {int(bad.sum())} record(s) failed checksum, catalog number or "
+                         f"format checks (records {records or 'none'}) and {orphans} element line(s) "
+                         f"are unpaired")
+    if bad.any():
+        keep            = ~bad
+        L1, L2, D1, D2  = L1[keep], L2[keep], D1[keep], D2[keep]
+        name, norad_id  = name[keep], norad_id[keep]
+
+    #### Epoch
+    year                = _field(L1,D1,18,20)
+    year                += np.where(year < 57,2000,1900)
+    day                 = _field(L1,D1,20,32,8)
+    y                   = year - 1
+    jan1                = 1721425.5 + 365*y + y//4 - y//100 + y//400
+
+    catalog             = {'name':          name.astype(str),
+                           'norad_id':      norad_id,
+                           'epoch':         jan1 + day - 1,
+                           'epoch_year':    year,
+                           'epoch_day':     day,
+                           'ndot':          2*_field(L1,D1,33,43,8),
+                           'nddot':         6*_exponential(L1,D1,44),
+                           'bstar':         _exponential(L1,D1,53),
+                           'inc':           _field(L2,D2,8,16,4),
+                           'RAAN':          _field(L2,D2,17,25,4),
+                           'e':             _field(L2,D2,26,33,7,point=False),
+                           'omega':         _field(L2,D2,34,42,4),
+                           'M':             _field(L2,D2,43,51,4),
+                           'n':             _field(L2,D2,52,63,8),
+                           'rev_number':    _field(L2,D2,63,68)}
+
+    return catalog
+
+def tle00001_ReadCatalog(filepath,drop_invalid:bool=False):
+    '''
+    Read a whole 2LE/3LE catalog file with tle00002_ParseCatalog.
+
+    Parameters
+    ----------
+    filepath : str
+        Catalog file.
+    drop_invalid : bool, optional
+        Drop records that fail validation instead of raising. The default
+        is False.
+
+    Returns
+    -------
+    catalog : dict of numpy.ndarray
+        Columns as returned by tle00002_ParseCatalog.
+
+    '''
+    with open(filepath,'rb') as f:
+        text = f.read()
+
+    return tle00002_ParseCatalog(text,drop_invalid=drop_invalid)
+
+def tle00003_CatalogElements(catalog,mu=default.mu):
+    '''
+    Keplerian element columns of a parsed catalog, with the semi-major axis
+    from the mean motion. TLE elements are SGP4 (Kozai) mean elements, so
+    this is a first-pass conversion for orbit.perturbations or
+    orbit.state.OrbitStateArray.from_elements, not an SGP4 replacement.
+
+    Returns
+    -------
+    elements : dict of numpy.ndarray
+        'a' [km], 'e', 'i', 'RAAN', 'omega', 'M' [deg] and 'epoch' [JD].
+
+    '''
+    n           = catalog['n']*2*np.pi/86400
+    elements    = {'a':     (mu/n**2)**(1/3),
+                   'e':     catalog['e'],
+                   'i':     catalog['inc'],
+                   'RAAN':  catalog['RAAN'],
+                   'omega': catalog['omega'],
+                   'M':     catalog['M'],
+                   'epoch': catalog['epoch']}
+
+    return elements
+
 if __name__ == "__main__":
     norad_id = 25544
     iss = tle_object()
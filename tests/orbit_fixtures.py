@@ -0,0 +1,17 @@
+"""
+Sample two-body states shared by the orbit tests.
+
+Rows cover a prograde inclined orbit, a near-equatorial-crossing orbit, a
+descending state and Vallado's rv2coe example (Example 2-5).
+"""
+import numpy as np
+
+R_SAMPLE = np.array([[7000, 200, 3000],
+                     [-6045, -3490, 2500],
+                     [8000, -1000, -2000],
+                     [6524.834, 6862.875, 6448.296]], dtype=float)
+
+V_SAMPLE = np.array([[1, 9.5, 1.5],
+                     [-3.457, 6.618, 2.533],
+                     [1.0, 5.5, -4.0],
+                     [4.901327, 5.533756, -1.976341]], dtype=float)
@@ -0,0 +1,98 @@
+"""
+Synthetic type 2/3 SPK kernels for the ephemeris tests.
+
+Bodies move on simple analytic paths so tests can check kernel evaluations
+against closed-form positions and velocities without a JPL kernel on disk.
+"""
+import os
+import struct
+import tempfile
+import numpy as np
+from jplephem.daf import DAF, FTPSTR
+from jplephem.spk import SPK, T0, S_PER_DAY
+
+AU = 149597870.7
+
+
+def circle(radius, period, phase=0.0, tilt=0.0):
+    """Circular path about the segment center, tilted about x [rad]."""
+    def position(jd):
+        angle = 2*np.pi*(np.asarray(jd, dtype=np.float64) - T0)/period + phase
+        x = radius*np.cos(angle)
+        y = radius*np.sin(angle)
+        return np.array([x, y*np.cos(tilt), y*np.sin(tilt)])
+    return position
+
+
+# (center, target, path) in the shape of a DE kernel's segment tree
+DEFAULT_SEGMENTS = [
+    (0, 10, circle(7.0e5, 4332.0, 0.3)),
+    (0, 3, circle(AU, 365.25, 0.0)),
+    (3, 399, circle(4671.0, 27.32, np.pi, 0.09)),
+    (3, 301, circle(379729.0, 27.32, 0.0, 0.09)),
+    (0, 4, circle(1.524*AU, 686.98, 1.0, 0.03)),
+    (4, 499, circle(20.0, 30.0, 0.5)),
+    (0, 5, circle(5.2*AU, 4332.6, 2.0, 0.02)),
+]
+
+
+def write_spk(path, segments=DEFAULT_SEGMENTS, start_jd=T0 - 40, end_jd=T0 + 40,
+              intlen_days=4.0, degree=13, data_type=2):
+    """Fit each path with Chebyshev polynomials and write a type 2 SPK.
+
+    With data_type=3 each segment also stores a velocity series [km/s],
+    fitted to an optional fourth segment entry velocity(jd) or else to a
+    central difference of the path.
+    """
+    with open(path, 'w+b') as f:
+        record = struct.pack('<8sII60sIII8s603s28s297s', b'DAF/SPK ', 2, 6,
+                             b'synthetic'.ljust(60), 2, 2, 3*128 + 1,
+                             b'LTL-IEEE', b'\0'*603, FTPSTR, b'\0'*297)
+        f.write(record)
+        f.write(b'\0'*1024)
+        f.write(b' '*1024)
+        f.seek(0)
+        daf = DAF(f)
+
+        n = int(np.ceil((end_jd - start_jd)/intlen_days))
+        nodes = np.cos(np.pi*(np.arange(degree + 1) + 0.5)/(degree + 1))
+        for center, target, position, *rate in segments:
+            velocity = rate[0] if rate else (lambda jd: (position(jd + 1e-4) - position(jd - 1e-4))/(2e-4*S_PER_DAY))
+            records = []
+            for k in range(n):
+                mid = start_jd + (k + 0.5)*intlen_days
+                radius = intlen_days/2
+                values = position(mid + radius*nodes)
+                if data_type == 3:
+                    values = np.concatenate([values, velocity(mid + radius*nodes)])
+                coefficients = np.polynomial.chebyshev.chebfit(nodes, values.T, degree).T
+                records.append(np.concatenate([[(mid - T0)*S_PER_DAY, radius*S_PER_DAY],
+                                               coefficients.ravel()]))
+            rsize = 2 + (6 if data_type == 3 else 3)*(degree + 1)
+            array = np.concatenate(records + [[(start_jd - T0)*S_PER_DAY,
+                                               intlen_days*S_PER_DAY, rsize, n]])
+            summary = ((start_jd - T0)*S_PER_DAY, (start_jd + n*intlen_days - T0)*S_PER_DAY,
+                       target, center, 1, data_type)
+            daf.add_array(f'synthetic {center}->{target}'.encode(), summary, array)
+    return path
+
+
+def open_spk(path, **kwargs):
+    return SPK.open(write_spk(path, **kwargs))
+
+
+class KernelTestCase:
+    """Mixin opening one synthetic kernel per test class as cls.kernel."""
+    jd_span = 30
+    jd_count = 11
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.kernel = open_spk(os.path.join(cls.tmp.name, 'synthetic.bsp'))
+        cls.jd = T0 + np.linspace(-cls.jd_span, cls.jd_span, cls.jd_count)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.kernel.close()
+        cls.tmp.cleanup()
@@ -0,0 +1,160 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+import orbit.analytic as anl
+import orbit.ephem as eph
+import orbit.beta as beta
+sys.path.insert(0, os.path.dirname(__file__))
+import synthetic_spk
+
+#### TT = UTC + 69.184 s in 2024
+TT_OFFSET = 69.184/86400
+ABERRATION = 20.496/3600
+
+
+def jd_tt(year, month, day, hour, minute, delta_t=69.184):
+    '''TT Julian date of a UTC calendar minute.'''
+    a = (14 - month)//12
+    y, m = year + 4800 - a, month + 12*a - 3
+    jdn = day + (153*m + 2)//5 + 365*y + y//4 - y//100 + y//400 - 32045
+    return jdn - 0.5 + (hour*60 + minute)/1440 + delta_t/86400
+
+
+def ecliptic(position):
+    '''J2000 ecliptic longitude, latitude [deg] and distance of an ICRF vector.'''
+    eps = np.radians(anl.OBLIQUITY)
+    x, y, z = position
+    y, z = y*np.cos(eps) + z*np.sin(eps), -y*np.sin(eps) + z*np.cos(eps)
+    return np.degrees(np.arctan2(y, x)) % 360, np.degrees(np.arctan2(z, np.hypot(x, y))), np.linalg.norm(position, axis=0)
+
+
+def wrap(angle):
+    return (angle + 180) % 360 - 180
+
+
+class TestAnalyticSeries(unittest.TestCase):
+    def test_sun_at_march_2024_equinox(self):
+        jd      = 2460389.629167 + TT_OFFSET           # 2024-03-20 03:06 UTC
+        x, y, z = anl.anl00001_SunPosition(jd)
+        eps     = np.radians(anl.OBLIQUITY)
+        lon     = np.degrees(np.arctan2(y*np.cos(eps) + z*np.sin(eps), x))
+
+        #### Ecliptic longitude of date is zero; J2000 lags by the precession since J2000
+        self.assertAlmostEqual(lon, -anl.PRECESSION*(jd - anl.J2000)/36525, delta=0.01)
+        self.assertAlmostEqual(np.linalg.norm([x, y, z])/anl.AU, 0.9960, delta=2e-4)
+
+    def test_moon_at_april_2024_eclipse(self):
+        jd      = 2460409.264444 + TT_OFFSET           # 2024-04-08 18:20:48 UTC, new moon
+        moon    = anl.anl00002_MoonPosition(jd)
+        sun     = anl.anl00001_SunPosition(jd)
+        angle   = np.degrees(np.arccos(moon @ sun/np.linalg.norm(moon)/np.linalg.norm(sun)))
+
+        #### Eclipse gamma 0.343 Earth radii at ~360,000 km puts the Moon ~0.35 deg off the Sun
+        self.assertAlmostEqual(angle, 0.35, delta=0.1)
+        self.assertAlmostEqual(np.linalg.norm(moon), 360000, delta=1500)
+
+    def test_sun_at_published_equinoxes_and_solstices(self):
+        #### USNO instants (UTC), where the apparent longitude of date is 0/90/180/270
+        events = [((2000, 3, 20, 7, 35), 0, 63.8), ((2020, 3, 20, 3, 50), 0, 69.4),
+                  ((2020, 6, 20, 21, 44), 90, 69.4), ((2024, 3, 20, 3, 6), 0, 69.184),
+                  ((2024, 6, 20, 20, 51), 90, 69.184), ((2024, 9, 22, 12, 44), 180, 69.184),
+                  ((2024, 12, 21, 9, 20), 270, 69.184)]
+        for utc, apparent, delta_t in events:
+            jd      = jd_tt(*utc, delta_t=delta_t)
+            T       = (jd - anl.J2000)/36525
+            nutation = -17.20/3600*np.sin(np.radians(125.04452 - 1934.136261*T))
+            expected = apparent - nutation + ABERRATION - anl.PRECESSION*T
+            lon, lat, _ = ecliptic(anl.anl00001_SunPosition(jd))
+            self.assertLess(abs(wrap(lon - expected)), 0.01, msg=utc)
+            self.assertLess(abs(lat), 0.01, msg=utc)
+
+        #### 2024 perihelion and aphelion distances [km]
+        for utc, distance in (((2024, 1, 3, 0, 39), 147100632.0), ((2024, 7, 5, 5, 6), 152100527.0)):
+            r = np.linalg.norm(anl.anl00001_SunPosition(jd_tt(*utc)))
+            self.assertLess(abs(r - distance), 1e-4*anl.AU, msg=utc)
+
+    def test_moon_at_published_phases_of_2024(self):
+        #### Apparent elongation is 0 at new moon and 180 at full moon (UTC)
+        new     = [(1, 11, 11, 57), (2, 9, 22, 59), (3, 10, 9, 0), (4, 8, 18, 21), (5, 8, 3, 22),
+                   (6, 6, 12, 38), (7, 5, 22, 57), (8, 4, 11, 13), (9, 3, 1, 55), (10, 2, 18, 49),
+                   (11, 1, 12, 47), (12, 1, 6, 21), (12, 30, 22, 27)]
+        full    = [(1, 25, 17, 54), (2, 24, 12, 30), (3, 25, 7, 0), (4, 23, 23, 49), (5, 23, 13, 53),
+                   (6, 22, 1, 8), (7, 21, 10, 17), (8, 19, 18, 26), (9, 18, 2, 34), (10, 17, 11, 26),
+                   (11, 15, 21, 28), (12, 15, 9, 2)]
+        for phases, elongation in ((new, 0), (full, 180)):
+            jd      = np.array([jd_tt(2024, *utc) for utc in phases])
+            moon    = ecliptic(anl.anl00002_MoonPosition(jd))[0]
+            sun     = ecliptic(anl.anl00001_SunPosition(jd))[0]
+            error   = wrap(moon - sun - elongation + ABERRATION)*60
+            self.assertLess(np.abs(error).max(), 3.0)
+
+    def test_moon_against_meeus_example(self):
+        #### Meeus, Astronomical Algorithms, Example 47.a: 1992 April 12.0 TD, mean equinox of date
+        jd              = 2448724.5
+        lon, lat, r     = ecliptic(anl.anl00002_MoonPosition(jd))
+        expected        = 133.162655 - anl.PRECESSION*(jd - anl.J2000)/36525
+        self.assertLess(abs(wrap(lon - expected))*60, 3.0)
+        self.assertLess(abs(lat + 3.229126)*60, 3.0)
+        self.assertLess(abs(r - 368409.7), 300)
+
+    def test_vectorized_over_epochs(self):
+        jd      = anl.J2000 + np.linspace(0, 3650, 1000)
+        moon    = anl.anl00002_MoonPosition(jd)
+        self.assertEqual(moon.shape, (3, 1000))
+        np.testing.assert_allclose(moon[:, 123], anl.anl00002_MoonPosition(jd[123]))
+        self.assertTrue(np.all((np.linalg.norm(moon, axis=0) > 355000) & (np.linalg.norm(moon, axis=0) < 408000)))
+
+
+class TestFastBackend(unittest.TestCase):
+    def setUp(self):
+        self.fast   = eph.eph00001_load_kernel('fast')
+        self.jd     = anl.J2000 + np.linspace(8000, 8030, 31)
+
+    def test_selected_through_ephem(self):
+        moon        = eph.get_state('moon', self.jd, self.fast, center='earth')
+        np.testing.assert_allclose(moon[:, :3].T, anl.anl00002_MoonPosition(self.jd))
+        np.testing.assert_allclose(np.linalg.norm(moon[:, 3:], axis=1), 1.02, atol=0.1)
+
+        earth       = eph.get_position_ICRF('earth', self.jd, self.fast)
+        np.testing.assert_allclose(earth, -anl.anl00001_SunPosition(self.jd))
+
+        grid        = beta.beta00003_BetaAngleGrid(self.jd, [0.0, 90.0], 51.6, self.fast)
+        self.assertEqual(grid.shape, (31, 2))
+        self.assertTrue(np.all(np.abs(grid) <= 51.6 + 23.5))
+
+        with self.assertRaises(ValueError):
+            eph.get_position_ICRF('mars', self.jd, self.fast)
+
+    def test_compare_to_kernel(self):
+        #### Reference kernel: the Sun pushed out 1000 km and the Moon turned 0.1 deg about z
+        turn        = np.radians(0.1)
+        spin        = np.array([[np.cos(turn), -np.sin(turn), 0], [np.sin(turn), np.cos(turn), 0], [0, 0, 1]])
+        sun         = lambda jd: anl.anl00001_SunPosition(jd)*(1 + 1000/np.linalg.norm(anl.anl00001_SunPosition(jd), axis=0))
+        moon        = lambda jd: spin @ anl.anl00002_MoonPosition(jd)
+        zero        = lambda jd: np.zeros((3,) + np.shape(jd))
+        segments    = [(0, 10, sun), (0, 3, zero), (3, 399, zero), (3, 301, moon)]
+        jd          = synthetic_spk.T0 + np.linspace(-30, 30, 241)
+
+        with tempfile.TemporaryDirectory() as folder:
+            kernel  = synthetic_spk.open_spk(os.path.join(folder, 'reference.bsp'), segments=segments)
+            try:
+                errors = anl.anl00003_CompareToKernel(kernel, jd)
+            finally:
+                kernel.close()
+
+        moon_dec    = np.arcsin(anl.anl00002_MoonPosition(jd)[2]/np.linalg.norm(anl.anl00002_MoonPosition(jd), axis=0))
+        expected    = np.degrees(2*np.arcsin(np.cos(moon_dec)*np.sin(turn/2))).max()
+        self.assertEqual(set(errors), {'sun', 'moon'})
+        self.assertAlmostEqual(errors['sun']['distance_km'], 1000, delta=1e-3)
+        self.assertLess(errors['sun']['angle_deg'], 1e-8)
+        self.assertAlmostEqual(errors['moon']['angle_deg'], expected, delta=1e-6)
+        self.assertLess(errors['moon']['distance_km'], 1e-3)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,121 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.beta as beta
+import orbit.ephem as eph
+from orbit.state import OrbitStateArray
+from orbit_fixtures import R_SAMPLE, V_SAMPLE
+import synthetic_spk
+
+
+class TestBetaAngleGrid(synthetic_spk.KernelTestCase, unittest.TestCase):
+    jd_count = 61
+
+    def test_constellation_grid_matches_per_plane(self):
+        RAAN        = np.linspace(0.0, 359.0, 500)
+        inc         = np.linspace(30.0, 98.0, 500)
+        grid        = beta.beta00003_BetaAngleGrid(self.jd, RAAN, inc, self.kernel, RAAN_rate_deg=-5.0)
+        self.assertEqual(grid.shape, (self.jd.size, 500))
+
+        solar       = beta.beta00001_SolarVector(self.jd, self.kernel)
+        for k in (0, 17, 499):
+            RAAN_k  = RAAN[k] - 5.0*(self.jd - self.jd[0])
+            np.testing.assert_allclose(grid[:, k], beta.beta_angle_solar_vector(RAAN_k, inc[k], solar), atol=1e-12)
+
+        outer       = beta.beta00003_BetaAngleGrid(self.jd, RAAN[:, None], inc[::100], self.kernel)
+        self.assertEqual(outer.shape, (self.jd.size, 500, 5))
+        np.testing.assert_allclose(outer[:, 3, 0], beta.beta_angle_solar_vector(RAAN[3], inc[0], solar), atol=1e-12)
+
+    def test_state_array_uses_own_plane(self):
+        states      = OrbitStateArray(self.jd[[0, 5, 5, 9]], R_SAMPLE, V_SAMPLE)
+        result      = beta.beta00004_BetaAngleStates(states, self.kernel)
+
+        elements    = states.elements
+        for k, jd in enumerate(states.epoch):
+            expected = beta.beta00003_BetaAngleGrid([jd], elements['RAAN'][k], elements['i'][k], self.kernel)
+            self.assertAlmostEqual(result[k], expected[0], places=9)
+
+        raw         = beta.beta00004_BetaAngleStates(R_SAMPLE, self.kernel, V=V_SAMPLE, epoch=states.epoch)
+        np.testing.assert_allclose(raw, result)
+        with self.assertRaises(TypeError):
+            beta.beta00004_BetaAngleStates(R_SAMPLE, self.kernel, V=V_SAMPLE)
+
+
+class TestBetaAngleMethods(unittest.TestCase):
+    def test_methods_agree_for_sun_in_ecliptic(self):
+        obliquity   = 23.44
+        Gamma       = np.linspace(0.0, 350.0, 36)
+        eps         = np.radians(obliquity)
+        g           = np.radians(Gamma)
+        solar       = -1.5e8*np.array([np.cos(g), np.sin(g)*np.cos(eps), np.sin(g)*np.sin(eps)])
+
+        RA, dec, longitude = beta.beta00002_SolarAngles(solar, obliquity)
+        np.testing.assert_allclose(longitude, Gamma, atol=1e-9)
+
+        RAAN, inc   = np.array([[10.0], [200.0]]), np.array([51.6, 97.4, 0.0])
+        vector      = beta.beta_angle_solar_vector(RAAN[..., None], inc[:, None], solar)
+        self.assertEqual(vector.shape, (2, 3, 36))
+        np.testing.assert_allclose(beta.beta_angle_dec(RAAN[..., None], inc[:, None], RA, dec), vector, atol=1e-9)
+        np.testing.assert_allclose(beta.beta_angle_psi(RAAN[..., None], inc[:, None], obliquity, longitude),
+                                   -vector, atol=1e-9)
+
+
+class TestBetaEvents(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.fast    = eph.eph00001_load_kernel('fast')
+        cls.start   = 2460400.0
+        cls.end     = 2460600.0
+        cls.planes  = dict(RAAN_deg=[0.0, 120.0], inc_deg=[51.6, 97.4], a=[6778.0, 7078.0])
+
+    def dense(self, plane):
+        t       = np.arange(self.start, self.end, 0.01)
+        rate    = beta.delta_RAAN(6378.165, self.planes['a'][plane], 0.0, self.planes['inc_deg'][plane])*86400
+        RAAN    = self.planes['RAAN_deg'][plane] + rate*(t - self.start)
+        return t, beta.beta_angle_solar_vector(RAAN, self.planes['inc_deg'][plane],
+                                               beta.beta00001_SolarVector(t, self.fast))
+
+    def test_crossings_and_extrema(self):
+        events  = beta.beta00005_BetaEvents(start_jd=self.start, end_jd=self.end, kernel=self.fast,
+                                            levels=(-60.0, 60.0), **self.planes)
+
+        crossings = events[events['Event'].isin(['Rising', 'Falling'])]
+        np.testing.assert_allclose(crossings['Beta'], crossings['Level'], atol=1e-4)
+
+        for plane in (0, 1):
+            t, dense    = self.dense(plane)
+            mine        = events[events['Plane'] == plane]
+            sign        = np.diff(np.sign(dense - 60.0)) != 0
+            self.assertEqual((mine['Level'] == 60.0).sum(), sign.sum())
+
+            for _, row in mine[mine['Event'] == 'Maximum'].iterrows():
+                near = np.abs(t - row['Time']) < 2
+                self.assertAlmostEqual(row['Beta'], dense[near].max(), delta=1e-3)
+            self.assertEqual((mine['Event'] == 'Maximum').sum(),
+                             ((dense[1:-1] > dense[:-2]) & (dense[1:-1] > dense[2:])).sum())
+
+    def test_intervals_above_threshold(self):
+        intervals = beta.beta00006_BetaIntervals(self.planes['RAAN_deg'], self.planes['inc_deg'], self.start,
+                                                 self.end, self.fast, threshold=60.0, a=self.planes['a'])
+        for plane in (0, 1):
+            t, dense    = self.dense(plane)
+            inside      = np.zeros(t.size, dtype=bool)
+            for _, row in intervals[intervals['Plane'] == plane].iterrows():
+                inside |= (t >= row['Start Time']) & (t <= row['Stop Time'])
+            np.testing.assert_array_equal(inside, np.abs(dense) >= 60.0)
+        np.testing.assert_allclose(intervals['Duration'], intervals['Stop Time'] - intervals['Start Time'])
+
+    def test_delta_RAAN_needs_no_global(self):
+        rate    = beta.delta_RAAN(6378.165, 7078.0, 0.0, 98.19)*86400
+        self.assertAlmostEqual(rate, 360/365.2422, delta=0.02)
+        self.assertLess(abs(beta.delta_RAAN(6378.165, 7078.0, 0.0, 51.6)),
+                        abs(beta.delta_RAAN(6378.165, 7078.0, 0.3, 51.6)))
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
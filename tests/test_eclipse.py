@@ -0,0 +1,302 @@
+import io
+import os
+import csv
+import tempfile
+import sys
+import unittest
+import contextlib
+import numpy as np
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.eclipse as ecl
+import orbit.ephem as eph
+from orbit.state import OrbitStateArray
+from orbit_fixtures import R_SAMPLE, V_SAMPLE
+import synthetic_spk
+
+SUN_RADIUS      = 695700.0
+EARTH_RADIUS    = 6378.165
+AU              = 1.496e8
+
+
+def leo_ring(n, radius=7000.0, inclination=0.3):
+    '''
+    Spacecraft positions about an Earth at (-AU,0,0), swept through the
+    shadow.
+    '''
+    u = np.linspace(-np.pi, np.pi, n)
+    R = radius*np.column_stack((np.cos(u), np.sin(u)*np.cos(inclination), np.sin(u)*np.sin(inclination)))
+    return R
+
+
+class TestEclipseArray(unittest.TestCase):
+    def setUp(self):
+        n           = 2001
+        self.sun    = np.zeros((n, 3))
+        self.earth  = np.tile([-AU, 0.0, 0.0], (n, 1))
+        self.sc     = self.earth + leo_ring(n)
+
+    def test_matches_scalar_functions(self):
+        codes, theta, theta1, theta2 = ecl.ecl00001_EclipseTypeArray(self.sun, self.earth, self.sc,
+                                                                     SUN_RADIUS, EARTH_RADIUS)
+        _, occlusion = ecl.ecl00003_EclipseArray(self.sun, self.earth, self.sc, SUN_RADIUS, EARTH_RADIUS)
+
+        self.assertTrue({0, 2, 3} <= set(codes.tolist()))
+        for i in range(0, len(codes), 7):
+            with contextlib.redirect_stdout(io.StringIO()):
+                code, *angles = ecl.EclipseType(self.sun[i], self.earth[i], self.sc[i],
+                                                SUN_RADIUS, EARTH_RADIUS)
+                percent = ecl.OcclusionPercentage(*angles)
+            self.assertEqual(codes[i], code)
+            np.testing.assert_allclose([theta[i], theta1[i], theta2[i]], angles, rtol=1e-12)
+            self.assertAlmostEqual(occlusion[i], percent/100, places=9)
+
+    def test_collinear_roundoff_and_no_output(self):
+        sc      = np.array([[-AU - 7000.0, 0.0, 0.0], [-AU - 7000.0, 1e-9, 0.0]])
+        stdout  = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            codes, occlusion = ecl.ecl00003_EclipseArray([0.0, 0.0, 0.0], [-AU, 0.0, 0.0], sc,
+                                                         SUN_RADIUS, EARTH_RADIUS)
+
+        self.assertEqual(stdout.getvalue(), '')
+        np.testing.assert_array_equal(codes, [ecl.ECLIPSE_UMBRAL]*2)
+        np.testing.assert_array_equal(occlusion, [1.0, 1.0])
+
+    def test_between_bodies_and_state_array(self):
+        sc      = np.array([[-AU/2, 0.0, 0.0]])
+        codes, occlusion = ecl.ecl00003_EclipseArray(self.sun[:1], self.earth[:1], sc,
+                                                     SUN_RADIUS, EARTH_RADIUS)
+        self.assertEqual((codes[0], occlusion[0]), (ecl.ECLIPSE_BETWEEN, 0.0))
+
+        states  = OrbitStateArray(2460489.5, R_SAMPLE, V_SAMPLE)
+        n       = len(states)
+        codes, theta, _, _ = ecl.ecl00001_EclipseTypeArray(self.sun[:n], self.earth[:n], states,
+                                                           SUN_RADIUS, EARTH_RADIUS)
+        expected = ecl.ecl00001_EclipseTypeArray(self.sun[:n], self.earth[:n], self.earth[:n] + R_SAMPLE,
+                                                 SUN_RADIUS, EARTH_RADIUS)
+        np.testing.assert_array_equal(codes, expected[0])
+        np.testing.assert_array_equal(theta, expected[1])
+
+
+class TestEclipseEvents(unittest.TestCase):
+    PERIOD = 5828.5
+
+    def positions(self, julian_date):
+        t = (np.asarray(julian_date) - 2460000.0)*86400
+        n = t.size
+        u = 2*np.pi*t/self.PERIOD
+        R = 7000.0*np.column_stack((np.cos(u), np.sin(u)*np.cos(0.3), np.sin(u)*np.sin(0.3)))
+        return np.zeros((n, 3)), np.tile([-AU, 0.0, 0.0], (n, 1)), np.array([-AU, 0.0, 0.0]) + R
+
+    def test_events_refined_with_few_evaluations(self):
+        start, end  = 2460000.0, 2460000.25
+        events      = ecl.ecl00006_EclipseEvents(self.positions, start, end, SUN_RADIUS, EARTH_RADIUS,
+                                                 step=300.0)
+
+        self.assertGreaterEqual(events['Event Number'].max(), 3)
+        self.assertEqual(events['Type'].tolist()[:3], ['Penumbra', 'Umbra', 'Penumbra'])
+        self.assertLess(events.attrs['evaluations'], (end - start)*86400/100)
+
+        #### Every interior boundary is a sign change of a shadow function within 1 ms
+        for jd in np.union1d(events['Start Time'], events['Stop Time']):
+            if start < jd < end:
+                f = ecl.ecl00004_ShadowFunctions(*self.positions(jd + np.array([-1e-3, 1e-3])/86400),
+                                                 SUN_RADIUS, EARTH_RADIUS)
+                self.assertTrue(any(side[0]*side[1] < 0 for side in f))
+
+        umbra       = events[events['Type'] == 'Umbra']
+        np.testing.assert_allclose(np.diff(umbra['Start Time'])*86400, self.PERIOD, atol=1e-3)
+        np.testing.assert_allclose(events.groupby('Event Number')['Duration'].sum(),
+                                   events.groupby('Event Number')['Total Duration'].first())
+
+    def test_window_starting_in_shadow(self):
+        events = ecl.ecl00006_EclipseEvents(self.positions, 2460000.0 + 0.5*self.PERIOD/86400,
+                                            2460000.0 + 0.6*self.PERIOD/86400, SUN_RADIUS, EARTH_RADIUS)
+        self.assertEqual(events['Type'].tolist(), ['Umbra'])
+        self.assertAlmostEqual(events['Duration'].iloc[0], 0.1*self.PERIOD, delta=1e-3)
+
+
+class TestMultiOcculter(unittest.TestCase):
+    def setUp(self):
+        self.sun    = np.array([[AU, 0.0, 0.0]])
+        self.sc     = np.zeros((1, 3))
+        self.alpha  = np.arcsin(SUN_RADIUS/AU)
+
+    def disk(self, offset, scale, distance=4.0e5):
+        '''
+        Occulter at distance whose disk looks scale times the Sun's, its
+        center offset by offset solar radii.
+        '''
+        direction = np.array([np.cos(offset*self.alpha), np.sin(offset*self.alpha), 0.0])
+        return distance*direction[None, :], distance*np.sin(scale*self.alpha)
+
+    def test_single_body_matches_array_function(self):
+        earth       = np.tile([-AU, 0.0, 0.0], (2001, 1))
+        sc          = earth + leo_ring(2001)
+        sun         = np.zeros((2001, 3))
+        codes, occlusion, by_body = ecl.ecl00007_MultiOcculterEclipse(sun, {'earth': (earth, EARTH_RADIUS)},
+                                                                      sc, SUN_RADIUS)
+        expected    = ecl.ecl00003_EclipseArray(sun, earth, sc, SUN_RADIUS, EARTH_RADIUS)
+
+        np.testing.assert_array_equal(codes, np.where(expected[0] < 0, 0, expected[0]))
+        np.testing.assert_allclose(occlusion, expected[1], atol=1e-12)
+        np.testing.assert_array_equal(by_body['earth'], occlusion)
+
+    def test_overlapping_occulters_not_double_counted(self):
+        A           = self.disk(0.6, 0.8)
+        alone       = ecl.ecl00007_MultiOcculterEclipse(self.sun, {'a': A}, self.sc, SUN_RADIUS)[1]
+        twice       = ecl.ecl00007_MultiOcculterEclipse(self.sun, {'a': A, 'b': A}, self.sc, SUN_RADIUS)[1]
+        self.assertAlmostEqual(twice[0], alone[0], delta=2e-3)
+
+        B           = self.disk(-0.6, 0.3)
+        _, union, by_body = ecl.ecl00007_MultiOcculterEclipse(self.sun, {'a': self.disk(0.6, 0.3), 'b': B},
+                                                              self.sc, SUN_RADIUS)
+        self.assertAlmostEqual(union[0], by_body['a'][0] + by_body['b'][0], delta=2e-3)
+
+        codes, full, _ = ecl.ecl00007_MultiOcculterEclipse(self.sun, {'a': self.disk(0.0, 1.5), 'b': B},
+                                                           self.sc, SUN_RADIUS)
+        self.assertEqual((codes[0], full[0]), (ecl.ECLIPSE_UMBRAL, 1.0))
+
+    def test_distant_bodies_pruned(self):
+        far         = (np.array([[0.0, 4.0e5, 0.0]]), 1737.4)
+        with mock.patch.object(ecl, 'ecl00001_EclipseTypeArray', wraps=ecl.ecl00001_EclipseTypeArray) as spy:
+            codes, occlusion, _ = ecl.ecl00007_MultiOcculterEclipse(self.sun, {'moon': far}, self.sc, SUN_RADIUS)
+        spy.assert_not_called()
+        self.assertEqual((codes[0], occlusion[0]), (0, 0.0))
+
+
+class TestEclipseFromKernel(synthetic_spk.KernelTestCase, unittest.TestCase):
+    def test_kernel_positions(self):
+        sc          = np.tile([7000.0, 0.0, 0.0], (self.jd.size, 1))
+        codes, occlusion, by_body = ecl.ecl00008_EclipseFromKernel(self.kernel, self.jd, sc)
+
+        self.assertEqual(set(by_body), {'earth', 'moon'})
+        self.assertEqual(occlusion.shape, self.jd.shape)
+
+        sun, earth  = self.kernel_position(10), self.kernel_position(399)
+        expected    = ecl.ecl00003_EclipseArray(sun, earth, earth + sc, SUN_RADIUS, EARTH_RADIUS)
+        np.testing.assert_allclose(by_body['earth'], expected[1], atol=1e-12)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            code, percent = ecl.ecl00000_EclipseEC2('Sun', 'Earth', earth[0] + sc[0], self.jd[0], self.kernel)
+        self.assertAlmostEqual(percent/100, expected[1][0], places=9)
+
+    def kernel_position(self, target):
+        return eph.get_position_ICRF(target, self.jd, self.kernel).T
+
+
+class TestConeGeometry(unittest.TestCase):
+    def setUp(self):
+        rng         = np.random.default_rng(19)
+        self.sun    = np.array([[0.0, 0.0, 0.0], [1.0e6, -2.0e6, 5.0e5]])
+        self.moon   = np.array([[-AU, 3.0e5, 0.0], [AU/np.sqrt(2), AU/np.sqrt(2), 1.0e5]])
+        axis        = (self.moon - self.sun)/np.linalg.norm(self.moon - self.sun, axis=1)[:, None]
+
+        #### Observers spread along the shadow, out past the umbra apex
+        along       = rng.uniform(-2.0e4, 8.0e5, (2, 500))
+        across      = rng.normal(0.0, 3.0e3, (2, 500, 3))
+        across      -= np.einsum('nmj,nj->nm', across, axis)[..., None]*axis[:, None, :]
+        self.sc     = self.moon[:, None, :] + along[..., None]*axis[:, None, :] + across
+
+    def test_matches_angular_classification(self):
+        geometry    = ecl.EclipseGeometry(self.sun, self.moon, SUN_RADIUS, 1737.4)
+        codes       = ecl.ecl00009_ConeEclipseType(geometry, self.sc)
+
+        self.assertEqual(codes.shape, (2, 500))
+        self.assertEqual(set(codes.ravel().tolist()), {-1, 0, 1, 2, 3})
+        for n in range(2):
+            expected = ecl.ecl00001_EclipseTypeArray(self.sun[n], self.moon[n], self.sc[n], SUN_RADIUS, 1737.4)[0]
+            np.testing.assert_array_equal(codes[n], expected)
+
+        single      = ecl.ecl00009_ConeEclipseType(geometry, self.sc[:, 0])
+        np.testing.assert_array_equal(single, codes[:, 0])
+
+    def test_apexes_and_shared_epoch(self):
+        geometry    = ecl.EclipseGeometry(self.sun[0], self.moon[0], SUN_RADIUS, 1737.4)
+        D21         = np.linalg.norm(self.moon[0] - self.sun[0])
+        apex        = geometry['umbra_apex'][0] - self.moon[0]
+
+        self.assertAlmostEqual(np.linalg.norm(apex), D21*1737.4/(SUN_RADIUS - 1737.4), delta=1e-3)
+        self.assertAlmostEqual(np.linalg.norm(geometry['penumbra_apex'][0] - self.moon[0]),
+                               D21*1737.4/(SUN_RADIUS + 1737.4), delta=1e-3)
+
+        states      = OrbitStateArray(2460489.5, self.sc[0] - self.moon[0], np.zeros((500, 3)))
+        np.testing.assert_array_equal(ecl.ecl00009_ConeEclipseType(geometry, states)[0],
+                                      ecl.ecl00009_ConeEclipseType(geometry, self.sc[:1])[0])
+
+
+class TestStreamEclipse(unittest.TestCase):
+    PERIODS = np.array([5400.0, 5828.5, 6100.0, 43082.0])
+
+    def observers(self, julian_date):
+        t = (np.asarray(julian_date) - 2460000.0)[:, None]*86400
+        u = 2*np.pi*t/self.PERIODS + np.arange(len(self.PERIODS))
+        radius = (7000.0, 7000.0, 7200.0, 42164.0)
+        return np.stack((radius*np.cos(u), radius*np.sin(u)*np.cos(0.2), radius*np.sin(u)*np.sin(0.2)), axis=-1)
+
+    def chunks(self, jd, chunk_size):
+        for i0 in range(0, jd.size, chunk_size):
+            part = jd[i0:i0 + chunk_size]
+            sun = np.zeros((part.size, 3))
+            earth = np.tile([-AU, 0.0, 0.0], (part.size, 1))
+            yield part, sun, earth, earth[:, None, :] + self.observers(part)
+
+    def test_chunking_does_not_change_intervals(self):
+        jd      = 2460000.0 + np.arange(0, 86400, 10.0)/86400
+        whole   = np.concatenate(list(ecl.ecl00010_StreamEclipse(self.chunks(jd, jd.size),
+                                                                 SUN_RADIUS, EARTH_RADIUS)))
+        for chunk_size in (3, 7, 1000):
+            pieces = np.concatenate(list(ecl.ecl00010_StreamEclipse(self.chunks(jd, chunk_size),
+                                                                    SUN_RADIUS, EARTH_RADIUS)))
+            order  = np.lexsort((pieces['start'], pieces['satellite']))
+            np.testing.assert_array_equal(np.sort(whole, order=['satellite', 'start']), pieces[order])
+
+        umbra   = whole[(whole['satellite'] == 1) & (whole['type'] == ecl.ECLIPSE_UMBRAL)]
+        self.assertGreaterEqual(len(umbra), 14)
+        np.testing.assert_allclose(np.diff(umbra['start'])*86400, self.PERIODS[1], atol=10.0)
+
+        #### Dense classification agrees with the emitted intervals
+        sun, earth  = np.zeros((jd.size, 3)), np.tile([-AU, 0.0, 0.0], (jd.size, 1))
+        dense       = ecl.ecl00001_EclipseTypeArray(sun, earth, earth + self.observers(jd)[:, 2],
+                                                    SUN_RADIUS, EARTH_RADIUS)[0]
+        covered     = np.zeros(jd.size, dtype=np.int8)
+        for row in whole[whole['satellite'] == 2]:
+            covered[(jd >= row['start']) & (jd < row['stop'])] = row['type']
+        np.testing.assert_array_equal(covered[:-1], np.maximum(dense, 0)[:-1])
+
+    def test_write_intervals(self):
+        jd      = 2460000.0 + np.arange(0, 21600, 10.0)/86400
+        with tempfile.TemporaryDirectory() as tmp:
+            path    = os.path.join(tmp, 'eclipse.csv')
+            count   = ecl.ecl00012_WriteIntervals(ecl.ecl00010_StreamEclipse(self.chunks(jd, 100),
+                                                                             SUN_RADIUS, EARTH_RADIUS),
+                                                  path, names=['A', 'B', 'C', 'GEO'])
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(rows), count)
+        self.assertEqual({row['Type'] for row in rows}, {'Penumbra', 'Umbra'})
+        self.assertTrue({row['Satellite'] for row in rows} <= {'A', 'B', 'C', 'GEO'})
+        for row in rows:
+            self.assertAlmostEqual(float(row['Duration']),
+                                   (float(row['Stop Time']) - float(row['Start Time']))*86400, places=6)
+
+
+class TestKernelChunks(synthetic_spk.KernelTestCase, unittest.TestCase):
+    def test_chunks_cover_grid(self):
+        ring    = lambda jd: np.broadcast_to([[[7000.0, 0.0, 0.0], [0.0, 7000.0, 0.0]]], (len(jd), 2, 3))
+        start   = self.jd[0]
+        chunks  = list(ecl.ecl00011_KernelChunks(self.kernel, ring, start, start + 1.0, step=600.0, chunk_size=50))
+
+        jd      = np.concatenate([chunk[0] for chunk in chunks])
+        self.assertEqual([len(chunk[0]) for chunk in chunks], [50, 50, 45])
+        np.testing.assert_allclose(np.diff(jd)*86400, 600.0, atol=1e-4)
+        np.testing.assert_allclose(chunks[1][2], eph.get_position_ICRF('Earth', chunks[1][0], self.kernel).T)
+        np.testing.assert_allclose(chunks[2][3][:, 1] - chunks[2][2], ring(chunks[2][0])[:, 1])
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,119 @@
+import os
+import sys
+import unittest
+import numpy as np
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.ephem as eph
+import synthetic_spk
+
+
+class TestBodyGraph(synthetic_spk.KernelTestCase, unittest.TestCase):
+    def test_aliases_resolve_to_same_body(self):
+        for names in (('Mars', 'mars', 499), ('MarsBC', 'Mars Barycenter', 4),
+                      ('EarthBC', 'Earth Barycenter', 'EMB', 3), ('Moon', 'Luna', 301)):
+            self.assertEqual(len({eph.eph00010_body_id(name) for name in names}), 1)
+        with self.assertRaises(ValueError):
+            eph.eph00010_body_id('Vulcan')
+
+    def test_shortest_chain_skips_common_parent(self):
+        chain = eph.eph00012_find_chain(self.kernel, 'Moon', 'Earth')
+        self.assertEqual(chain, ((-1.0, (3, 399)), (1.0, (3, 301))))
+        self.assertIs(chain, eph.eph00012_find_chain(self.kernel, 301, 399))
+
+    def test_positions_match_segment_sums(self):
+        k = self.kernel
+        earth = k[0, 3].compute(self.jd) + k[3, 399].compute(self.jd)
+        moon = k[0, 3].compute(self.jd) + k[3, 301].compute(self.jd)
+        mars = k[0, 4].compute(self.jd) + k[4, 499].compute(self.jd)
+
+        np.testing.assert_allclose(eph.get_position_ICRF('Earth', self.jd, k), earth)
+        np.testing.assert_allclose(eph.get_relative_position_ICRF1('Earth', 'Moon', self.jd, k),
+                                   moon - earth, atol=1e-6)
+        np.testing.assert_allclose(eph.get_relative_position_ICRF2(earth, 'Mars', self.jd, k),
+                                   mars - earth, atol=1e-6)
+        np.testing.assert_allclose(eph.eph01030_get_earth_position_ICRF(k, self.jd), earth)
+
+    def test_shared_segments_evaluated_once(self):
+        evaluate = eph.eph00020_evaluate_segments
+        with mock.patch.object(eph, 'eph00020_evaluate_segments', side_effect=evaluate) as spy:
+            eph.eph00013_compute_chains(self.kernel, ['Earth', 'Moon', 'EarthBC'], self.jd)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(sorted(spy.call_args[0][1]), [(0, 3), (3, 301), (3, 399)])
+
+    def test_stacked_evaluator_matches_jplephem(self):
+        pairs = list(self.kernel.pairs)
+        jd = self.jd.reshape(1, -1).repeat(2, axis=0)
+        jd[1] += 0.37
+        values = eph.eph00020_evaluate_segments(self.kernel, pairs, jd, velocity=True)
+        for pair in pairs:
+            position, rate = self.kernel[pair].compute_and_differentiate(jd.ravel())
+            np.testing.assert_allclose(values[pair][0].reshape(3, -1), position, rtol=1e-13, atol=1e-8)
+            np.testing.assert_allclose(values[pair][1].reshape(3, -1), rate, rtol=1e-12, atol=1e-9)
+        self.assertEqual(eph.eph00020_evaluate_segments(self.kernel, pairs[:1], self.jd[0])[pairs[0]][0].shape, (3,))
+
+    def test_type3_velocity_uses_stored_series(self):
+        moon = synthetic_spk.circle(379729.0, 27.32, 0.0, 0.09)
+        bias = np.array([[1e-3], [-2e-3], [0.5e-3]])
+        segments = [(0, 3, synthetic_spk.circle(synthetic_spk.AU, 365.25)),
+                    (3, 301, moon, lambda jd: (moon(jd + 1e-4) - moon(jd - 1e-4))/(2e-4*86400) + bias)]
+        kernel = synthetic_spk.open_spk(os.path.join(self.tmp.name, 'type3.bsp'), segments=segments, data_type=3)
+        try:
+            pairs = list(kernel.pairs)
+            values = eph.eph00020_evaluate_segments(kernel, pairs, self.jd, velocity=True)
+            for pair in pairs:
+                stored = kernel[pair].compute(self.jd)
+                self.assertEqual(kernel[pair].data_type, 3)
+                np.testing.assert_allclose(values[pair][0], stored[:3], rtol=1e-13, atol=1e-8)
+                np.testing.assert_allclose(values[pair][1], stored[3:]*86400, rtol=1e-12, atol=1e-9)
+            derivative = kernel[3, 301].compute_and_differentiate(self.jd)[1][:3]
+            np.testing.assert_allclose(values[3, 301][1] - derivative, np.broadcast_to(bias*86400, derivative.shape), atol=1.0)
+        finally:
+            kernel.close()
+
+    def test_kernel_subset_matches_full_kernel(self):
+        path = os.path.join(self.tmp.name, 'subset.bsp')
+        start, end = synthetic_spk.T0 - 5, synthetic_spk.T0 + 5
+        eph.eph00003_write_kernel_subset(self.kernel, path, start, end, bodies=['Moon'], center='Earth')
+
+        subset = eph.eph00001_load_kernel(path)
+        try:
+            self.assertEqual(set(subset.pairs), {(3, 399), (3, 301)})
+            self.assertLess(os.path.getsize(path), os.path.getsize(self.kernel.daf.file.name)/4)
+            jd = np.linspace(start, end, 101)
+            np.testing.assert_array_equal(eph.get_relative_position_ICRF1('Earth', 'Moon', jd, subset),
+                                          eph.get_relative_position_ICRF1('Earth', 'Moon', jd, self.kernel))
+        finally:
+            subset.close()
+
+    def test_get_state_single_pass_in_km_s(self):
+        k = self.kernel
+        states = eph.get_state(['Earth', 'Moon'], self.jd, k, center='Sun')
+        earth = eph.get_state('Earth', self.jd, k, center='Sun')
+
+        position, velocity = eph.eph02030_get_earth_velocity_ICRF(k, self.jd)
+        sun_position, sun_velocity = k[0, 10].compute_and_differentiate(self.jd)
+        self.assertEqual(earth.shape, (self.jd.size, 6))
+        np.testing.assert_array_equal(states['Earth'], earth)
+        np.testing.assert_allclose(earth[:, :3], (position - sun_position).T, atol=1e-6)
+        np.testing.assert_allclose(earth[:, 3:], (velocity - sun_velocity).T/86400.0, atol=1e-12)
+        self.assertEqual(eph.get_state('Moon', self.jd[0], k).shape, (1, 6))
+
+    def test_planet_without_segment_falls_back_to_barycenter(self):
+        path = os.path.join(self.tmp.name, 'no_mars.bsp')
+        segments = [segment for segment in synthetic_spk.DEFAULT_SEGMENTS if segment[1] != 499]
+        kernel = synthetic_spk.open_spk(path, segments=segments)
+        try:
+            self.assertEqual(eph.eph00012_find_chain(kernel, 'Mars', 'Sun'),
+                             ((-1.0, (0, 10)), (1.0, (0, 4))))
+            np.testing.assert_allclose(eph.get_relative_position_ICRF1('Earth', 'Mars', self.jd, kernel),
+                                       eph.get_relative_position_ICRF1('Earth', 'MarsBC', self.jd, kernel))
+        finally:
+            kernel.close()
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
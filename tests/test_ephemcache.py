@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+import numpy as np
+from jplephem.exceptions import OutOfRangeError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.ephemcache as ec
+import synthetic_spk
+
+
+class TestEphemerisCache(synthetic_spk.KernelTestCase, unittest.TestCase):
+    jd_count = 5001
+
+    def test_moon_within_error_bound(self):
+        cache = ec.EphemerisCache(self.kernel, center='Earth', step=0.125, window=16)
+        position, velocity = cache.state('Moon', self.jd)
+
+        moon = self.kernel[3, 301].compute_and_differentiate(self.jd)
+        earth = self.kernel[3, 399].compute_and_differentiate(self.jd)
+        error = np.abs(position - (moon[0] - earth[0])).max()
+
+        self.assertLess(error, cache.error_bound('Moon', self.jd))
+        self.assertLess(error, 1e-2)
+        np.testing.assert_allclose(velocity, moon[1] - earth[1], atol=0.1)
+        self.assertEqual(cache.position('Moon', synthetic_spk.T0).shape, (3,))
+
+    def test_lru_eviction_by_body_and_window(self):
+        cache = ec.EphemerisCache(self.kernel, step=0.5, window=8, max_blocks=6)
+        cache.states(['Sun', 'Earth'], self.jd[:10], velocity=False)
+        self.assertEqual((cache.misses, len(cache)), (2, 2))
+
+        cache.position('Sun', self.jd[:10])
+        self.assertEqual(cache.hits, 1)
+
+        cache.states(['Sun', 'Earth', 'Moon'], self.jd, velocity=False)
+        self.assertEqual(len(cache), 6)
+
+        cache.evict(body='Moon')
+        self.assertTrue(all(key[0] != 301 for key in cache.blocks))
+
+    def test_rejects_times_outside_kernel(self):
+        cache = ec.EphemerisCache(self.kernel, step=0.5, window=32)
+        cache.position('EarthBC', synthetic_spk.T0 + 30)
+
+        with self.assertRaises(OutOfRangeError) as raised:
+            cache.position('EarthBC', synthetic_spk.T0 + np.array([30.0, 45.0]))
+        np.testing.assert_array_equal(raised.exception.out_of_range_times, [False, True])
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
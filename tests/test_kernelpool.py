@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.kernelpool as kp
+import synthetic_spk
+from jplephem.exceptions import OutOfRangeError
+
+T0 = synthetic_spk.T0
+
+
+class TestKernelPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = self.tmp.name
+        shifted = [(0, 3, synthetic_spk.circle(synthetic_spk.AU, 365.25, 0.5)) if s[1] == 3 else s
+                   for s in synthetic_spk.DEFAULT_SEGMENTS]
+        synthetic_spk.write_spk(os.path.join(self.folder, 'a.bsp'))
+        synthetic_spk.write_spk(os.path.join(self.folder, 'b.bsp'), segments=shifted,
+                                start_jd=T0 + 20, end_jd=T0 + 100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_routes_to_highest_priority_cover(self):
+        jd = T0 + np.array([-30.0, 10.0, 30.0, 90.0])
+        with kp.KernelPool(self.folder) as pool:
+            self.assertEqual(pool.route('EarthBC', jd).tolist(), ['a.bsp', 'a.bsp', 'b.bsp', 'b.bsp'])
+            self.assertEqual(pool.kernels, {})
+
+            position = pool.position('EarthBC', jd)
+            np.testing.assert_allclose(position[:, :2], pool.kernel('a.bsp')[0, 3].compute(jd[:2]))
+            np.testing.assert_allclose(position[:, 2:], pool.kernel('b.bsp')[0, 3].compute(jd[2:]))
+            self.assertEqual(pool.get_state('EarthBC', jd).shape, (4, 6))
+            self.assertEqual(pool.position('Moon', T0).shape, (3,))
+
+        with kp.KernelPool(self.folder, priority=['a.bsp']) as pool:
+            self.assertEqual(pool.route('EarthBC', jd).tolist(), ['a.bsp', 'a.bsp', 'a.bsp', 'b.bsp'])
+            with self.assertRaises(OutOfRangeError):
+                pool.position('EarthBC', T0 + 200)
+
+    def test_sidecar_index_skips_headers(self):
+        kp.KernelPool(self.folder)
+        self.assertTrue(os.path.exists(os.path.join(self.folder, 'spk_index.json')))
+
+        with mock.patch('jplephem.daf.DAF', side_effect=AssertionError('header read')):
+            pool = kp.KernelPool(self.folder)
+        self.assertEqual(sorted(pool.index), ['a.bsp', 'b.bsp'])
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+import orbit.lambert as lam
+import orbit.twobody as twb
+import ploting.porkchop as pcp
+
+
+def circular_states(radius,phase,mu):
+    n = np.sqrt(mu/radius**3)
+    def states(julian_dates):
+        angle   = n*(np.asarray(julian_dates) - 2451545.0)*86400 + phase
+        zero    = np.zeros_like(angle)
+        v       = np.sqrt(mu/radius)
+        return np.stack((radius*np.cos(angle),radius*np.sin(angle),zero,
+                         -v*np.sin(angle),v*np.cos(angle),zero),axis=1)
+    return states
+
+
+class TestLambert(unittest.TestCase):
+    def test_vallado_example(self):
+        v1, v2 = lam.lam00001_LambertIzzo([15945.34,0,0],[12214.83899,10249.46731,0],76*60,398600.4418)
+        
+        np.testing.assert_allclose(v1[0],[2.058913,2.915965,0],atol=1e-5)
+        np.testing.assert_allclose(v2[0],[-3.451565,0.910315,0],atol=1e-5)
+        
+    def test_multirev_branches_reach_target(self):
+        mu      = 398600.4418
+        r1      = np.array([22592.145603,-1599.915239,-19783.950506])
+        r2      = np.array([1922.067697,4054.157051,-8925.727465])
+        tof     = 36000.0
+        
+        v1, v2  = lam.lam00002_LambertIzzoAllRevs(r1,r2,tof,mu,M_max=1)
+        
+        for branch in range(3):
+            state = twb.twb00303_PropagateUniversal(r1,v1[branch],[tof],mu)[0,0]
+            np.testing.assert_allclose(state[:3],r2,atol=1e-5)
+            np.testing.assert_allclose(state[3:],v2[branch,0],atol=1e-8)
+            
+    def test_porkchop_finds_hohmann(self):
+        mu      = pcp.mu_sun
+        AU      = 149597870.7
+        earth   = circular_states(AU,0.0,mu)
+        mars    = circular_states(1.524*AU,0.75,mu)
+        
+        grids, best = pcp.pcp0004_RefinePorkchop((earth,mars),
+                                                 (2451545.0,2451545.0 + 800),
+                                                 (2451545.0 + 100,2451545.0 + 1200),
+                                                 n_dep=40,n_arr=40,levels=4)
+        
+        v_hohmann = np.sqrt(mu/AU)*(np.sqrt(2*1.524/(1 + 1.524)) - 1)
+        tof_hohmann = np.pi*np.sqrt(((1 + 1.524)*AU/2)**3/mu)/86400
+        np.testing.assert_allclose(np.sqrt(best['c3']),v_hohmann,rtol=1e-2)
+        np.testing.assert_allclose(best['tof'],tof_hohmann,rtol=5e-2)
+        
+        grid    = grids[0]
+        pooled  = pcp.pcp0002_PorkchopGrid(grid['dep_jd'],grid['arr_jd'],
+                                           earth(grid['dep_jd']),mars(grid['arr_jd']),
+                                           chunk_size=500,workers=2)
+        np.testing.assert_allclose(pooled['c3'],grid['c3'],equal_nan=True)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import core.linalg as la
+import orbit.twobody as twb
+from orbit_fixtures import R_SAMPLE, V_SAMPLE
+
+
+class TestLinalgKernelParity(unittest.TestCase):
+    '''
+    The jitted kernels must agree with the scalar twb001xx functions. Without
+    numba the same kernels run as plain Python, so the parity still holds.
+    '''
+    def setUp(self):
+        self.mu = twb.mu_default
+        self.R  = R_SAMPLE.copy()
+        self.V  = V_SAMPLE.copy()
+        
+    def test_ecc_vec_and_energy(self):
+        e_vec   = la.ecc_vec(self.R,self.V,self.mu)
+        E       = la.specific_energy(self.R,self.V,self.mu)
+        
+        for k,(R,V) in enumerate(zip(self.R,self.V)):
+            np.testing.assert_allclose(e_vec[k],twb.twb00101_eccVec1(R,V,self.mu),atol=1e-12)
+            self.assertAlmostEqual(E[k],twb.twb00110_SpecificEnergy1(R,V,self.mu),10)
+            
+    def test_cart_to_kepler(self):
+        cols, e_vec = la.cart_to_kepler(self.R,self.V,self.mu,1e-10)
+        kep         = twb.twb00114_CartToKeplerArray(self.R,self.V,use_numba=True)
+        
+        for k,(R,V) in enumerate(zip(self.R,self.V)):
+            ref = twb.twb00111_CartToKepler(R,V,self.mu)
+            self.assertAlmostEqual(cols[k,0],ref['a'],6)
+            self.assertAlmostEqual(cols[k,1],ref['e'],10)
+            for key in ['i','RAAN','omega','nu','arg_lat_epoch']:
+                self.assertAlmostEqual(kep[key][k],ref[key],8,msg=key)
+                
+    def test_kepler_solve(self):
+        M       = np.array([30.0,170.0,-45.0,400.0])
+        e       = np.array([0.1,0.5,0.9,0.3])
+        E       = la.kepler_solve(M*twb.deg2rad,e,1e-12,12)*twb.rad2deg
+        
+        for k in range(M.size):
+            ref = twb.twb00112_eccentric_anomoly(M[k],e[k],tol=1e-12)
+            self.assertAlmostEqual(E[k],ref,8)
+        np.testing.assert_allclose(twb.twb00115_eccentric_anomaly_array(M,e,use_numba=True),E,atol=1e-10)
+            
+    def test_lagrange_fg(self):
+        delta_nu    = np.array([30.0,-60.0,90.0,120.0])
+        states      = la.lagrange_fg_propagate(self.R,self.V,delta_nu*twb.deg2rad,self.mu)
+        
+        for k,(R,V) in enumerate(zip(self.R,self.V)):
+            R1, V1  = twb.LagrangeFG_NextState(R,V,twb.LagrangeFG(R,V,delta_nu[k],self.mu))
+            np.testing.assert_allclose(states[k,:3],R1,rtol=1e-12)
+            np.testing.assert_allclose(states[k,3:],V1,rtol=1e-12)
+        np.testing.assert_allclose(twb.twb0002_LagrangeFGArray(self.R,self.V,delta_nu),states,rtol=1e-12)
+        
+    def test_universal_propagate(self):
+        t       = np.linspace(-3600,7200,7)
+        states  = la.universal_propagate(self.R,self.V,t,self.mu,1e-10,50)
+        
+        np.testing.assert_allclose(states,twb.twb00303_PropagateUniversal(self.R,self.V,t),rtol=1e-9,atol=1e-6)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.perturbations as ptb
+import orbit.beta as beta
+from orbit.state import OrbitStateArray
+from orbit_fixtures import R_SAMPLE, V_SAMPLE
+
+
+class TestSecularRates(unittest.TestCase):
+
+    def test_sun_synchronous_node_rate(self):
+        inc     = ptb.ptb00002_SunSynchronousInclination(7078.0)
+        self.assertAlmostEqual(float(inc), 98.19, delta=0.05)
+
+        rate    = ptb.ptb00001_SecularRates(7078.0, 0.0, inc)['RAAN']*86400
+        self.assertAlmostEqual(float(rate), 360/365.2421897, places=9)
+        self.assertTrue(np.isnan(ptb.ptb00002_SunSynchronousInclination(20000.0)))
+
+    def test_delta_RAAN_delegates(self):
+        a, e, i = np.array([7000.0, 7078.0, 26560.0]), np.array([0.0, 0.01, 0.7]), np.array([51.6, 98.2, 63.4])
+        np.testing.assert_allclose(beta.delta_RAAN(6378.137, a, e, i),
+                                   ptb.ptb00001_SecularRates(a, e, i, radius=6378.137)['RAAN'], rtol=1e-14)
+
+    def test_critical_inclination_and_J4(self):
+        rates   = ptb.ptb00001_SecularRates(26560.0, 0.7, np.degrees(np.arccos(np.sqrt(1/5))))
+        self.assertAlmostEqual(float(rates['omega']), 0.0, places=15)
+
+        J2_only = ptb.ptb00001_SecularRates(7000.0, 0.0, 45.0)
+        with_J4 = ptb.ptb00001_SecularRates(7000.0, 0.0, 45.0, J4=ptb.J4)
+        self.assertEqual(float(with_J4['M']), float(J2_only['M']))
+        for key in ('RAAN', 'omega'):
+            ratio = float(with_J4[key]/J2_only[key]) - 1
+            self.assertTrue(0 < abs(ratio) < 5e-3)
+
+
+class TestPropagateMeanElements(unittest.TestCase):
+
+    def test_walker_constellation_history(self):
+        planes, per_plane = 24, 50
+        RAAN    = np.repeat(np.arange(planes)*15.0, per_plane)
+        M       = np.tile(np.arange(per_plane)*7.2, planes)
+        elements = {'a': 7000.0, 'e': 0.001, 'i': 53.0, 'RAAN': RAAN, 'omega': 90.0, 'M': M}
+        jd      = 2460000.5 + np.linspace(0.0, 30.0, 121)
+
+        history = ptb.ptb00003_PropagateMeanElements(elements, jd, epoch=jd[0], J4=ptb.J4)
+        self.assertEqual(history['RAAN'].shape, (121, planes*per_plane))
+
+        rates   = ptb.ptb00001_SecularRates(7000.0, 0.001, 53.0, J4=ptb.J4)
+        dt      = (jd - jd[0])*86400
+        expected = np.remainder(RAAN[None, :] + rates['RAAN']*dt[:, None], 360)
+        np.testing.assert_allclose(history['RAAN'], expected, atol=1e-9)
+        np.testing.assert_allclose(history['i'], 53.0)
+        self.assertTrue(((history['nu'] >= 0) & (history['nu'] < 360)).all())
+
+    def test_state_array_round_trip_at_epoch(self):
+        states  = OrbitStateArray(2460000.5 + np.arange(4.0), R_SAMPLE, V_SAMPLE)
+        elements = states.elements
+        elliptic = np.flatnonzero(elements['e'] < 1)
+        states  = states[elliptic]
+
+        history = ptb.ptb00003_PropagateMeanElements(states, states.epoch)
+        diag    = np.arange(len(states))
+        for key in ('RAAN', 'omega', 'nu'):
+            delta = history[key][diag, diag] - np.remainder(states.elements[key], 360)
+            np.testing.assert_allclose(np.remainder(delta + 180, 360) - 180, 0.0, atol=1e-8)
+
+    def test_dict_needs_epoch(self):
+        with self.assertRaises(ValueError):
+            ptb.ptb00003_PropagateMeanElements({'a': 7000.0, 'e': 0.0, 'i': 0.0, 'RAAN': 0.0,
+                                                'omega': 0.0, 'M': 0.0}, [2460000.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
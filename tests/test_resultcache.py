@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+import numpy as np
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.ephem as eph
+import orbit.resultcache as rc
+import synthetic_spk
+
+
+class TestResultCache(synthetic_spk.KernelTestCase, unittest.TestCase):
+    def setUp(self):
+        self.cache = rc.ResultCache(os.path.join(self.tmp.name, 'cache'))
+        self.previous = eph.eph00030_set_result_cache(self.cache)
+
+    def tearDown(self):
+        eph.eph00030_set_result_cache(self.previous)
+        self.cache.clear()
+
+    def test_repeated_query_served_from_disk(self):
+        expected = eph.get_state('Moon', self.jd, self.kernel)
+        self.assertEqual((self.cache.hits, len(self.cache)), (0, 1))
+
+        with mock.patch.object(eph, 'eph00020_evaluate_segments', side_effect=AssertionError):
+            again = eph.get_state('Moon', self.jd, self.kernel)
+            reopened = rc.ResultCache(self.cache.cache_dir)
+            eph.eph00030_set_result_cache(reopened)
+            persisted = eph.get_state('Moon', self.jd, self.kernel)
+        eph.eph00030_set_result_cache(self.cache)
+
+        np.testing.assert_array_equal(again, expected)
+        np.testing.assert_array_equal(persisted, expected)
+        self.assertEqual((self.cache.hits, reopened.hits), (1, 1))
+
+    def test_grid_change_misses_and_lru_cap(self):
+        eph.get_position_ICRF('Sun', self.jd, self.kernel)
+        eph.get_position_ICRF('Sun', self.jd + 1e-6, self.kernel)
+        self.assertEqual((self.cache.hits, len(self.cache)), (0, 2))
+
+        block = max(entry['bytes'] for entry in self.cache.index.values())
+        self.cache.max_bytes = 2*block
+        first = min(self.cache.index, key=lambda k: self.cache.index[k]['last_used'])
+        eph.get_position_ICRF('Sun', self.jd + 2e-6, self.kernel)
+        self.assertEqual(len(self.cache), 2)
+        self.assertNotIn(first, self.cache.index)
+        self.assertFalse(os.path.exists(os.path.join(self.cache.cache_dir, first + '.npy')))
+
+    def test_hits_defer_index_write(self):
+        eph.get_position_ICRF('Sun', self.jd, self.kernel)
+        key = next(iter(self.cache.index))
+
+        with mock.patch.object(self.cache, '_write_index', side_effect=AssertionError):
+            for _ in range(3):
+                eph.get_position_ICRF('Sun', self.jd, self.kernel)
+        self.assertEqual(self.cache.hits, 3)
+        self.assertTrue(self.cache.dirty)
+
+        self.cache.flush()
+        self.assertFalse(self.cache.dirty)
+        reopened = rc.ResultCache(self.cache.cache_dir)
+        self.assertEqual(reopened.index[key]['last_used'], self.cache.index[key]['last_used'])
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
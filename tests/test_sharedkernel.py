@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.ephem as eph
+import orbit.sharedkernel as shk
+import synthetic_spk
+
+
+def moon_from_sun(args):
+    kernel, jd = args
+    return eph.get_relative_position_ICRF1('Sun', 'Moon', jd, kernel)
+
+
+class TestSharedKernel(synthetic_spk.KernelTestCase, unittest.TestCase):
+    jd_span = 10
+    jd_count = 101
+
+    def test_matches_kernel_in_process_and_in_workers(self):
+        expected = moon_from_sun((self.kernel, self.jd))
+
+        with shk.SharedKernel.create(self.kernel, bodies=['Sun', 'Moon'],
+                                     start_jd=self.jd[0], end_jd=self.jd[-1]) as shared:
+            self.assertEqual(set(shared.pairs), {(0, 10), (0, 3), (3, 301)})
+            np.testing.assert_array_equal(moon_from_sun((shared, self.jd)), expected)
+
+            with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('spawn')) as executor:
+                for result in executor.map(moon_from_sun, [(shared, self.jd)]*3):
+                    np.testing.assert_array_equal(result, expected)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
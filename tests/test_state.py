@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.twobody as twb
+from orbit.state import OrbitStateArray
+from orbit_fixtures import R_SAMPLE, V_SAMPLE
+
+
+class TestOrbitStateArray(unittest.TestCase):
+    def setUp(self):
+        self.R      = R_SAMPLE.copy()
+        self.V      = V_SAMPLE.copy()
+        self.states = OrbitStateArray(2460489.5,self.R,self.V)
+        
+    def test_slice_is_view(self):
+        sub = self.states[1:]
+        
+        self.assertEqual(len(sub),len(self.R) - 1)
+        self.assertTrue(np.shares_memory(sub.buffer,self.states.buffer))
+        self.assertTrue(np.shares_memory(sub.R,self.states.buffer))
+        np.testing.assert_array_equal(self.states[-1].V,self.V[-1:])
+        
+    def test_from_buffer_zero_copy(self):
+        buffer  = np.hstack((self.R,self.V))
+        states  = OrbitStateArray.from_buffer(np.zeros(len(self.R)),buffer)
+        
+        self.assertTrue(np.shares_memory(states.R,buffer))
+        with self.assertRaises(ValueError):
+            OrbitStateArray.from_buffer(0.0,buffer[:,::2])
+        
+    def test_elements_cached_and_concatenated(self):
+        elements = self.states.elements
+        
+        self.assertIs(self.states.elements,elements)
+        np.testing.assert_allclose(elements['a'],twb.twb00114_CartToKeplerArray(self.R,self.V)['a'])
+        
+        joined  = OrbitStateArray.concatenate([self.states[:1],self.states[1:]])
+        
+        np.testing.assert_array_equal(joined.buffer,self.states.buffer)
+        np.testing.assert_array_equal(joined.elements['i'],elements['i'])
+        
+    def test_twobody_accepts_states(self):
+        kep     = twb.twb00114_CartToKeplerArray(self.states)
+        traj    = twb.twb00303_PropagateUniversal(self.states,t=[0.0,600.0])
+        
+        np.testing.assert_allclose(kep['e'],self.states.elements['e'])
+        np.testing.assert_allclose(traj,self.states.propagate([0.0,600.0]))
+        self.assertEqual(traj.shape,(len(self.R),2,6))
+
+    def test_plain_arrays_need_velocity_and_times(self):
+        states = twb.twb00303_PropagateUniversal(self.states,t=[0.0])
+        
+        np.testing.assert_allclose(states[:,0,:3],self.R)
+        with self.assertRaises(TypeError):
+            twb.twb00114_CartToKeplerArray(self.R)
+        with self.assertRaises(TypeError):
+            twb.twb00303_PropagateUniversal(self.R,self.V)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
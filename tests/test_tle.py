@@ -0,0 +1,92 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+import utilities.tle as tle
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator', 'utilities', 'tle_example.txt')
+
+
+def with_checksum(line):
+    total = sum(int(c) if c.isdigit() else c == '-' for c in line[:68])
+    return line[:68] + str(total % 10)
+
+
+def record(norad, ndot, nddot, bstar, inc, RAAN, ecc, omega, M, n, epoch='24262.38035924'):
+    line1 = f"1 {norad:>5}U 98067A   {epoch:>14} {ndot:>10} {nddot:>8} {bstar:>8} 0  999"
+    line2 = f"2 {norad:>5} {inc:8.4f} {RAAN:8.4f} {ecc:07d} {omega:8.4f} {M:8.4f} {n:11.8f}47300"
+    return with_checksum(line1.ljust(68)), with_checksum(line2.ljust(68))
+
+
+class TestParseCatalog(unittest.TestCase):
+
+    def test_example_file(self):
+        catalog = tle.tle00001_ReadCatalog(EXAMPLE)
+        self.assertEqual(catalog['name'].tolist(), ['ISS (ZARYA)'])
+        self.assertEqual(catalog['norad_id'][0], 25544)
+        self.assertAlmostEqual(catalog['epoch'][0], 2460310.5 + 261.38035924, places=8)
+        self.assertAlmostEqual(catalog['bstar'][0], 0.46099e-3, places=15)
+        self.assertAlmostEqual(catalog['ndot'][0], 2*0.00025315, places=15)
+        for key, value in (('inc', 51.6373), ('RAAN', 213.7667), ('e', 0.0007508), ('omega', 5.1642),
+                           ('M', 354.9422), ('n', 15.49296236)):
+            self.assertEqual(catalog[key][0], value)
+        self.assertEqual(catalog['rev_number'][0], 47300)
+
+        elements = tle.tle00003_CatalogElements(catalog)
+        self.assertAlmostEqual(elements['a'][0], 6797.0, delta=5.0)
+
+    def test_mixed_catalog_matches_per_record_parse(self):
+        rng     = np.random.default_rng(3)
+        lines   = []
+        expected = []
+        for k in range(2000):
+            fields = dict(norad=10000 + k, ndot='-.00002182' if k % 3 else ' .00025315',
+                          nddot='-12345-6' if k % 4 == 0 else ' 00000-0', bstar='-11606-4' if k % 2 else ' 46099-3',
+                          inc=rng.uniform(0, 180), RAAN=rng.uniform(0, 360), ecc=int(rng.integers(0, 9999999)),
+                          omega=rng.uniform(0, 360), M=rng.uniform(0, 360), n=rng.uniform(1, 16.5))
+            line1, line2 = record(**fields)
+            if k % 2 == 0:
+                lines.append(f"0 SAT {k}   ")
+            lines += [line1, line2]
+            expected.append((float(line2[8:16]), float('.' + line2[26:33]), float(line2[52:63]),
+                             float(line1[53:59])*1e-5*10**int(line1[59:61]), float(line1[33:43])))
+
+        catalog = tle.tle00002_ParseCatalog('\r\n'.join(lines) + '\r\n')
+        self.assertEqual(catalog['norad_id'].size, 2000)
+        self.assertEqual(catalog['name'][0], 'SAT 0')
+        self.assertEqual(catalog['name'][1], '')
+        inc, ecc, n, bstar, ndot = np.array(expected).T
+        np.testing.assert_array_equal(catalog['inc'], inc)
+        np.testing.assert_array_equal(catalog['n'], n)
+        np.testing.assert_allclose(catalog['e'], ecc, rtol=1e-15)
+        np.testing.assert_allclose(catalog['bstar'], bstar, rtol=1e-14)
+        np.testing.assert_allclose(catalog['ndot'], 2*ndot, rtol=1e-15)
+        self.assertAlmostEqual(catalog['nddot'][0], -6*0.12345e-6, places=18)
+
+    def test_alpha5_and_validation(self):
+        line1, line2 = record('A0001', ' .00000000', ' 00000-0', ' 00000-0', 97.5, 10.0, 1234, 90.0, 270.0, 15.0)
+        catalog = tle.tle00002_ParseCatalog('\n'.join((line1, line2)))
+        self.assertEqual(catalog['norad_id'][0], 100001)
+
+        good    = record(25544, ' .00025315', ' 00000-0', ' 46099-3', 51.6, 10.0, 7508, 5.0, 355.0, 15.49)
+        broken  = (good[0], good[1][:68] + str((int(good[1][68]) + 1) % 10))
+        text    = '\n'.join(good + broken + (good[0],))
+        with self.assertRaises(ValueError):
+            tle.tle00002_ParseCatalog(text)
+        catalog = tle.tle00002_ParseCatalog(text, drop_invalid=True)
+        self.assertEqual(catalog['norad_id'].tolist(), [25544])
+
+    def test_tle_object_from_file(self):
+        satellite = tle.tle_object()
+        satellite.set_TLE_from_file(EXAMPLE, norad_id=25544)
+        self.assertTrue(satellite.TLE_set)
+        self.assertAlmostEqual(satellite.epoch, 24262.38035924, places=8)
+        self.assertEqual(satellite.INC, 51.6373)
+        with self.assertRaises(ValueError):
+            satellite.set_TLE_from_file(EXAMPLE, norad_id=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'parambulator'))
+sys.path.insert(0, os.path.dirname(__file__))
+import orbit.twobody as twb
+from orbit_fixtures import R_SAMPLE, V_SAMPLE
+
+
+class TestTwobodyBatch(unittest.TestCase):
+    def setUp(self):
+        self.R = R_SAMPLE.copy()
+        self.V = V_SAMPLE.copy()
+        
+    def test_CartToKeplerArray_matches_scalar(self):
+        kep = twb.twb00114_CartToKeplerArray(self.R,self.V)
+        
+        for k,(R,V) in enumerate(zip(self.R,self.V)):
+            ref = twb.twb00111_CartToKepler(R,V)
+            for key in ['a','e','i','RAAN','omega','nu','p','h','arg_lat_epoch','true_long_epoch']:
+                self.assertAlmostEqual(kep[key][k],ref[key],6,msg=key)
+                
+    def test_CartToKeplerArray_circular_equatorial(self):
+        mu  = twb.mu_default
+        r   = 7000.0
+        vc  = np.sqrt(mu/r)
+        R   = np.array([[0,r,0]])
+        V   = np.array([[-vc,0,0]])
+        
+        kep = twb.twb00114_CartToKeplerArray(R,V)
+        
+        self.assertAlmostEqual(kep['e'][0],0,8)
+        self.assertAlmostEqual(kep['i'][0],0,8)
+        self.assertEqual(kep['RAAN'][0],0)
+        self.assertEqual(kep['omega'][0],0)
+        self.assertAlmostEqual(kep['nu'][0],90,8)
+        self.assertAlmostEqual(kep['true_long_epoch'][0],90,8)
+
+
+    def test_eccentric_anomaly_array(self):
+        M   = np.array([[30.0,-170.0,400.0],[5.0,90.0,1000.0]])
+        e   = np.array([[0.1],[1.8]])
+        
+        E   = twb.twb00115_eccentric_anomaly_array(M,e)*twb.deg2rad
+        M   = M*twb.deg2rad
+        
+        np.testing.assert_allclose(E[0] - e[0]*np.sin(E[0]),M[0],atol=1e-12)
+        np.testing.assert_allclose(e[1]*np.sinh(E[1]) - E[1],M[1],atol=1e-12)
+        
+    def test_mean_to_true_anomaly_matches_scalar(self):
+        E_ref   = twb.twb00112_eccentric_anomoly(30,0.1,tol=1e-12)
+        nu_ref  = twb.twb00113_true_anomaly(E_ref,0.1)
+        
+        nu      = twb.twb00117_mean_to_true_anomaly(np.array([30.0,330.0]),0.1)
+        
+        self.assertAlmostEqual(nu[0],nu_ref,8)
+        self.assertAlmostEqual(nu[1],360 - nu_ref,8)
+        
+    def test_true_anomaly_array_hyperbolic(self):
+        e       = 2.0
+        F       = 1.2
+        nu      = twb.twb00116_true_anomaly_array(F*twb.rad2deg,e)*twb.deg2rad
+        
+        self.assertAlmostEqual(np.cosh(F),(e + np.cos(nu))/(1 + e*np.cos(nu)),10)
+
+
+    def test_PropagateUniversal_matches_LagrangeFG(self):
+        R0, V0  = self.R[0], self.V[0]
+        kep     = twb.twb00111_CartToKepler(R0,V0)
+        e, a    = kep['e'], kep['a']
+        n       = np.sqrt(twb.mu_default/a**3)
+        
+        def mean_anomaly(nu):
+            E = 2*np.arctan(np.sqrt((1-e)/(1+e))*np.tan(nu*twb.deg2rad/2))
+            return E - e*np.sin(E)
+        
+        dt      = (mean_anomaly(kep['nu'] + 30) - mean_anomaly(kep['nu']))/n
+        FG      = twb.LagrangeFG(R0,V0,30)
+        R1, V1  = twb.LagrangeFG_NextState(R0,V0,FG)
+        
+        state   = twb.twb00303_PropagateUniversal(R0,V0,[0,dt])
+        
+        self.assertEqual(state.shape,(1,2,6))
+        np.testing.assert_allclose(state[0,0],np.r_[R0,V0],atol=1e-9)
+        np.testing.assert_allclose(state[0,1,:3],R1,atol=1e-5)
+        np.testing.assert_allclose(state[0,1,3:],V1,atol=1e-8)
+        
+    def test_PropagateUniversal_hyperbolic_roundtrip(self):
+        R0      = np.array([[7000.0,0,0]])
+        V0      = np.array([[0,13.0,0.5]])
+        t       = np.array([-3600.0,0.0,7200.0])
+        
+        state   = twb.twb00303_PropagateUniversal(R0,V0,t)
+        back    = twb.twb00303_PropagateUniversal(state[:,2,:3],state[:,2,3:],t - t[2])
+        
+        np.testing.assert_allclose(back,state,rtol=1e-9,atol=1e-6)
+
+
+    def test_KeplerToCartArray_roundtrip(self):
+        kep     = twb.twb00114_CartToKeplerArray(self.R,self.V)
+        
+        R, V    = twb.twb00118_KeplerToCartArray(kep['a'],kep['e'],kep['i'],
+                                                 kep['RAAN'],kep['omega'],kep['nu'])
+        
+        np.testing.assert_allclose(R,self.R,atol=1e-6)
+        np.testing.assert_allclose(V,self.V,atol=1e-9)
+        
+    def test_PerifocalRotation_normal(self):
+        Q       = twb.twb00205_PerifocalRotation([30.0,200.0],[51.6,98.0],[0.0,45.0])
+        
+        for k,(RAAN,inc) in enumerate([(30.0,51.6),(200.0,98.0)]):
+            O_hat = np.asarray(twb.twb00204_OrbitNormalVector2(RAAN,inc)).ravel()
+            np.testing.assert_allclose(Q[k,:,2],O_hat,atol=1e-12)
+        np.testing.assert_allclose(Q @ Q.transpose(0,2,1),np.broadcast_to(np.eye(3),(2,3,3)),atol=1e-12)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)